@@ -0,0 +1,42 @@
+"""Add Evidence Processing Columns
+
+Revision ID: 009_add_evidence_processing_columns
+Revises: 148f6bf7f33e
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_evidence_processing_columns'
+down_revision: Union[str, None] = '148f6bf7f33e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('evidence', sa.Column('detected_mime_type', sa.String(), nullable=True))
+    op.add_column('evidence', sa.Column('extracted_text', sa.Text(), nullable=True))
+    op.add_column('evidence', sa.Column('thumbnail_url', sa.String(), nullable=True))
+    # Existing rows start as PENDING so the processor backfills them on startup
+    op.add_column('evidence', sa.Column('processing_status', sa.String(length=20), nullable=False, server_default='PENDING'))
+    op.add_column('evidence', sa.Column('processing_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('evidence', sa.Column('processing_error', sa.Text(), nullable=True))
+    op.add_column('evidence', sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Startup requeue looks up unfinished rows by status
+    op.create_index(op.f('ix_evidence_processing_status'), 'evidence', ['processing_status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_evidence_processing_status'), table_name='evidence')
+    op.drop_column('evidence', 'processed_at')
+    op.drop_column('evidence', 'processing_error')
+    op.drop_column('evidence', 'processing_attempts')
+    op.drop_column('evidence', 'processing_status')
+    op.drop_column('evidence', 'thumbnail_url')
+    op.drop_column('evidence', 'extracted_text')
+    op.drop_column('evidence', 'detected_mime_type')
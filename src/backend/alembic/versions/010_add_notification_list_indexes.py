@@ -0,0 +1,40 @@
+"""Add Notification List Indexes
+
+Revision ID: 010_add_notification_list_indexes
+Revises: 009_add_evidence_processing_columns
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_notification_list_indexes'
+down_revision: Union[str, None] = '009_add_evidence_processing_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Raw SQL with IF [NOT] EXISTS: depending on which 005 migration created
+    # the table, ix_notifications_user_read may or may not be present.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_created "
+        "ON notifications (user_id, created_at DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_unread "
+        "ON notifications (user_id, created_at DESC) WHERE is_read = false"
+    )
+    # Superseded by the partial index above
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_read")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_notifications_user_read "
+        "ON notifications (user_id, is_read)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_unread")
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_created")
@@ -0,0 +1,45 @@
+"""Create Email Outbox
+
+Revision ID: 011_create_email_outbox
+Revises: 010_add_notification_list_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '011_create_email_outbox'
+down_revision: Union[str, None] = '010_add_notification_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('to_address', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=500), nullable=False),
+        sa.Column('template_name', sa.String(length=255), nullable=False),
+        sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_email_outbox_due', 'email_outbox', ['next_attempt_at'], unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'SENDING')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_due', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,42 @@
+"""Add Notification Coalescing And Digests
+
+Revision ID: 012_add_notification_coalescing_and_digests
+Revises: 011_create_email_outbox
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '012_add_notification_coalescing_and_digests'
+down_revision: Union[str, None] = '011_create_email_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('coalesced_count', sa.Integer(), nullable=False, server_default='1'))
+
+    op.create_table(
+        'notification_preferences',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('digest_frequency', sa.String(length=20), nullable=False, server_default='off'),
+        sa.Column('last_digest_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(
+        'ix_notification_preferences_digest', 'notification_preferences',
+        ['digest_frequency', 'last_digest_at'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_preferences_digest', table_name='notification_preferences')
+    op.drop_table('notification_preferences')
+    op.drop_column('notifications', 'coalesced_count')
@@ -0,0 +1,122 @@
+"""Notification Retention Partitioning
+
+Converts notifications into a table range-partitioned by month on
+created_at so expired months can be dropped instead of deleted row by row,
+and adds the partial index used by the retention purge.
+
+Future partitions are created by the notification retention job
+(app/notifications/retention.py), which also keeps purging row by row on a
+table that is not partitioned.
+
+Revision ID: 013_notification_retention_partitioning
+Revises: 012_add_notification_coalescing_and_digests
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '013_notification_retention_partitioning'
+down_revision: Union[str, None] = '012_add_notification_coalescing_and_digests'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, title, message, type, link, is_read, coalesced_count, created_at"
+
+# One statement per execute (asyncpg cannot prepare several at once)
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_id ON notifications (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications (user_id, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_user_unread ON notifications (user_id, created_at DESC) WHERE is_read = false",
+    "CREATE INDEX IF NOT EXISTS ix_notifications_read_created ON notifications (created_at) WHERE is_read = true",
+]
+
+
+def _is_partitioned() -> bool:
+    bind = op.get_bind()
+    return bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'notifications'"
+    )).scalar() is not None
+
+
+def upgrade() -> None:
+    if _is_partitioned():
+        for statement in CREATE_INDEXES:
+            op.execute(statement)
+        return
+
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE notifications_partitioned (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            type VARCHAR(50) NOT NULL,
+            link VARCHAR(500),
+            is_read BOOLEAN NOT NULL DEFAULT false,
+            coalesced_count INTEGER NOT NULL DEFAULT 1,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT notifications_partitioned_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT notifications_partitioned_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications_partitioned DEFAULT")
+    # One partition per month from the oldest row through two months ahead
+    op.execute("""
+        DO $$
+        DECLARE m date;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE((SELECT min(created_at) FROM notifications), now())),
+                    date_trunc('month', now()) + interval '2 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_p' || to_char(m, 'YYYYMM'), m, (m + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"INSERT INTO notifications_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM notifications")
+    op.execute("DROP TABLE notifications")
+    op.execute("ALTER TABLE notifications_partitioned RENAME TO notifications")
+    op.execute("ALTER TABLE notifications RENAME CONSTRAINT notifications_partitioned_pkey TO notifications_pkey")
+    op.execute("ALTER TABLE notifications RENAME CONSTRAINT notifications_partitioned_user_id_fkey TO notifications_user_id_fkey")
+    for statement in CREATE_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if not _is_partitioned():
+        op.execute("DROP INDEX IF EXISTS ix_notifications_read_created")
+        return
+
+    op.execute("""
+        CREATE TABLE notifications_plain (
+            id UUID NOT NULL PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users (id),
+            title VARCHAR(255) NOT NULL,
+            message TEXT NOT NULL,
+            type VARCHAR(50) NOT NULL,
+            link VARCHAR(500),
+            is_read BOOLEAN NOT NULL DEFAULT false,
+            coalesced_count INTEGER NOT NULL DEFAULT 1,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute(f"INSERT INTO notifications_plain ({COLUMNS}) SELECT {COLUMNS} FROM notifications")
+    op.execute("DROP TABLE notifications CASCADE")
+    op.execute("ALTER TABLE notifications_plain RENAME TO notifications")
+    op.execute("ALTER TABLE notifications RENAME CONSTRAINT notifications_plain_pkey TO notifications_pkey")
+    op.execute("ALTER TABLE notifications RENAME CONSTRAINT notifications_plain_user_id_fkey TO notifications_user_id_fkey")
+    for statement in CREATE_INDEXES:
+        op.execute(statement)
+    op.execute("DROP INDEX IF EXISTS ix_notifications_read_created")
@@ -0,0 +1,30 @@
+"""Add Comment Thread Index
+
+Revision ID: 014_add_comment_thread_index
+Revises: 013_notification_retention_partitioning
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014_add_comment_thread_index'
+down_revision: Union[str, None] = '013_notification_retention_partitioning'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Top-level threads are paged per response in created_at order;
+    # replies are reached through ix_comments_parent_id
+    op.create_index(
+        'ix_comments_response_roots', 'comments', ['response_id', 'created_at'], unique=False,
+        postgresql_where=sa.text('parent_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_response_roots', table_name='comments')
@@ -0,0 +1,46 @@
+"""Add Element Activity Counters
+
+Revision ID: 015_add_element_activity_counters
+Revises: 014_add_comment_thread_index
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '015_add_element_activity_counters'
+down_revision: Union[str, None] = '014_add_comment_thread_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('assessment_element_responses', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('assessment_element_responses', sa.Column('evidence_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('assessment_element_responses', sa.Column('last_activity_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill from existing rows
+    op.execute("""
+        UPDATE assessment_element_responses r
+        SET comment_count = c.count, last_activity_at = c.latest
+        FROM (SELECT response_id, count(*) AS count, max(created_at) AS latest
+              FROM comments GROUP BY response_id) c
+        WHERE c.response_id = r.id
+    """)
+    op.execute("""
+        UPDATE assessment_element_responses r
+        SET evidence_count = e.count,
+            last_activity_at = GREATEST(r.last_activity_at, e.latest)
+        FROM (SELECT response_id, count(*) AS count, max(created_at) AS latest
+              FROM evidence GROUP BY response_id) e
+        WHERE e.response_id = r.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('assessment_element_responses', 'last_activity_at')
+    op.drop_column('assessment_element_responses', 'evidence_count')
+    op.drop_column('assessment_element_responses', 'comment_count')
@@ -0,0 +1,55 @@
+"""Add Full-Text Search
+
+Revision ID: 016_add_full_text_search
+Revises: 015_add_element_activity_counters
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '016_add_full_text_search'
+down_revision: Union[str, None] = '015_add_element_activity_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Stored generated columns: Postgres recomputes the vector whenever the
+# source text changes, so the GIN indexes are maintained incrementally on
+# write. Adding them rewrites each table once.
+SEARCH_VECTORS = {
+    'comments': (
+        "to_tsvector('english', coalesce(content, '')) || "
+        "to_tsvector('arabic', coalesce(content, ''))"
+    ),
+    'assessment_element_responses': (
+        "to_tsvector('english', coalesce(comment, '')) || "
+        "to_tsvector('arabic', coalesce(comment, ''))"
+    ),
+    'evidence': (
+        "setweight(to_tsvector('english', coalesce(file_name, '')), 'A') || "
+        "setweight(to_tsvector('arabic', coalesce(file_name, '')), 'A') || "
+        "to_tsvector('english', left(coalesce(extracted_text, ''), 100000)) || "
+        "to_tsvector('arabic', left(coalesce(extracted_text, ''), 100000))"
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+            f"ON {table} USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,44 @@
+"""Add User Trigram Search
+
+Revision ID: 017_add_user_trigram_search
+Revises: 016_add_full_text_search
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '017_add_user_trigram_search'
+down_revision: Union[str, None] = '016_add_full_text_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep in sync with app/common/text_search.py: folds alef variants, alef
+# maqsura and taa marbuta; strips tanween, harakat, shadda, sukun,
+# superscript alef and tatweel.
+NORMALIZE_ARABIC = """
+    CREATE OR REPLACE FUNCTION nudj_normalize_arabic(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $$ SELECT translate(value, 'أإآٱىةًٌٍَُِّْٰـ', 'اااايه') $$
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(NORMALIZE_ARABIC)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_name_en_trgm ON users USING gin (name_en gin_trgm_ops)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_name_ar_trgm "
+        "ON users USING gin (nudj_normalize_arabic(name_ar) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_name_ar_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_name_en_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_email_trgm")
+    op.execute("DROP FUNCTION IF EXISTS nudj_normalize_arabic(text)")
@@ -0,0 +1,127 @@
+"""Partition Audit Logs
+
+Converts audit_logs into a table range-partitioned by month on created_at
+(so months past retention can be detached instead of deleted) and adds the
+hourly rollup table read by the security dashboard.
+
+Future partitions are created, and expired ones detached, by the audit
+maintenance job (app/common/audit_maintenance.py).
+
+Revision ID: 018_partition_audit_logs
+Revises: 017_add_user_trigram_search
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '018_partition_audit_logs'
+down_revision: Union[str, None] = '017_add_user_trigram_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, event_type, user_id, email, ip_address, user_agent, details, organization_id, created_at"
+
+# One statement per execute (asyncpg cannot prepare several at once)
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_audit_logs_event_type ON audit_logs (event_type)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_logs_user_id ON audit_logs (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_logs_organization_id ON audit_logs (organization_id)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_event_created ON audit_logs (event_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_org_created ON audit_logs (organization_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_user_created ON audit_logs (user_id, created_at)",
+]
+
+
+def upgrade() -> None:
+    # The partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs_partitioned (
+            id UUID NOT NULL,
+            event_type auditeventtype NOT NULL,
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            email VARCHAR(255),
+            ip_address VARCHAR(45) NOT NULL,
+            user_agent TEXT,
+            details JSONB,
+            organization_id UUID REFERENCES organizations (id) ON DELETE SET NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            CONSTRAINT audit_logs_partitioned_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs_partitioned DEFAULT")
+    # One partition per month from the oldest row through two months ahead
+    op.execute("""
+        DO $$
+        DECLARE m date;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE((SELECT min(created_at) FROM audit_logs), now())),
+                    date_trunc('month', now()) + interval '2 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_p' || to_char(m, 'YYYYMM'), m, (m + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"INSERT INTO audit_logs_partitioned ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs")
+    op.execute("DROP TABLE audit_logs")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME TO audit_logs")
+    op.execute("ALTER TABLE audit_logs RENAME CONSTRAINT audit_logs_partitioned_pkey TO audit_logs_pkey")
+    for statement in CREATE_INDEXES:
+        op.execute(statement)
+
+    op.create_table(
+        'audit_log_hourly_stats',
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column('event_type', postgresql.ENUM(name='auditeventtype', create_type=False), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_audit_log_hourly_stats_hour', 'audit_log_hourly_stats', ['hour'])
+    op.create_index('ix_audit_log_hourly_stats_org_hour', 'audit_log_hourly_stats', ['organization_id', 'hour'])
+    # Backfill so the dashboard is correct before the first job run
+    op.execute("""
+        INSERT INTO audit_log_hourly_stats (hour, organization_id, event_type, count)
+        SELECT date_trunc('hour', created_at), organization_id, event_type, count(*)
+        FROM audit_logs
+        WHERE created_at < date_trunc('hour', now())
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_log_hourly_stats_org_hour', table_name='audit_log_hourly_stats')
+    op.drop_index('ix_audit_log_hourly_stats_hour', table_name='audit_log_hourly_stats')
+    op.drop_table('audit_log_hourly_stats')
+
+    op.execute("""
+        CREATE TABLE audit_logs_plain (
+            id UUID NOT NULL PRIMARY KEY,
+            event_type auditeventtype NOT NULL,
+            user_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            email VARCHAR(255),
+            ip_address VARCHAR(45) NOT NULL,
+            user_agent TEXT,
+            details JSONB,
+            organization_id UUID REFERENCES organizations (id) ON DELETE SET NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL
+        )
+    """)
+    # Detached partitions are not included; reattach them first to keep their rows
+    op.execute(f"INSERT INTO audit_logs_plain ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs")
+    op.execute("DROP TABLE audit_logs CASCADE")
+    op.execute("ALTER TABLE audit_logs_plain RENAME TO audit_logs")
+    op.execute("ALTER TABLE audit_logs RENAME CONSTRAINT audit_logs_plain_pkey TO audit_logs_pkey")
+    for statement in CREATE_INDEXES:
+        op.execute(statement)
@@ -0,0 +1,56 @@
+"""Create Scheduled Job Runs
+
+Adds the job run history written by the in-process scheduler and the
+expires_at indexes used by the chunked auth cleanup jobs.
+
+Revision ID: 019_create_scheduled_job_runs
+Revises: 018_partition_audit_logs
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '019_create_scheduled_job_runs'
+down_revision: Union[str, None] = '018_partition_audit_logs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EXPIRY_INDEXES = {
+    'ix_user_sessions_expires_at': 'user_sessions',
+    'ix_refresh_tokens_expires_at': 'refresh_tokens',
+    'ix_password_reset_tokens_expires_at': 'password_reset_tokens',
+    'ix_invitations_expires_at': 'invitations',
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_job_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=False),
+        sa.Column('rows_affected', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scheduled_job_runs_job_started', 'scheduled_job_runs', ['job_name', 'started_at'])
+    op.create_index('ix_scheduled_job_runs_started', 'scheduled_job_runs', ['started_at'])
+
+    for name, table in EXPIRY_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} (expires_at)")
+
+
+def downgrade() -> None:
+    for name in EXPIRY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.drop_index('ix_scheduled_job_runs_started', table_name='scheduled_job_runs')
+    op.drop_index('ix_scheduled_job_runs_job_started', table_name='scheduled_job_runs')
+    op.drop_table('scheduled_job_runs')
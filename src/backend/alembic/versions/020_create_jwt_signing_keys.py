@@ -0,0 +1,39 @@
+"""Create JWT Signing Keys
+
+Adds the rotated asymmetric keys used to sign and verify JWTs when
+JWT_ALGORITHM is RS256 or EdDSA.
+
+Revision ID: 020_create_jwt_signing_keys
+Revises: 019_create_scheduled_job_runs
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '020_create_jwt_signing_keys'
+down_revision: Union[str, None] = '019_create_scheduled_job_runs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jwt_signing_keys',
+        sa.Column('kid', sa.String(length=64), nullable=False),
+        sa.Column('algorithm', sa.String(length=16), nullable=False),
+        sa.Column('private_key_pem', sa.Text(), nullable=False),
+        sa.Column('public_key_pem', sa.Text(), nullable=False),
+        sa.Column('activates_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('kid')
+    )
+    op.create_index('ix_jwt_signing_keys_activates_at', 'jwt_signing_keys', ['activates_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jwt_signing_keys_activates_at', table_name='jwt_signing_keys')
+    op.drop_table('jwt_signing_keys')
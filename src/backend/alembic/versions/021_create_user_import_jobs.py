@@ -0,0 +1,52 @@
+"""Create User Import Jobs
+
+Adds the background CSV/XLSX user import jobs started from the admin API.
+
+Revision ID: 021_create_user_import_jobs
+Revises: 020_create_jwt_signing_keys
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '021_create_user_import_jobs'
+down_revision: Union[str, None] = '020_create_jwt_signing_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_import_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('created_by', postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('file_type', sa.String(length=10), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('processed_rows', sa.Integer(), nullable=False),
+        sa.Column('invited_count', sa.Integer(), nullable=False),
+        sa.Column('updated_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('error_report', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_import_jobs_organization_id', 'user_import_jobs', ['organization_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_import_jobs_organization_id', table_name='user_import_jobs')
+    op.drop_table('user_import_jobs')
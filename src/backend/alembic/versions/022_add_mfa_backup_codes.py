@@ -0,0 +1,28 @@
+"""Add MFA Backup Codes
+
+Stores hashed single-use MFA backup codes on users.
+
+Revision ID: 022_add_mfa_backup_codes
+Revises: 021_create_user_import_jobs
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '022_add_mfa_backup_codes'
+down_revision: Union[str, None] = '021_create_user_import_jobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('mfa_backup_codes', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'mfa_backup_codes')
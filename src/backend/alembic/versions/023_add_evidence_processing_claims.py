@@ -0,0 +1,27 @@
+"""Add Evidence Processing Claims
+
+Lets API workers claim evidence rows before analysing them.
+
+Revision ID: 023_add_evidence_processing_claims
+Revises: 022_add_mfa_backup_codes
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '023_add_evidence_processing_claims'
+down_revision: Union[str, None] = '022_add_mfa_backup_codes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('evidence', sa.Column('processing_claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('evidence', 'processing_claimed_at')
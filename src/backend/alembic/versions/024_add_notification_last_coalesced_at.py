@@ -0,0 +1,28 @@
+"""Add Notification Last Coalesced At
+
+Coalescing keeps created_at at the first occurrence and records the latest
+merged event separately.
+
+Revision ID: 024_add_notification_last_coalesced_at
+Revises: 023_add_evidence_processing_claims
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '024_add_notification_last_coalesced_at'
+down_revision: Union[str, None] = '023_add_evidence_processing_claims'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('last_coalesced_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('notifications', 'last_coalesced_at')
@@ -0,0 +1,34 @@
+"""Create Revoked Access Tokens
+
+Shared access-token denylist used when Redis is disabled.
+
+Revision ID: 025_create_revoked_access_tokens
+Revises: 024_add_notification_last_coalesced_at
+Create Date: 2026-10-20 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '025_create_revoked_access_tokens'
+down_revision: Union[str, None] = '024_add_notification_last_coalesced_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revoked_access_tokens',
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_access_tokens_expires_at', 'revoked_access_tokens', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_revoked_access_tokens_expires_at', table_name='revoked_access_tokens')
+    op.drop_table('revoked_access_tokens')
@@ -0,0 +1,58 @@
+"""Store User Import Uploads and Errors
+
+Keeps import uploads in user_import_jobs.file_content, so any worker can run
+or resume a job, and moves rejected rows from the error_report text column
+to the user_import_errors table.
+
+Revision ID: 026_store_user_import_uploads
+Revises: 025_create_revoked_access_tokens
+Create Date: 2026-10-20 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '026_store_user_import_uploads'
+down_revision: Union[str, None] = '025_create_revoked_access_tokens'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_import_jobs', sa.Column('file_content', sa.LargeBinary(), nullable=True))
+    # Unfinished jobs point at files on one worker's disk; they cannot be resumed
+    op.execute(
+        "UPDATE user_import_jobs SET status = 'failed', "
+        "error = 'Interrupted by an upgrade; upload the file again', finished_at = now() "
+        "WHERE status IN ('pending', 'running')"
+    )
+    op.drop_column('user_import_jobs', 'file_path')
+    op.drop_column('user_import_jobs', 'error_report')
+
+    op.create_table(
+        'user_import_errors',
+        sa.Column('id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('job_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('row_number', sa.Integer(), nullable=False),
+        sa.Column('email', sa.Text(), nullable=False),
+        sa.Column('error', sa.String(length=100), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['user_import_jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_import_errors_job_row', 'user_import_errors', ['job_id', 'row_number'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_import_errors_job_row', table_name='user_import_errors')
+    op.drop_table('user_import_errors')
+    op.add_column('user_import_jobs', sa.Column('error_report', sa.Text(), nullable=True))
+    op.add_column(
+        'user_import_jobs',
+        sa.Column('file_path', sa.String(length=500), nullable=False, server_default=''),
+    )
+    op.alter_column('user_import_jobs', 'file_path', server_default=None)
+    op.drop_column('user_import_jobs', 'file_content')
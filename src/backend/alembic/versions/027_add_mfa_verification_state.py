@@ -0,0 +1,33 @@
+"""Add MFA Verification State
+
+Keeps the last used TOTP step and the MFA attempt counter on users, so replay
+protection and throttling hold across workers without Redis.
+
+Revision ID: 027_add_mfa_verification_state
+Revises: 026_store_user_import_uploads
+Create Date: 2026-10-20 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '027_add_mfa_verification_state'
+down_revision: Union[str, None] = '026_store_user_import_uploads'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('mfa_last_used_step', sa.BigInteger(), nullable=True))
+    op.add_column('users', sa.Column('mfa_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('mfa_attempts_started_at', sa.DateTime(timezone=True), nullable=True))
+    op.alter_column('users', 'mfa_attempts', server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'mfa_attempts_started_at')
+    op.drop_column('users', 'mfa_attempts')
+    op.drop_column('users', 'mfa_last_used_step')
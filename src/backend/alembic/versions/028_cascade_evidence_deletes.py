@@ -0,0 +1,36 @@
+"""Cascade Evidence Deletes
+
+Element responses no longer load their evidence to delete it; the database
+removes the rows (comments already cascade).
+
+Revision ID: 028_cascade_evidence_deletes
+Revises: 027_add_mfa_verification_state
+Create Date: 2026-10-20 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '028_cascade_evidence_deletes'
+down_revision: Union[str, None] = '027_add_mfa_verification_state'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created unnamed in 003, so it has the Postgres default name
+    op.drop_constraint('evidence_response_id_fkey', 'evidence', type_='foreignkey')
+    op.create_foreign_key(
+        'evidence_response_id_fkey', 'evidence', 'assessment_element_responses',
+        ['response_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('evidence_response_id_fkey', 'evidence', type_='foreignkey')
+    op.create_foreign_key(
+        'evidence_response_id_fkey', 'evidence', 'assessment_element_responses',
+        ['response_id'], ['id'],
+    )
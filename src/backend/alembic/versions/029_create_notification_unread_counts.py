@@ -0,0 +1,40 @@
+"""Create Notification Unread Counts
+
+Maintained per-user unread counters, backfilled from notifications.
+
+Revision ID: 029_create_notification_unread_counts
+Revises: 028_cascade_evidence_deletes
+Create Date: 2026-10-20 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '029_create_notification_unread_counts'
+down_revision: Union[str, None] = '028_cascade_evidence_deletes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    # Block notification writes while backfilling so no change is missed
+    op.execute("LOCK TABLE notifications IN SHARE MODE")
+    op.execute(
+        "INSERT INTO notification_unread_counts (user_id, unread_count) "
+        "SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_unread_counts')
@@ -6,14 +6,20 @@ TASK-015: Admin routes for user management and audit logs.
 Endpoints:
 - GET /admin/users - List users (paginated)
 - POST /admin/users/invite - Invite new user
+- POST /admin/users/invite/bulk - Invite many users in one batch
+- POST /admin/users/import - Import users from a CSV/XLSX file (background job)
+- GET /admin/users/import/{id} - Import job progress
+- GET /admin/users/import/{id}/errors - Download the import error report (CSV)
 - GET /admin/users/{id} - Get user details
 - PATCH /admin/users/{id} - Update user
 - DELETE /admin/users/{id} - Deactivate user
 - GET /admin/audit-logs - List audit logs
 - GET /admin/audit-logs/export - Export audit logs as CSV
 """
+from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,17 +30,31 @@ from src.backend.app.auth.dependencies import (
     require_permission,
     require_role,
 )
-from src.backend.app.auth.invitation_service import InvitationService
-from src.backend.app.common.audit_service import AuditService
+from src.backend.app.auth.invitation_service import (
+    InvitationService,
+    send_invitation_email,
+    send_invitation_emails,
+)
+from src.backend.app.admin.user_import import (
+    ImportFileError,
+    ImportFileTooLarge,
+    UserImportService,
+    user_import_worker,
+)
+from src.backend.app.common.audit_service import AuditService, gzip_chunks
+from src.backend.app.common.models import AuditEventType
+from src.backend.app.common.text_search import contains_pattern, normalize_arabic, normalized_arabic
 from src.backend.app.auth.schemas import (
     InviteUserRequest,
     BulkInviteRequest,
+    BulkInviteResponse,
     UserDetailResponse,
     UserListResponse,
     UpdateUserRequest,
     AuditLogListResponse,
     InvitationResponse,
     SuccessResponse,
+    UserImportJobResponse,
 )
 
 
@@ -60,44 +80,40 @@ async def list_users(
     
     Requires: users:read permission
     """
-    query = select(User)
-    count_query = select(func.count(User.id))
+    filters = []
     
     # Filter by role
     if role:
         try:
-            role_enum = Role(role)
-            query = query.where(User.role == role_enum)
-            count_query = count_query.where(User.role == role_enum)
+            filters.append(User.role == Role(role))
         except ValueError:
             pass  # Invalid role, ignore filter
     
     # Filter by organization (for tenant isolation)
     if organization_id:
-        query = query.where(User.organization_id == organization_id)
-        count_query = count_query.where(User.organization_id == organization_id)
+        filters.append(User.organization_id == organization_id)
     
     # Apply tenant isolation for non-super admins
     if user.role != Role.SUPER_ADMIN:
-        query = query.where(User.organization_id == user.organization_id)
-        count_query = count_query.where(User.organization_id == user.organization_id)
+        filters.append(User.organization_id == user.organization_id)
     
-    # Search
+    # Search (served by the pg_trgm indexes from migration 017)
+    search = search.strip() if search else None
     if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            (User.email.ilike(search_pattern)) |
-            (User.name_en.ilike(search_pattern)) |
-            (User.name_ar.ilike(search_pattern))
+        pattern = contains_pattern(search)
+        filters.append(
+            (User.email.ilike(pattern)) |
+            (User.name_en.ilike(pattern)) |
+            (normalized_arabic(User.name_ar).ilike(contains_pattern(normalize_arabic(search))))
         )
     
-    # Get total count
-    total_result = await session.execute(count_query)
+    # Total count of the filtered result
+    total_result = await session.execute(select(func.count()).select_from(User).where(*filters))
     total = total_result.scalar()
     
     # Paginate
     offset = (page - 1) * page_size
-    query = query.offset(offset).limit(page_size).order_by(User.created_at.desc())
+    query = select(User).where(*filters).offset(offset).limit(page_size).order_by(User.created_at.desc())
     
     result = await session.execute(query)
     users = result.scalars().all()
@@ -149,6 +165,7 @@ async def invite_user(
         invited_by=user.id,
         organization_id=request.organization_id or user.organization_id,
     )
+    await send_invitation_email(session, invitation)
     
     return InvitationResponse(
         id=invitation.id,
@@ -162,7 +179,7 @@ async def invite_user(
     )
 
 
-@router.post("/users/invite/bulk", response_model=SuccessResponse)
+@router.post("/users/invite/bulk", response_model=BulkInviteResponse)
 async def bulk_invite_users(
     request: BulkInviteRequest,
     user: User = Depends(require_permission("users:invite")),
@@ -171,6 +188,11 @@ async def bulk_invite_users(
     """
     Send bulk invitations.
     
+    Duplicates, invalid rows, unknown organizations or domains and already
+    registered emails are skipped and reported back; everything else is
+    invited in one batch. Only super admins may invite into another
+    organization.
+    
     Requires: users:invite permission
     """
     invitation_service = InvitationService(session)
@@ -179,19 +201,123 @@ async def bulk_invite_users(
         {
             "email": inv.email,
             "role": Role(inv.role),
-            "organization_id": inv.organization_id or user.organization_id,
+            "organization_id": (
+                inv.organization_id or user.organization_id
+                if user.role == Role.SUPER_ADMIN
+                else user.organization_id
+            ),
+            "domain_ids": inv.domain_ids,
         }
         for inv in request.invitations
     ]
     
-    await invitation_service.bulk_create_invitations(
-        invitations=invitations_data,
+    result = await invitation_service.create_bulk_invitations(
+        invitations_data,
         invited_by=user.id,
     )
+    await send_invitation_emails(session, result.created)
     
-    return SuccessResponse(
-        message_en=f"Sent {len(request.invitations)} invitations",
-        message_ar=f"تم إرسال {len(request.invitations)} دعوات",
+    return BulkInviteResponse(
+        message_en=f"Sent {len(result.created)} invitations",
+        message_ar=f"تم إرسال {len(result.created)} دعوات",
+        created=len(result.created),
+        skipped=result.skipped,
+    )
+
+
+def _import_job_response(job) -> UserImportJobResponse:
+    return UserImportJobResponse(
+        id=job.id,
+        file_name=job.file_name,
+        status=job.status,
+        total_rows=job.total_rows,
+        processed_rows=job.processed_rows or 0,
+        invited_count=job.invited_count or 0,
+        updated_count=job.updated_count or 0,
+        failed_count=job.failed_count or 0,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _get_import_job(job_id: str, user: User, session: AsyncSession):
+    from src.backend.app.common.exceptions import NotFoundException
+
+    job = await UserImportService(session).get_job(job_id)
+    # Tenant isolation check
+    if not job or (user.role != Role.SUPER_ADMIN and job.organization_id != user.organization_id):
+        raise NotFoundException()
+    return job
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def import_users(
+    file: UploadFile = File(...),
+    organization_id: Optional[str] = Form(None),
+    user: User = Depends(require_permission("users:invite")),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Import users from an HR system export (CSV or XLSX).
+    
+    Columns: email, role (required), name_en, name_ar, domain_ids
+    (separated by , ; or |). New emails are invited, existing users of the
+    organization are updated. The file is processed in the background;
+    poll GET /admin/users/import/{id} for progress.
+    
+    Requires: users:invite permission
+    """
+    if user.role != Role.SUPER_ADMIN:
+        organization_id = user.organization_id
+    if not organization_id:
+        raise HTTPException(status_code=400, detail="organization_id is required")
+
+    try:
+        job = await UserImportService(session).create_job(file, organization_id, created_by=user.id)
+    except ImportFileTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    user_import_worker.enqueue(job.id)
+    return _import_job_response(job)
+
+
+@router.get("/users/import/{job_id}", response_model=UserImportJobResponse)
+async def get_import_job(
+    job_id: str,
+    user: User = Depends(require_permission("users:invite")),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Get import job progress.
+    
+    Requires: users:invite permission
+    """
+    return _import_job_response(await _get_import_job(job_id, user, session))
+
+
+@router.get("/users/import/{job_id}/errors")
+async def download_import_errors(
+    job_id: str,
+    user: User = Depends(require_permission("users:invite")),
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Download the rows rejected so far as CSV (row, email, error).
+    
+    Requires: users:invite permission
+    """
+    job = await _get_import_job(job_id, user, session)
+    return StreamingResponse(
+        UserImportService(session).iter_error_csv(job.id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=import_errors_{job.id}.csv"},
     )
 
 
@@ -355,7 +481,6 @@ async def list_audit_logs(
 
     if event_type:
         try:
-            from src.backend.app.common.models import AuditEventType
             filter_kwargs["event_type"] = AuditEventType(event_type)
         except ValueError:
             pass  # Invalid event type, ignore filter
@@ -395,26 +520,44 @@ async def list_audit_logs(
 
 @router.get("/audit-logs/export")
 async def export_audit_logs(
-    start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    event_type: Optional[str] = Query(None),
+    organization_id: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Compress the CSV (audit_logs.csv.gz)"),
     user: User = Depends(require_permission("audit:export")),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Export audit logs as CSV.
+    Export audit logs as CSV, streamed without a row limit.
     
     Requires: audit:export permission
     """
     audit_service = AuditService(session)
-    
-    csv_content = await audit_service.export_csv(
-        organization_id=user.organization_id if user.role != Role.SUPER_ADMIN else None,
+
+    try:
+        event_type_enum = AuditEventType(event_type) if event_type else None
+    except ValueError:
+        event_type_enum = None  # Invalid event type, ignore filter
+
+    # Tenant isolation for non-super admins
+    if user.role != Role.SUPER_ADMIN:
+        organization_id = user.organization_id
+
+    chunks = audit_service.iter_csv(
+        organization_id=organization_id,
+        start_date=start_date,
+        end_date=end_date,
+        event_type=event_type_enum,
     )
-    
-    return Response(
-        content=csv_content,
+    if gzip:
+        return StreamingResponse(
+            gzip_chunks(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": "attachment; filename=audit_logs.csv.gz"},
+        )
+    return StreamingResponse(
+        chunks,
         media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=audit_logs.csv"
-        },
+        headers={"Content-Disposition": "attachment; filename=audit_logs.csv"},
     )
@@ -0,0 +1,625 @@
+"""
+User Import
+
+Background onboarding of users and domain assignments from HR system
+exports (CSV/XLSX).
+
+Features:
+- Uploads are stored with the job, so any worker can run or resume it; the
+  running worker copies the file to local scratch space and reads it row by
+  row (csv module / openpyxl read-only mode)
+- Rows are validated and written in chunks of USER_IMPORT_CHUNK_SIZE: new
+  emails become invitations, existing users of the organization are updated
+  and their org-wide domain assignments upserted, using set-based queries
+  and executemany statements
+- Progress and rejected rows are committed with each chunk; a job
+  interrupted by a restart resumes after its last committed row
+- Rejected rows are kept in user_import_errors and streamed as a
+  downloadable CSV error report
+"""
+import asyncio
+import csv
+import io
+import itertools
+import logging
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from email_validator import EmailNotValidError, validate_email
+from fastapi import UploadFile
+from sqlalchemy import and_, any_, bindparam, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.auth.models import (
+    ImportStatus,
+    Role,
+    User,
+    UserDomainAssignment,
+    UserImportError,
+    UserImportJob,
+)
+from src.backend.app.auth.invitation_service import (
+    SKIP_UNKNOWN_DOMAIN,
+    VALID_DOMAIN_IDS,
+    InvitationService,
+    _email_array,
+    send_invitation_emails,
+)
+from src.backend.app.auth.permissions import PermissionService
+
+logger = logging.getLogger(__name__)
+
+# Optional openpyxl import - only needed for XLSX imports
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    load_workbook = None
+    OPENPYXL_AVAILABLE = False
+    logger.warning("openpyxl not available. XLSX user imports will be disabled.")
+
+UPLOAD_READ_BYTES = 1024 * 1024
+ERROR_REPORT_FETCH_SIZE = 1000
+REQUIRED_COLUMNS = ("email", "role")
+HEADER_ALIASES = {
+    "e_mail": "email",
+    "email_address": "email",
+    "domains": "domain_ids",
+    "domain": "domain_ids",
+    "name": "name_en",
+}
+DOMAIN_SEPARATORS = re.compile(r"[,;|]")
+ERROR_REPORT_HEADER = ("row", "email", "error")
+
+# Row error codes (invitation skip reasons are reported as-is)
+ERROR_INVALID_EMAIL = "invalid_email"
+ERROR_INVALID_ROLE = "invalid_role"
+ERROR_ROLE_NOT_ALLOWED = "role_not_allowed"
+ERROR_DUPLICATE = "duplicate"
+ERROR_OTHER_ORGANIZATION = "belongs_to_another_organization"
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be imported."""
+
+
+class ImportFileTooLarge(ImportFileError):
+    """The upload exceeds USER_IMPORT_MAX_BYTES."""
+
+
+def import_file_type(file_name: str) -> str:
+    """csv or xlsx, from the file name."""
+    ext = os.path.splitext(file_name or "")[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext == ".xlsx":
+        if not OPENPYXL_AVAILABLE:
+            raise ImportFileError("XLSX imports are not available; upload a CSV file")
+        return "xlsx"
+    raise ImportFileError("Only .csv and .xlsx files can be imported")
+
+
+# =============================================================================
+# File reading (blocking - runs in a worker thread)
+# =============================================================================
+
+def _normalize_header(value: Any) -> str:
+    key = re.sub(r"[\s\-]+", "_", str(value or "").strip().lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def _iter_raw_rows(path: str, file_type: str) -> Iterator[List[Any]]:
+    if file_type == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+        return
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(path: str, file_type: str) -> Iterator[Dict[str, str]]:
+    """
+    Yield data rows as dicts keyed by normalized header.
+
+    Raises ImportFileError if the header lacks a required column.
+    """
+    rows = _iter_raw_rows(path, file_type)
+    header = [_normalize_header(value) for value in next(rows, None) or []]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+    for values in rows:
+        yield {
+            key: str(value).strip() if value is not None else ""
+            for key, value in zip(header, values)
+        }
+
+
+def count_import_rows(path: str, file_type: str) -> int:
+    """Number of data rows (header excluded)."""
+    return max(sum(1 for _ in _iter_raw_rows(path, file_type)) - 1, 0)
+
+
+def _skip_rows(rows: Iterator[Dict[str, str]], count: int) -> None:
+    next(itertools.islice(rows, count, count), None)
+
+
+def _read_chunk(rows: Iterator[Dict[str, str]], size: int) -> List[Dict[str, str]]:
+    return list(itertools.islice(rows, size))
+
+
+# =============================================================================
+# Chunk import
+# =============================================================================
+
+@dataclass
+class ChunkResult:
+    """Outcome of one imported chunk."""
+    invited: int = 0
+    updated: int = 0
+    errors: List[Tuple[int, str, str]] = field(default_factory=list)  # (row, email, error)
+
+    def error(self, row_number: int, email: str, error: str) -> None:
+        self.errors.append((row_number, email, error))
+
+    def error_rows(self, job_id: str) -> List[Dict[str, Any]]:
+        """user_import_errors rows for the job."""
+        return [
+            {"id": str(uuid4()), "job_id": job_id, "row_number": row_number, "email": email, "error": error}
+            for row_number, email, error in self.errors
+        ]
+
+
+def _uuid_array(ids: List[str]):
+    return bindparam(None, ids, type_=ARRAY(UUID(as_uuid=False)))
+
+
+class UserImporter:
+    """
+    Validates and writes import rows for one organization.
+
+    Emails seen in earlier chunks are remembered, so duplicates are
+    reported across the whole file.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        organization_id: str,
+        imported_by: Optional[str],
+        importer_role: Role,
+    ):
+        self.session = session
+        self.organization_id = organization_id
+        self.imported_by = imported_by
+        self.allowed_roles = set(PermissionService.get_allowed_roles_for_invite(importer_role))
+        self._seen: Set[str] = set()
+
+    async def import_chunk(self, rows: List[Tuple[int, Dict[str, str]]]) -> ChunkResult:
+        """
+        Import (row number, row) pairs.
+
+        Queries and writes are issued once per chunk, not per row. Nothing
+        is committed; the caller commits together with the job progress.
+        """
+        result = ChunkResult()
+        valid: Dict[str, Dict[str, Any]] = {}
+
+        for row_number, row in rows:
+            if not any(row.values()):
+                continue  # Blank line
+            raw_email = row.get("email", "")
+            try:
+                email = validate_email(raw_email, check_deliverability=False).normalized.lower()
+            except EmailNotValidError:
+                result.error(row_number, raw_email, ERROR_INVALID_EMAIL)
+                continue
+            try:
+                role = Role(row.get("role", "").lower().replace(" ", "_"))
+            except ValueError:
+                result.error(row_number, email, ERROR_INVALID_ROLE)
+                continue
+            if role not in self.allowed_roles:
+                result.error(row_number, email, ERROR_ROLE_NOT_ALLOWED)
+                continue
+            # Checked here for members too; only invitations are validated downstream
+            domain_ids = [d.strip() for d in DOMAIN_SEPARATORS.split(row.get("domain_ids", "")) if d.strip()]
+            if not set(domain_ids) <= VALID_DOMAIN_IDS:
+                result.error(row_number, email, SKIP_UNKNOWN_DOMAIN)
+                continue
+            if email in self._seen:
+                result.error(row_number, email, ERROR_DUPLICATE)
+                continue
+            self._seen.add(email)
+            valid[email] = {
+                "row": row_number,
+                "role": role,
+                "name_en": row.get("name_en") or None,
+                "name_ar": row.get("name_ar") or None,
+                "domain_ids": domain_ids or None,
+            }
+
+        if not valid:
+            return result
+
+        existing = await self.session.execute(
+            select(User.id, User.email, User.organization_id, User.role)
+            .where(User.email == any_(_email_array(list(valid))))
+        )
+        updates: List[Dict[str, Any]] = []
+        assignments: Dict[str, List[str]] = {}
+        for user_id, email, organization_id, current_role in existing.all():
+            data = valid.pop(email.lower(), None)
+            if data is None:
+                continue
+            if organization_id != self.organization_id:
+                result.error(data["row"], email, ERROR_OTHER_ORGANIZATION)
+                continue
+            if current_role not in self.allowed_roles:
+                result.error(data["row"], email, ERROR_ROLE_NOT_ALLOWED)
+                continue
+            values = {"id": user_id, "role": data["role"]}
+            for name in ("name_en", "name_ar"):
+                if data[name]:
+                    values[name] = data[name]
+            updates.append(values)
+            if data["domain_ids"]:
+                assignments[user_id] = data["domain_ids"]
+
+        if updates:
+            # ORM bulk UPDATE by primary key: one executemany
+            await self.session.execute(update(User), updates)
+            result.updated = len(updates)
+        if assignments:
+            await self._upsert_assignments(assignments)
+
+        if valid:
+            invitations = await InvitationService(self.session).create_bulk_invitations(
+                [
+                    {
+                        "email": email,
+                        "role": data["role"],
+                        "organization_id": self.organization_id,
+                        "domain_ids": data["domain_ids"],
+                    }
+                    for email, data in valid.items()
+                ],
+                invited_by=self.imported_by,
+            )
+            for skipped in invitations.skipped:
+                data = valid.get(skipped["email"])
+                result.error(data["row"] if data else 0, skipped["email"], skipped["reason"])
+            await send_invitation_emails(self.session, invitations.created)
+            result.invited = len(invitations.created)
+
+        result.errors.sort()
+        return result
+
+    async def _upsert_assignments(self, assignments: Dict[str, List[str]]) -> None:
+        """Replace org-wide domain assignments (assessment_id IS NULL)."""
+        now = datetime.utcnow()
+        existing = await self.session.execute(
+            select(UserDomainAssignment.id, UserDomainAssignment.user_id).where(
+                UserDomainAssignment.user_id == any_(_uuid_array(list(assignments))),
+                UserDomainAssignment.assessment_id.is_(None),
+            )
+        )
+        updates = []
+        for assignment_id, user_id in existing.all():
+            domain_ids = assignments.pop(user_id, None)
+            if domain_ids is not None:
+                updates.append({
+                    "id": assignment_id,
+                    "domain_ids": {"ids": domain_ids},
+                    "assigned_by": self.imported_by,
+                    "assigned_at": now,
+                })
+        if updates:
+            await self.session.execute(update(UserDomainAssignment), updates)
+        if assignments:
+            await self.session.execute(insert(UserDomainAssignment), [
+                {
+                    "id": str(uuid4()),
+                    "user_id": user_id,
+                    "domain_ids": {"ids": domain_ids},
+                    "assigned_by": self.imported_by,
+                    "assigned_at": now,
+                }
+                for user_id, domain_ids in assignments.items()
+            ])
+
+
+# =============================================================================
+# Jobs
+# =============================================================================
+
+class UserImportService:
+    """Creates and looks up import jobs."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_job(
+        self,
+        file: UploadFile,
+        organization_id: str,
+        created_by: str,
+    ) -> UserImportJob:
+        """
+        Store the upload with a pending job.
+
+        Raises ImportFileError for unsupported files and ImportFileTooLarge
+        past USER_IMPORT_MAX_BYTES. The job is committed so any worker can
+        pick it up; see UserImportWorker.enqueue().
+        """
+        file_type = import_file_type(file.filename)
+
+        content = io.BytesIO()
+        while chunk := await file.read(UPLOAD_READ_BYTES):
+            if content.tell() + len(chunk) > settings.USER_IMPORT_MAX_BYTES:
+                raise ImportFileTooLarge(
+                    f"Import files are limited to {settings.USER_IMPORT_MAX_BYTES // (1024 * 1024)}MB"
+                )
+            content.write(chunk)
+
+        job = UserImportJob(
+            organization_id=organization_id,
+            created_by=created_by,
+            file_name=file.filename,
+            file_content=content.getvalue(),
+            file_type=file_type,
+            status=ImportStatus.PENDING.value,
+        )
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[UserImportJob]:
+        return await self.session.get(UserImportJob, job_id)
+
+    async def iter_error_csv(
+        self,
+        job_id: str,
+        fetch_size: int = ERROR_REPORT_FETCH_SIZE,
+    ) -> AsyncIterator[str]:
+        """Yield the job's rejected rows as CSV chunks, header first."""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(ERROR_REPORT_HEADER)
+        yield output.getvalue()
+
+        result = await self.session.stream(
+            select(UserImportError.row_number, UserImportError.email, UserImportError.error)
+            .where(UserImportError.job_id == job_id)
+            .order_by(UserImportError.row_number)
+            .execution_options(yield_per=fetch_size)
+        )
+        async for rows in result.partitions():
+            output.seek(0)
+            output.truncate()
+            writer.writerows(rows)
+            yield output.getvalue()
+
+
+async def _claim_job(session: AsyncSession, job_id: str) -> Optional[Any]:
+    """Mark a pending or orphaned job running; None if another worker has it."""
+    now = datetime.utcnow()
+    stale = now - timedelta(minutes=settings.USER_IMPORT_STALE_MINUTES)
+    result = await session.execute(
+        update(UserImportJob)
+        .where(
+            UserImportJob.id == job_id,
+            or_(
+                UserImportJob.status == ImportStatus.PENDING.value,
+                and_(
+                    UserImportJob.status == ImportStatus.RUNNING.value,
+                    UserImportJob.updated_at < stale,
+                ),
+            ),
+        )
+        .values(status=ImportStatus.RUNNING.value, updated_at=now)
+        .returning(
+            UserImportJob.organization_id,
+            UserImportJob.created_by,
+            UserImportJob.file_type,
+            UserImportJob.processed_rows,
+            UserImportJob.total_rows,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    claimed = result.first()
+    await session.commit()
+    return claimed
+
+
+async def _update_job(session: AsyncSession, job_id: str, **values: Any) -> None:
+    await session.execute(
+        update(UserImportJob)
+        .where(UserImportJob.id == job_id)
+        .values(updated_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def _record_chunk(session: AsyncSession, job_id: str, rows: int, result: ChunkResult) -> None:
+    """Commit a chunk's writes and rejected rows together with the job's progress."""
+    if result.errors:
+        await session.execute(insert(UserImportError), result.error_rows(job_id))
+    await _update_job(
+        session, job_id,
+        processed_rows=UserImportJob.processed_rows + rows,
+        invited_count=UserImportJob.invited_count + result.invited,
+        updated_count=UserImportJob.updated_count + result.updated,
+        failed_count=UserImportJob.failed_count + len(result.errors),
+    )
+
+
+def _write_scratch_file(content: bytes, file_type: str) -> str:
+    os.makedirs(settings.USER_IMPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=f".{file_type}", dir=settings.USER_IMPORT_DIR)
+    with os.fdopen(fd, "wb") as out:
+        out.write(content)
+    return path
+
+
+async def _load_upload(session: AsyncSession, job_id: str, file_type: str) -> str:
+    """Copy a job's stored upload to a local scratch file; returns its path."""
+    content = (
+        await session.execute(select(UserImportJob.file_content).where(UserImportJob.id == job_id))
+    ).scalar_one_or_none()
+    if content is None:
+        raise ImportFileError("The uploaded file is no longer available")
+    return await asyncio.to_thread(_write_scratch_file, content, file_type)
+
+
+async def run_import_job(job_id: str) -> None:
+    """Import a job's file, resuming after its last committed chunk."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        job = await _claim_job(session, job_id)
+        if job is None:
+            return  # Finished, or running elsewhere
+
+        file_path = None
+        try:
+            importer_role = (
+                await session.execute(select(User.role).where(User.id == job.created_by))
+            ).scalar_one_or_none()
+            if importer_role is None:
+                raise ImportFileError("The user who started the import no longer exists")
+            file_path = await _load_upload(session, job_id, job.file_type)
+            if job.total_rows is None:
+                await _update_job(
+                    session, job_id,
+                    total_rows=await asyncio.to_thread(count_import_rows, file_path, job.file_type),
+                )
+
+            importer = UserImporter(session, job.organization_id, job.created_by, importer_role)
+            rows = iter_import_rows(file_path, job.file_type)
+            if job.processed_rows:
+                await asyncio.to_thread(_skip_rows, rows, job.processed_rows)  # Committed before a restart
+            # Data rows start on line 2, after the header
+            row_number = 2 + job.processed_rows
+            while chunk := await asyncio.to_thread(_read_chunk, rows, settings.USER_IMPORT_CHUNK_SIZE):
+                numbered = list(zip(itertools.count(row_number), chunk))
+                row_number += len(chunk)
+                result = await importer.import_chunk(numbered)
+                await _record_chunk(session, job_id, len(chunk), result)
+        except Exception as e:
+            await session.rollback()
+            logger.warning(f"User import {job_id} failed: {e}")
+            # The upload holds personal data; only the report is kept
+            await _update_job(
+                session, job_id,
+                status=ImportStatus.FAILED.value,
+                error=str(e)[:1000],
+                file_content=None,
+                finished_at=datetime.utcnow(),
+            )
+        else:
+            await _update_job(
+                session, job_id,
+                status=ImportStatus.COMPLETED.value,
+                file_content=None,
+                finished_at=datetime.utcnow(),
+            )
+        finally:
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
+
+
+class UserImportWorker:
+    """
+    Local background worker for import jobs.
+
+    Jobs run one at a time; each is claimed in the database first, so a
+    job queued on several workers is only imported once. The upload is
+    read from the job row, so any worker can run it.
+
+    Usage:
+        await user_import_worker.start()
+        user_import_worker.enqueue(job.id)
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Start the worker and resume unfinished jobs."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._worker(), name="user-import-worker")
+        await self.requeue_unfinished()
+
+    async def stop(self) -> None:
+        """Stop the worker. A job in progress resumes once it goes stale."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def enqueue(self, job_id: str) -> None:
+        if not self.running:
+            logger.debug(f"User import worker not running; {job_id} left pending")
+            return
+        self._queue.put_nowait(job_id)
+
+    async def requeue_unfinished(self) -> int:
+        """Queue pending and orphaned jobs. Returns the number queued."""
+        stale = datetime.utcnow() - timedelta(minutes=settings.USER_IMPORT_STALE_MINUTES)
+        factory = get_async_session_factory()
+        async with factory() as session:
+            result = await session.execute(
+                select(UserImportJob.id).where(
+                    or_(
+                        UserImportJob.status == ImportStatus.PENDING.value,
+                        and_(
+                            UserImportJob.status == ImportStatus.RUNNING.value,
+                            UserImportJob.updated_at < stale,
+                        ),
+                    )
+                )
+            )
+            job_ids = result.scalars().all()
+        for job_id in job_ids:
+            self.enqueue(job_id)
+        return len(job_ids)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await run_import_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"User import crashed for {job_id}")
+            finally:
+                self._queue.task_done()
+
+
+# Global worker instance
+user_import_worker = UserImportWorker()
+
+
+async def resume_user_imports() -> int:
+    """Scheduled job picking up imports orphaned by a stopped worker."""
+    return await user_import_worker.requeue_unfinished()
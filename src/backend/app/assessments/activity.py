@@ -0,0 +1,27 @@
+"""
+Element Activity Counters
+
+Statement helper keeping the denormalized comment_count, evidence_count
+and last_activity_at columns of AssessmentElementResponse in sync. Run it
+in the same transaction as the insert/delete it accounts for.
+"""
+from uuid import UUID
+
+from sqlalchemy import func, update
+from sqlalchemy.sql import Update
+
+from src.backend.app.assessments.models import AssessmentElementResponse
+
+
+def element_activity_update(response_id: UUID, comments: int = 0, evidence: int = 0) -> Update:
+    """UPDATE adjusting an element's counters and bumping its last activity time."""
+    return (
+        update(AssessmentElementResponse)
+        .where(AssessmentElementResponse.id == response_id)
+        .values(
+            comment_count=AssessmentElementResponse.comment_count + comments,
+            evidence_count=AssessmentElementResponse.evidence_count + evidence,
+            last_activity_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,389 @@
+"""
+Evidence Processing
+
+Background analysis of uploaded evidence files.
+
+Features:
+- Real MIME type sniffing from file signatures (client content_type is not trusted)
+- Text extraction from PDF/DOCX/plain text for search
+- Preview thumbnails for images
+- Local worker pool, off the request path
+- Rows are claimed atomically before processing, so with several API
+  workers each file is analysed once; claims older than
+  EVIDENCE_PROCESSING_STALE_MINUTES are taken over
+- Decompressed content is capped (EVIDENCE_MAX_DECOMPRESSED_BYTES)
+- Idempotent and retryable (attempt counter + exponential backoff)
+"""
+import asyncio
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Set
+from uuid import UUID
+from xml.etree import ElementTree
+
+from sqlalchemy import and_, or_, select, update
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.assessments.models import Evidence, EvidenceProcessingStatus
+
+logger = logging.getLogger(__name__)
+
+# Optional pypdf import - only needed for PDF text extraction
+try:
+    from pypdf import PdfReader
+    from pypdf import filters as pypdf_filters
+    PYPDF_AVAILABLE = True
+    # Bound inflated stream size (pypdf releases that support it)
+    if hasattr(pypdf_filters, "ZLIB_MAX_OUTPUT_LENGTH"):
+        pypdf_filters.ZLIB_MAX_OUTPUT_LENGTH = settings.EVIDENCE_MAX_DECOMPRESSED_BYTES
+except ImportError:
+    PdfReader = None
+    PYPDF_AVAILABLE = False
+    logger.warning("pypdf not available. PDF text extraction will be disabled.")
+
+# Optional Pillow import - only needed for thumbnails
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    Image = None
+    PILLOW_AVAILABLE = False
+    logger.warning("Pillow not available. Evidence thumbnails will be disabled.")
+
+THUMBNAIL_DIR = "uploads/thumbnails"
+MAX_EXTRACTED_TEXT_CHARS = 1_000_000
+SNIFF_BYTES = 2048
+
+# Magic-byte signatures (checked in order)
+SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),  # Legacy .doc/.xls/.ppt
+]
+
+# Office Open XML containers are ZIP files told apart by their parts
+OOXML_PARTS = [
+    ("word/document.xml", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    ("xl/workbook.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    ("ppt/presentation.xml", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+]
+DOCX_MIME = OOXML_PARTS[0][1]
+THUMBNAIL_MIME_TYPES = {"image/png", "image/jpeg", "image/gif"}
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+@dataclass
+class EvidenceAnalysis:
+    """Result of analysing one evidence file."""
+    mime_type: str
+    size_bytes: int
+    extracted_text: Optional[str] = None
+    thumbnail_path: Optional[str] = None
+
+
+# =============================================================================
+# File analysis (blocking - runs in the worker thread pool)
+# =============================================================================
+
+def sniff_mime_type(path: str) -> str:
+    """Detect the MIME type from file content."""
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+
+    for signature, mime_type in SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return "application/octet-stream"
+        for part, mime_type in OOXML_PARTS:
+            if part in names:
+                return mime_type
+        return "application/zip"
+
+    if not head:
+        return "application/octet-stream"
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character may be cut at the sniff boundary
+        if e.start < len(head) - 3:
+            return "application/octet-stream"
+    return "text/plain" if b"\x00" not in head else "application/octet-stream"
+
+
+def _read_limited(archive: zipfile.ZipFile, name: str) -> bytes:
+    """Read an archive member, refusing to inflate past the configured limit."""
+    limit = settings.EVIDENCE_MAX_DECOMPRESSED_BYTES
+    with archive.open(name) as member:
+        data = member.read(limit + 1)
+    if len(data) > limit:
+        raise ValueError(f"{name} decompresses to more than {limit} bytes")
+    return data
+
+
+def extract_text(path: str, mime_type: str) -> Optional[str]:
+    """Extract searchable text, or None for unsupported types."""
+    if mime_type == "application/pdf":
+        if not PYPDF_AVAILABLE:
+            return None
+        reader = PdfReader(path)
+        pages = []
+        length = 0
+        for page in reader.pages:
+            page_text = page.extract_text() or ""
+            pages.append(page_text)
+            length += len(page_text)
+            if length >= MAX_EXTRACTED_TEXT_CHARS:
+                break  # Later pages would be truncated away anyway
+        text = "\n".join(pages)
+    elif mime_type == DOCX_MIME:
+        with zipfile.ZipFile(path) as archive:
+            root = ElementTree.fromstring(_read_limited(archive, "word/document.xml"))
+        paragraphs = [
+            "".join(node.text or "" for node in paragraph.iter(f"{WORD_NAMESPACE}t"))
+            for paragraph in root.iter(f"{WORD_NAMESPACE}p")
+        ]
+        text = "\n".join(p for p in paragraphs if p)
+    elif mime_type == "text/plain":
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read(MAX_EXTRACTED_TEXT_CHARS)
+    else:
+        return None
+
+    text = text.strip()
+    return text[:MAX_EXTRACTED_TEXT_CHARS] or None
+
+
+def generate_thumbnail(path: str, mime_type: str, evidence_id: UUID) -> Optional[str]:
+    """Write a PNG preview for image evidence and return its path."""
+    if mime_type not in THUMBNAIL_MIME_TYPES or not PILLOW_AVAILABLE:
+        return None
+
+    size = settings.EVIDENCE_THUMBNAIL_SIZE
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    # Deterministic name so reprocessing overwrites instead of duplicating
+    thumbnail_path = os.path.join(THUMBNAIL_DIR, f"{evidence_id}.png")
+    with Image.open(path) as image:
+        image.thumbnail((size, size))
+        image.save(thumbnail_path, format="PNG")
+    return thumbnail_path
+
+
+def analyze_evidence_file(path: str, evidence_id: UUID) -> EvidenceAnalysis:
+    """Run all analysis steps for one file."""
+    mime_type = sniff_mime_type(path)
+    return EvidenceAnalysis(
+        mime_type=mime_type,
+        size_bytes=os.path.getsize(path),
+        extracted_text=extract_text(path, mime_type),
+        thumbnail_path=generate_thumbnail(path, mime_type, evidence_id),
+    )
+
+
+# =============================================================================
+# Worker pool
+# =============================================================================
+
+def _claimable(stale_before: datetime):
+    """Pending rows, or rows whose processing claim is older than stale_before."""
+    return or_(
+        Evidence.processing_status == EvidenceProcessingStatus.PENDING,
+        and_(
+            Evidence.processing_status == EvidenceProcessingStatus.PROCESSING,
+            or_(
+                Evidence.processing_claimed_at.is_(None),
+                Evidence.processing_claimed_at < stale_before,
+            ),
+        ),
+    )
+
+
+class EvidenceProcessor:
+    """
+    Local background worker pool for evidence analysis.
+
+    Evidence IDs are queued after upload; workers claim the row in their own
+    session, analyse the file in a thread pool and store the results. Pending
+    rows and stale claims left by a crash or restart are picked up again on
+    start() and by the evidence-processing-resume job.
+
+    Usage:
+        await evidence_processor.start()
+        evidence_processor.enqueue(evidence.id)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+    ):
+        self.workers = workers or settings.EVIDENCE_PROCESSING_WORKERS
+        self.max_attempts = max_attempts or settings.EVIDENCE_PROCESSING_MAX_ATTEMPTS
+        self.retry_base_seconds = retry_base_seconds or settings.EVIDENCE_PROCESSING_RETRY_SECONDS
+        self.stale_after = timedelta(minutes=settings.EVIDENCE_PROCESSING_STALE_MINUTES)
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[UUID] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the workers and requeue unfinished evidence."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="evidence-processing"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"evidence-processor-{i}")
+            for i in range(self.workers)
+        ]
+        await self._requeue_unfinished()
+        logger.info(f"Evidence processor started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers. Unfinished rows stay pending for the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queued.clear()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def enqueue(self, evidence_id: UUID) -> None:
+        """Schedule an evidence row for processing (duplicates are ignored)."""
+        if not self.running:
+            # Picked up by _requeue_unfinished on next start
+            logger.debug(f"Evidence processor not running; {evidence_id} left pending")
+            return
+        if evidence_id in self._queued:
+            return
+        self._queued.add(evidence_id)
+        self._queue.put_nowait(evidence_id)
+
+    async def _requeue_unfinished(self) -> int:
+        """Queue pending rows and rows whose claim has gone stale."""
+        factory = get_async_session_factory()
+        async with factory() as session:
+            result = await session.execute(
+                select(Evidence.id).where(_claimable(datetime.utcnow() - self.stale_after))
+            )
+            evidence_ids = result.scalars().all()
+        for evidence_id in evidence_ids:
+            self.enqueue(evidence_id)
+        return len(evidence_ids)
+
+    async def _claim(self, session, evidence_id: UUID):
+        """Mark a row PROCESSING unless another worker holds a live claim."""
+        now = datetime.utcnow()
+        result = await session.execute(
+            update(Evidence)
+            .where(Evidence.id == evidence_id, _claimable(now - self.stale_after))
+            .values(
+                processing_status=EvidenceProcessingStatus.PROCESSING,
+                processing_claimed_at=now,
+                processing_attempts=Evidence.processing_attempts + 1,
+            )
+            .returning(Evidence.file_url, Evidence.processing_attempts)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.first()
+        await session.commit()
+        return claimed
+
+    async def _worker(self) -> None:
+        while True:
+            evidence_id = await self._queue.get()
+            self._queued.discard(evidence_id)
+            try:
+                await self.process(evidence_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Evidence processing crashed for {evidence_id}")
+            finally:
+                self._queue.task_done()
+
+    async def process(self, evidence_id: UUID) -> None:
+        """Analyse one evidence row and persist the results."""
+        factory = get_async_session_factory()
+        async with factory() as session:
+            claimed = await self._claim(session, evidence_id)
+            if claimed is None:
+                return  # Deleted, done, or being processed elsewhere
+            file_url, attempts = claimed
+
+            loop = asyncio.get_running_loop()
+            try:
+                analysis = await loop.run_in_executor(
+                    self._executor, analyze_evidence_file, file_url, evidence_id
+                )
+            except Exception as e:
+                exhausted = attempts >= self.max_attempts
+                await self._store(
+                    session, evidence_id,
+                    processing_status=(
+                        EvidenceProcessingStatus.FAILED if exhausted else EvidenceProcessingStatus.PENDING
+                    ),
+                    processing_error=str(e)[:1000],
+                )
+                logger.warning(
+                    f"Evidence {evidence_id} processing failed "
+                    f"(attempt {attempts}/{self.max_attempts}): {e}"
+                )
+                if not exhausted:
+                    self._schedule_retry(evidence_id, attempts)
+                return
+
+            await self._store(
+                session, evidence_id,
+                detected_mime_type=analysis.mime_type,
+                size_bytes=analysis.size_bytes,
+                extracted_text=analysis.extracted_text,
+                thumbnail_url=analysis.thumbnail_path,
+                processing_status=EvidenceProcessingStatus.COMPLETED,
+                processing_error=None,
+                processed_at=datetime.utcnow(),
+            )
+
+    async def _store(self, session, evidence_id: UUID, **values) -> None:
+        await session.execute(
+            update(Evidence)
+            .where(Evidence.id == evidence_id)
+            .values(processing_claimed_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    def _schedule_retry(self, evidence_id: UUID, attempt: int) -> None:
+        delay = self.retry_base_seconds * (2 ** (attempt - 1))
+        asyncio.get_running_loop().call_later(delay, self.enqueue, evidence_id)
+
+
+# Global processor instance
+evidence_processor = EvidenceProcessor()
+
+
+async def resume_evidence_processing() -> int:
+    """Scheduled job picking up rows orphaned by a stopped worker."""
+    return await evidence_processor._requeue_unfinished()
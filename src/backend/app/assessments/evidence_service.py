@@ -1,13 +1,21 @@
 import os
 import shutil
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID, uuid4
 from fastapi import UploadFile
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.app.assessments.models import Evidence
+from src.backend.app.assessments.models import (
+    Assessment, AssessmentDomain, AssessmentElementResponse, Evidence, EvidenceProcessingStatus
+)
+from src.backend.app.assessments.activity import element_activity_update
+from src.backend.app.assessments.evidence_export import EvidenceArchiveEntry
+from src.backend.app.assessments.evidence_processing import evidence_processor
 from src.backend.config import settings
 
 UPLOAD_DIR = "uploads/evidence"
+ARCHIVE_FETCH_SIZE = 500
 
 class EvidenceService:
     def __init__(self, session: AsyncSession):
@@ -29,13 +37,107 @@ class EvidenceService:
             response_id=response_id,
             file_name=file.filename,
             file_url=file_path, # In production, S3 URL
-            mime_type=file.content_type,
-            uploaded_by=user_id
+            mime_type=file.content_type, # Client-declared; detected_mime_type is filled in by the processor
+            size_bytes=os.path.getsize(file_path),
+            uploaded_by=user_id,
+            processing_status=EvidenceProcessingStatus.PENDING
         )
         self.session.add(evidence)
+        await self.session.execute(element_activity_update(response_id, evidence=1))
         await self.session.commit()
         await self.session.refresh(evidence)
+
+        # Sniffing, text extraction and thumbnails happen off the request path
+        evidence_processor.enqueue(evidence.id)
         return evidence
     
+    async def get_evidence_scope(self, evidence_id: UUID) -> Optional[Tuple[UUID, UUID]]:
+        """(assessment_id, domain_id) the evidence belongs to, for access checks."""
+        result = await self.session.execute(
+            select(AssessmentDomain.assessment_id, AssessmentDomain.id)
+            .join(AssessmentElementResponse, AssessmentElementResponse.domain_record_id == AssessmentDomain.id)
+            .join(Evidence, Evidence.response_id == AssessmentElementResponse.id)
+            .where(Evidence.id == evidence_id)
+        )
+        row = result.first()
+        return (row.assessment_id, row.id) if row else None
+
     async def delete_evidence(self, evidence_id: UUID) -> bool:
-        pass # Todo: Implement if needed
+        evidence = await self.session.get(Evidence, evidence_id)
+        if not evidence:
+            return False
+
+        await self.session.delete(evidence)
+        await self.session.execute(element_activity_update(evidence.response_id, evidence=-1))
+        await self.session.commit()
+
+        # Remove files only once the row is gone
+        for path in (evidence.file_url, evidence.thumbnail_url):
+            if path and os.path.exists(path):
+                os.remove(path)
+        return True
+
+    async def iter_assessment_evidence(
+        self,
+        assessment_id: UUID,
+        domain_id: Optional[UUID] = None,
+        domain_ids: Optional[List[UUID]] = None,
+    ) -> AsyncIterator[EvidenceArchiveEntry]:
+        """
+        Evidence of an assessment for archive export.
+
+        Limited to one domain (domain_id) or to a set of domains (domain_ids,
+        e.g. those delegated to the requesting user).
+        """
+        stmt = self._archive_query().where(AssessmentDomain.assessment_id == assessment_id)
+        if domain_id:
+            stmt = stmt.where(AssessmentDomain.id == domain_id)
+        if domain_ids is not None:
+            stmt = stmt.where(AssessmentDomain.id.in_(domain_ids))
+        async for entry in self._iter_archive_entries(stmt, include_assessment=False):
+            yield entry
+
+    async def iter_organization_evidence(self, organization_id: UUID) -> AsyncIterator[EvidenceArchiveEntry]:
+        """Evidence of every assessment in an organization for archive export."""
+        stmt = (
+            self._archive_query()
+            .join(Assessment, Assessment.id == AssessmentDomain.assessment_id)
+            .where(Assessment.organization_id == organization_id)
+        )
+        async for entry in self._iter_archive_entries(stmt, include_assessment=True):
+            yield entry
+
+    def _archive_query(self):
+        # Plain columns (no ORM entities) keep the per-row footprint small
+        return (
+            select(
+                Evidence.id,
+                Evidence.file_name,
+                Evidence.file_url,
+                func.coalesce(Evidence.detected_mime_type, Evidence.mime_type).label("mime_type"),
+                Evidence.uploaded_by,
+                Evidence.created_at,
+                AssessmentElementResponse.element_id,
+                AssessmentDomain.domain_id,
+                AssessmentDomain.assessment_id,
+            )
+            .join(AssessmentElementResponse, AssessmentElementResponse.id == Evidence.response_id)
+            .join(AssessmentDomain, AssessmentDomain.id == AssessmentElementResponse.domain_record_id)
+            .order_by(AssessmentDomain.assessment_id, AssessmentDomain.domain_id, AssessmentElementResponse.element_id, Evidence.created_at)
+        )
+
+    async def _iter_archive_entries(self, stmt, include_assessment: bool) -> AsyncIterator[EvidenceArchiveEntry]:
+        # Server-side cursor so organization-wide exports are not loaded at once
+        result = await self.session.stream(stmt.execution_options(yield_per=ARCHIVE_FETCH_SIZE))
+        async for row in result:
+            yield EvidenceArchiveEntry(
+                evidence_id=row.id,
+                file_name=row.file_name,
+                file_path=row.file_url,
+                mime_type=row.mime_type,
+                uploaded_by=row.uploaded_by,
+                uploaded_at=row.created_at,
+                domain_id=row.domain_id,
+                element_id=row.element_id,
+                assessment_id=row.assessment_id if include_assessment else None,
+            )
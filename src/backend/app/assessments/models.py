@@ -1,9 +1,9 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 from enum import Enum
-from sqlalchemy import String, ForeignKey, Float, Enum as SQLEnum, Integer, Text, Boolean
+from sqlalchemy import String, ForeignKey, Float, Enum as SQLEnum, Integer, Text, Boolean, DateTime, Computed, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 
 from src.backend.database import Base
 from src.backend.app.common.models import TimestampMixin
@@ -16,6 +16,12 @@ class AssessmentStatus(str, Enum):
     COMPLETED = "COMPLETED"
     ARCHIVED = "ARCHIVED"
 
+class EvidenceProcessingStatus(str, Enum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
 class Assessment(Base, TimestampMixin):
     __tablename__ = "assessments"
 
@@ -79,33 +85,86 @@ class AssessmentElementResponse(Base, TimestampMixin):
     maturity_level: Mapped[int] = mapped_column(Integer, nullable=True) # 1-4
     score: Mapped[float] = mapped_column(Float, nullable=True) # 0, 33, 67, 100
     comment: Mapped[str] = mapped_column(Text, nullable=True)
+
+    # Full-text index (see app/search); maintained by Postgres on write
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(comment, '')) || "
+            "to_tsvector('arabic', coalesce(comment, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+    # Maintained by CommentService/EvidenceService (see activity.py) so
+    # overviews never need to load the child collections
+    comment_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    evidence_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_activity_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Relationships
+    # Child collections are never loaded implicitly; use selectinload() where
+    # needed. Deletes rely on the ON DELETE CASCADE foreign keys.
     domain: Mapped["AssessmentDomain"] = relationship(back_populates="elements")
     evidence: Mapped[list["Evidence"]] = relationship(
         back_populates="response", 
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="noload"
     )
     comments: Mapped[list["Comment"]] = relationship(
         "Comment",
         back_populates="response",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        passive_deletes=True,
+        lazy="noload"
+    )
+
+    __table_args__ = (
+        Index("ix_assessment_element_responses_search_vector", "search_vector", postgresql_using="gin"),
     )
 
 class Evidence(Base, TimestampMixin):
     __tablename__ = "evidence"
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
-    response_id: Mapped[UUID] = mapped_column(ForeignKey("assessment_element_responses.id"), nullable=False, index=True)
+    response_id: Mapped[UUID] = mapped_column(ForeignKey("assessment_element_responses.id", ondelete="CASCADE"), nullable=False, index=True)
     
     file_name: Mapped[str] = mapped_column(String, nullable=False)
     file_url: Mapped[str] = mapped_column(String, nullable=False) # S3 key or URL
     mime_type: Mapped[str] = mapped_column(String, nullable=True)
     size_bytes: Mapped[int] = mapped_column(Integer, nullable=True)
     uploaded_by: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+
+    # Background processing results (see evidence_processing.py)
+    detected_mime_type: Mapped[str] = mapped_column(String, nullable=True) # Sniffed from content, unlike mime_type
+    extracted_text: Mapped[str] = mapped_column(Text, nullable=True)
+    thumbnail_url: Mapped[str] = mapped_column(String, nullable=True)
+    processing_status: Mapped[str] = mapped_column(String(20), default=EvidenceProcessingStatus.PENDING, nullable=False, index=True)
+    processing_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    processing_error: Mapped[str] = mapped_column(Text, nullable=True)
+    processing_claimed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True) # Worker lease
+    processed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Full-text index (see app/search); file name ranks above body text.
+    # Body text is capped to stay well under the 1MB tsvector limit.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(file_name, '')), 'A') || "
+            "setweight(to_tsvector('arabic', coalesce(file_name, '')), 'A') || "
+            "to_tsvector('english', left(coalesce(extracted_text, ''), 100000)) || "
+            "to_tsvector('arabic', left(coalesce(extracted_text, ''), 100000))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     # Relationships
     response: Mapped["AssessmentElementResponse"] = relationship(back_populates="evidence")
 
+    __table_args__ = (
+        Index("ix_evidence_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
@@ -1,17 +1,19 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database import get_db
 from src.backend.app.auth.dependencies import get_current_user
 from src.backend.app.auth.models import User
 from src.backend.app.assessments.schemas import (
-    AssessmentCreate, AssessmentResponse, AssessmentUpdate,
-    AssessmentDomainResponse, AssessmentElementUpdate, AssessmentElementResponseSchema
+    AssessmentCreate, AssessmentResponse, AssessmentSummary, AssessmentUpdate,
+    AssessmentDomainSummary, AssessmentElementUpdate, AssessmentElementResponseSchema
 )
 from src.backend.app.assessments.service import AssessmentService
 from src.backend.app.assessments.evidence_service import EvidenceService
+from src.backend.app.assessments.evidence_export import EvidenceArchiveStreamer
 from src.backend.app.assessments.models import AssessmentStatus
 
 router = APIRouter(prefix="/assessments", tags=["Assessments"])
@@ -26,7 +28,7 @@ async def create_assessment(
     # Optional: check permissions (e.g. only CLIENT_ADMIN or ANALYST)
     return await service.create_assessment(data, current_user.id)
 
-@router.get("/", response_model=List[AssessmentResponse])
+@router.get("/", response_model=List[AssessmentSummary])
 async def list_assessments(
     skip: int = 0,
     limit: int = 20,
@@ -56,6 +58,35 @@ async def get_assessment(
          raise HTTPException(status_code=403, detail="Not authorized to view this assessment")
     return assessment
 
+@router.get("/{assessment_id}/evidence/export")
+async def export_evidence(
+    assessment_id: UUID,
+    domain_id: Optional[UUID] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Download all evidence of an assessment (or one domain) as a ZIP archive."""
+    service = AssessmentService(db)
+    if not await service.assessment_exists(assessment_id):
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    domain_ids = None
+    if domain_id:
+        if not await service.check_access(current_user.id, current_user.role, assessment_id, domain_id):
+            raise HTTPException(status_code=403, detail="Not authorized to export this evidence")
+    else:
+        # Users delegated single domains only get those domains
+        domain_ids = await service.delegated_domain_ids(current_user.id, current_user.role, assessment_id)
+        if domain_ids == []:
+            raise HTTPException(status_code=403, detail="Not authorized to export this evidence")
+
+    evidence_service = EvidenceService(db)
+    entries = evidence_service.iter_assessment_evidence(assessment_id, domain_id, domain_ids)
+    return StreamingResponse(
+        EvidenceArchiveStreamer().stream(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=evidence_{assessment_id}.zip"}
+    )
+
 @router.patch("/{assessment_id}", response_model=AssessmentResponse)
 async def update_assessment(
     assessment_id: UUID,
@@ -68,7 +99,7 @@ async def update_assessment(
     # ...
     return await service.update_assessment(assessment_id, data)
 
-@router.post("/{assessment_id}/domains/{domain_id}/assign", response_model=AssessmentDomainResponse)
+@router.post("/{assessment_id}/domains/{domain_id}/assign", response_model=AssessmentDomainSummary)
 async def assign_domain(
     assessment_id: UUID,
     domain_id: UUID,
@@ -102,3 +133,19 @@ async def upload_evidence(
 ):
     service = EvidenceService(db)
     return await service.upload_evidence(response_id, file, current_user.id)
+
+@router.delete("/evidence/{evidence_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_evidence(
+    evidence_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    evidence_service = EvidenceService(db)
+    scope = await evidence_service.get_evidence_scope(evidence_id)
+    if not scope:
+        raise HTTPException(status_code=404, detail="Evidence not found")
+
+    assessment_id, domain_id = scope
+    if not await AssessmentService(db).check_access(current_user.id, current_user.role, assessment_id, domain_id):
+        raise HTTPException(status_code=403, detail="Not authorized to delete this evidence")
+    await evidence_service.delete_evidence(evidence_id)
@@ -13,25 +13,34 @@ class EvidenceResponse(BaseModel):
     size_bytes: Optional[int]
     uploaded_by: UUID
     created_at: datetime
+    detected_mime_type: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    processing_status: Optional[str] = None
     
     model_config = ConfigDict(from_attributes=True)
 
-class AssessmentElementResponseSchema(BaseModel):
+class AssessmentElementSummary(BaseModel):
+    """Element as listed in overviews: counters only, no child collections."""
     id: UUID
     domain_record_id: UUID
     element_id: int
     maturity_level: Optional[int]
     score: Optional[float]
     comment: Optional[str]
-    evidence: List[EvidenceResponse] = []
+    comment_count: int = 0
+    evidence_count: int = 0
+    last_activity_at: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
 
+class AssessmentElementResponseSchema(AssessmentElementSummary):
+    evidence: List[EvidenceResponse] = []
+
 class AssessmentElementUpdate(BaseModel):
     maturity_level: int
     comment: Optional[str] = None
 
-class AssessmentDomainResponse(BaseModel):
+class AssessmentDomainSummary(BaseModel):
     id: UUID
     assessment_id: UUID
     domain_id: int
@@ -39,10 +48,13 @@ class AssessmentDomainResponse(BaseModel):
     score: Optional[float]
     status: str
     assignee_id: Optional[UUID]
-    elements: List[AssessmentElementResponseSchema] = []
+    elements: List[AssessmentElementSummary] = []
     
     model_config = ConfigDict(from_attributes=True)
 
+class AssessmentDomainResponse(AssessmentDomainSummary):
+    elements: List[AssessmentElementResponseSchema] = []
+
 class AssessmentDomainUpdate(BaseModel):
     assignee_id: Optional[UUID]
 
@@ -55,7 +67,7 @@ class AssessmentUpdate(BaseModel):
     deadline: Optional[datetime] = None
     status: Optional[AssessmentStatus] = None
 
-class AssessmentResponse(BaseModel):
+class AssessmentSummary(BaseModel):
     id: UUID
     organization_id: UUID
     status: AssessmentStatus
@@ -64,6 +76,10 @@ class AssessmentResponse(BaseModel):
     created_by: UUID
     created_at: datetime
     updated_at: datetime
-    domains: List[AssessmentDomainResponse] = []
+    domains: List[AssessmentDomainSummary] = []
     
     model_config = ConfigDict(from_attributes=True)
+
+class AssessmentResponse(AssessmentSummary):
+    """Assessment detail, with each element's evidence."""
+    domains: List[AssessmentDomainResponse] = []
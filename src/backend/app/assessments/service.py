@@ -49,7 +49,7 @@ class AssessmentService:
             return True
 
         # Check for delegations
-        delegation_stmt = select(AssessmentDelegation).where(
+        delegation_stmt = select(AssessmentDelegation.id).where(
             AssessmentDelegation.assessment_id == assessment_id,
             AssessmentDelegation.user_id == user_id,
             AssessmentDelegation.status == DelegationStatus.ACTIVE
@@ -61,11 +61,38 @@ class AssessmentService:
                  (AssessmentDelegation.domain_id == domain_id) | (AssessmentDelegation.domain_id == None)
              )
         
-        delegation_result = await self.session.execute(delegation_stmt)
-        if delegation_result.scalar_one_or_none():
-            return True
-            
-        return False
+        # A user may hold several active delegations
+        delegation_result = await self.session.execute(delegation_stmt.limit(1))
+        return delegation_result.first() is not None
+
+    async def delegated_domain_ids(self, user_id: UUID, role: Role, assessment_id: UUID) -> Optional[List[UUID]]:
+        """
+        Domains (assessment_domains.id) a user may see across the whole assessment.
+
+        None means every domain (admins, analysts, the creator and
+        assessment-wide delegates); otherwise only the domains delegated
+        to the user, possibly none.
+        """
+        if role in [Role.SUPER_ADMIN, Role.ANALYST]:
+            return None
+
+        created_by = (await self.session.execute(
+            select(Assessment.created_by).where(Assessment.id == assessment_id)
+        )).scalar_one_or_none()
+        if created_by == user_id:
+            return None
+
+        result = await self.session.execute(
+            select(AssessmentDelegation.domain_id).where(
+                AssessmentDelegation.assessment_id == assessment_id,
+                AssessmentDelegation.user_id == user_id,
+                AssessmentDelegation.status == DelegationStatus.ACTIVE
+            )
+        )
+        domain_ids = result.scalars().all()
+        if any(domain_id is None for domain_id in domain_ids):
+            return None
+        return list(domain_ids)
 
     async def create_assessment(self, data: AssessmentCreate, user_id: UUID) -> Assessment:
         # Create Assessment
@@ -126,6 +153,10 @@ class AssessmentService:
             raise AssessmentNotFound()
         return assessment
 
+    async def assessment_exists(self, assessment_id: UUID) -> bool:
+        result = await self.session.execute(select(Assessment.id).where(Assessment.id == assessment_id))
+        return result.scalar_one_or_none() is not None
+
     async def list_assessments(self, organization_id: UUID, skip: int = 0, limit: int = 20) -> List[Assessment]:
         result = await self.session.execute(
             select(Assessment)
@@ -140,8 +171,8 @@ class AssessmentService:
         for key, value in data.model_dump(exclude_unset=True).items():
             setattr(assessment, key, value)
         await self.session.commit()
-        await self.session.refresh(assessment)
-        return assessment
+        # Reloaded with the detail options; refresh() would leave evidence unloaded
+        return await self.get_assessment(assessment_id)
 
     async def update_domain_assignee(self, assessment_id: UUID, domain_id: UUID, assignee_id: UUID) -> AssessmentDomain:
         # Check if domain exists
@@ -158,13 +189,19 @@ class AssessmentService:
         await self.session.refresh(domain)
         return domain
 
+    async def _get_element_response(self, response_id: UUID) -> Optional[AssessmentElementResponse]:
+        result = await self.session.execute(
+            select(AssessmentElementResponse)
+            .options(
+                selectinload(AssessmentElementResponse.domain),
+                selectinload(AssessmentElementResponse.evidence),
+            )
+            .where(AssessmentElementResponse.id == response_id)
+        )
+        return result.scalars().first()
+
     async def update_element_response(self, response_id: UUID, data: AssessmentElementUpdate, user_id: UUID, user_role: Role) -> AssessmentElementResponse:
-        stmt = select(AssessmentElementResponse).options(
-            selectinload(AssessmentElementResponse.domain)
-        ).where(AssessmentElementResponse.id == response_id)
-        
-        result = await self.session.execute(stmt)
-        response = result.scalars().first()
+        response = await self._get_element_response(response_id)
         if not response:
             raise ElementResponseNotFound()
         
@@ -182,5 +219,4 @@ class AssessmentService:
             response.score = data.maturity_level * 25.0 
             
         await self.session.commit()
-        await self.session.refresh(response)
-        return response
+        return await self._get_element_response(response_id)
@@ -0,0 +1,101 @@
+"""
+Auth Cleanup
+
+Scheduled removal of dead auth rows so the token-hash lookup tables stay
+small:
+- user_sessions past expiry
+- refresh_tokens past expiry (revoked ones are kept until then)
+- password_reset_tokens that are used or past expiry
+- invitations more than INVITATION_RETENTION_DAYS past expiry
+- revoked_access_tokens whose token has expired
+
+Rows are deleted in committed chunks of AUTH_CLEANUP_BATCH_SIZE so a large
+backlog never becomes one long transaction.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.auth.models import (
+    Invitation, PasswordResetToken, RefreshToken, RevokedAccessToken, UserSession,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sessions may have newer activity waiting in the tracker (flushed every
+# SESSION_ACTIVITY_FLUSH_SECONDS), so only sessions expired longer than this go
+SESSION_EXPIRY_GRACE = timedelta(hours=1)
+
+
+class AuthCleanupService:
+    def __init__(self, session: AsyncSession, batch_size: Optional[int] = None):
+        self.session = session
+        self.batch_size = batch_size or settings.AUTH_CLEANUP_BATCH_SIZE
+
+    async def run(self, now: Optional[datetime] = None) -> int:
+        """Run every cleanup. Returns the total number of rows deleted."""
+        now = now or datetime.now(timezone.utc)
+        removed = 0
+        removed += await self.purge_sessions(now)
+        removed += await self.purge_refresh_tokens(now)
+        removed += await self.purge_password_reset_tokens(now)
+        removed += await self.purge_invitations(now)
+        removed += await self.purge_revoked_access_tokens(now)
+        return removed
+
+    async def purge_sessions(self, now: datetime) -> int:
+        return await self._purge_chunks(UserSession, UserSession.expires_at < now - SESSION_EXPIRY_GRACE)
+
+    async def purge_refresh_tokens(self, now: datetime) -> int:
+        return await self._purge_chunks(RefreshToken, RefreshToken.expires_at < now)
+
+    async def purge_password_reset_tokens(self, now: datetime) -> int:
+        return await self._purge_chunks(
+            PasswordResetToken,
+            or_(PasswordResetToken.expires_at < now, PasswordResetToken.used_at.is_not(None)),
+        )
+
+    async def purge_invitations(self, now: datetime) -> int:
+        cutoff = now - timedelta(days=settings.INVITATION_RETENTION_DAYS)
+        return await self._purge_chunks(Invitation, Invitation.expires_at < cutoff)
+
+    async def purge_revoked_access_tokens(self, now: datetime) -> int:
+        return await self._purge_chunks(
+            RevokedAccessToken, RevokedAccessToken.expires_at < now, key=RevokedAccessToken.jti,
+        )
+
+    async def _purge_chunks(self, model, condition, key=None) -> int:
+        key = key if key is not None else model.id
+        removed = 0
+        while True:
+            chunk = (
+                select(key)
+                .where(condition)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await self.session.execute(
+                delete(model)
+                .where(key.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            removed += result.rowcount or 0
+            if (result.rowcount or 0) < self.batch_size:
+                break
+        if removed:
+            logger.info(f"Deleted {removed} expired rows from {model.__tablename__}")
+        return removed
+
+
+async def run_auth_cleanup() -> int:
+    """Scheduled job entry point."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        return await AuthCleanupService(session).run()
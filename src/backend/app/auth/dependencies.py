@@ -6,12 +6,14 @@ TASK-016: FastAPI dependencies and security guards.
 Features:
 - JWT token extraction and validation
 - Current user resolution
+- Stream ticket resolution for EventSource connections
 - Role-based access control
 - Tenant isolation
 """
 from typing import Optional, List
 from functools import lru_cache
 
+import jwt
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy import select
@@ -20,10 +22,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.backend.database import get_async_session
 from src.backend.app.auth.models import User, Role
 from src.backend.app.auth.jwt_service import JWTService
-from src.backend.app.auth.permissions import PermissionService
+from src.backend.app.auth.permissions import PERMISSION_BITS, ROLE_MASKS
+from src.backend.app.auth.revocation import revocation_list
 from src.backend.app.auth.exceptions import (
     InvalidCredentialsException,
     TokenExpiredException,
+    TokenRevokedException,
     InsufficientPermissionsException,
 )
 
@@ -49,6 +53,7 @@ async def get_current_user(
     Raises:
         InvalidCredentialsException: No token or invalid token
         TokenExpiredException: Token has expired
+        TokenRevokedException: Token was revoked (e.g. by logout)
     """
     if not credentials:
         raise InvalidCredentialsException()
@@ -57,12 +62,16 @@ async def get_current_user(
 
     # Validate token
     try:
-        payload = jwt_service.verify_access_token(token)
-    except Exception as e:
-        if "expired" in str(e).lower():
-            raise TokenExpiredException()
+        payload = jwt_service.verify_access_principal(token)
+    except jwt.ExpiredSignatureError:
+        raise TokenExpiredException()
+    except Exception:
         raise InvalidCredentialsException()
 
+    # Bloom filter miss (the common case) needs no store lookup
+    if await revocation_list.is_revoked(payload.jti):
+        raise TokenRevokedException()
+
     # Get user from database
     user_id = payload.sub
     if not user_id:
@@ -79,6 +88,47 @@ async def get_current_user(
     return user
 
 
+async def get_user_from_stream_ticket(
+    ticket: str,
+    session: AsyncSession,
+    jwt_service: JWTService,
+) -> User:
+    """
+    Resolve the user of a stream ticket (see JWTService.create_stream_ticket).
+    
+    Access tokens are rejected here, so a bearer token is never accepted
+    from a URL.
+    
+    Raises:
+        InvalidCredentialsException: Invalid ticket or inactive user
+        TokenExpiredException: Ticket has expired
+        TokenRevokedException: The access token it was minted from was revoked
+    """
+    try:
+        payload = jwt_service.decode_token(ticket, expected_type="sse")
+    except jwt.ExpiredSignatureError:
+        raise TokenExpiredException()
+    except Exception:
+        raise InvalidCredentialsException()
+
+    if await revocation_list.is_revoked(payload.get("sid", "")):
+        raise TokenRevokedException()
+
+    user_id = payload.get("sub")
+    if not user_id:
+        raise InvalidCredentialsException()
+
+    result = await session.execute(
+        select(User).where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+
+    if not user or not user.is_active:
+        raise InvalidCredentialsException()
+
+    return user
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
     session: AsyncSession = Depends(get_async_session),
@@ -90,7 +140,7 @@ async def get_current_user_optional(
     
     try:
         return await get_current_user(credentials, session, jwt_service)
-    except (InvalidCredentialsException, TokenExpiredException):
+    except (InvalidCredentialsException, TokenExpiredException, TokenRevokedException):
         return None
 
 
@@ -117,15 +167,20 @@ def require_permission(permission: str):
     """
     Dependency factory for permission-based access.
     
+    The permission is resolved to its bit once, here, so an unknown name
+    fails at import time and each request is a single AND.
+    
     Usage:
         @router.post("/users")
         async def create_user(user: User = Depends(require_permission("users:write"))):
             ...
     """
+    bit = PERMISSION_BITS[permission]
+
     async def permission_checker(
         user: User = Depends(get_current_user),
     ) -> User:
-        if not PermissionService.has_permission(user.role, permission):
+        if not ROLE_MASKS.get(user.role, 0) & bit:
             raise InsufficientPermissionsException()
         return user
     
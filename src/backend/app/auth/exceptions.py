@@ -112,6 +112,14 @@ class MFAInvalidCodeException(NudjException):
     message_en = "Invalid verification code"
 
 
+class MFATooManyAttemptsException(NudjException):
+    """Too many failed MFA codes."""
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    error_code = "MFA_TOO_MANY_ATTEMPTS"
+    message_ar = "محاولات تحقق كثيرة. حاول مرة أخرى لاحقاً"
+    message_en = "Too many verification attempts. Please try again later"
+
+
 class MFANotEnabledException(NudjException):
     """MFA not enabled for this user."""
     status_code = status.HTTP_400_BAD_REQUEST
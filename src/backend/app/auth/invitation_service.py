@@ -5,19 +5,26 @@ TASK-009: Secure invitation management for registration.
 
 Features:
 - Generate secure invitation tokens
-- Email sending (placeholder)
+- Email sending via the transactional outbox
 - Token validation with expiry check
-- Bulk invitation support
+- Bulk invitations validated and deduplicated in memory, checked with
+  set-based queries and inserted with one statement
 """
 import secrets
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_
+from email_validator import EmailNotValidError, validate_email
+from sqlalchemy import String, and_, any_, bindparam, insert, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.config import settings
-from src.backend.app.auth.models import Invitation, Role
+from src.backend.app.auth.models import Invitation, Role, User
+from src.backend.app.assessments.service import HR_DOMAINS
+from src.backend.app.organizations.models import Organization
 from src.backend.app.auth.exceptions import (
     InvitationNotFoundException,
     InvitationExpiredException,
@@ -62,8 +69,6 @@ class InvitationService:
             EmailAlreadyRegisteredException: If email already registered
         """
         # Check if email already registered
-        from src.backend.app.auth.models import User
-        
         existing_user = await self.session.execute(
             select(User).where(User.email == email.lower())
         )
@@ -93,33 +98,108 @@ class InvitationService:
         self,
         invitations_data: List[Dict[str, Any]],
         invited_by: str,
-    ) -> List[Invitation]:
+    ) -> "BulkInvitationResult":
         """
         Create multiple invitations at once.
         
+        The batch is validated and deduplicated in memory, organizations and
+        registered emails are checked with one query each, pending
+        invitations for the remaining emails are expired with one UPDATE,
+        and the new invitations are written with one INSERT. Emails are not
+        queued; see send_invitation_emails().
+        
         Args:
             invitations_data: List of invitation dicts with email, role, etc.
             invited_by: User ID of the inviter
             
         Returns:
-            List of created Invitation objects
+            Created invitations and the skipped entries with their reason
         """
-        created = []
+        result = BulkInvitationResult()
+        rows: Dict[str, Dict[str, Any]] = {}
+        now = datetime.utcnow()
+        expires_at = now + timedelta(days=self.expire_days)
+
         for data in invitations_data:
+            raw_email = str(data.get("email") or "").strip()
             try:
-                invitation = await self.create_invitation(
-                    email=data["email"],
-                    role=Role(data["role"]),
-                    organization_id=data.get("organization_id"),
-                    domain_ids=data.get("domain_ids"),
-                    invited_by=invited_by,
-                )
-                created.append(invitation)
-            except EmailAlreadyRegisteredException:
-                # Skip already registered emails in bulk
+                email = validate_email(raw_email, check_deliverability=False).normalized.lower()
+            except EmailNotValidError:
+                result.skip(raw_email, SKIP_INVALID_EMAIL)
                 continue
-        
-        return created
+            try:
+                role = Role(data.get("role"))
+            except ValueError:
+                result.skip(email, SKIP_INVALID_ROLE)
+                continue
+            organization_id = data.get("organization_id")
+            if role != Role.SUPER_ADMIN and not organization_id:
+                result.skip(email, SKIP_ORGANIZATION_REQUIRED)
+                continue
+            if organization_id and not _is_uuid(organization_id):
+                result.skip(email, SKIP_UNKNOWN_ORGANIZATION)
+                continue
+            domain_ids = data.get("domain_ids")
+            if domain_ids and not set(map(str, domain_ids)) <= VALID_DOMAIN_IDS:
+                result.skip(email, SKIP_UNKNOWN_DOMAIN)
+                continue
+            if email in rows:
+                result.skip(email, SKIP_DUPLICATE)
+                continue
+            rows[email] = {
+                "id": str(uuid4()),
+                "token": self._generate_token(),
+                "email": email,
+                "role": role,
+                "organization_id": organization_id,
+                "domain_ids": {"ids": domain_ids} if domain_ids else None,
+                "expires_at": expires_at,
+                "invited_by": invited_by,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+        if not rows:
+            return result
+
+        organization_ids = {row["organization_id"] for row in rows.values() if row["organization_id"]}
+        if organization_ids:
+            known = await self.session.execute(
+                select(Organization.id).where(Organization.id.in_(organization_ids))
+            )
+            known_ids = {str(organization_id) for organization_id in known.scalars()}
+            for email, row in list(rows.items()):
+                if row["organization_id"] and str(row["organization_id"]) not in known_ids:
+                    del rows[email]
+                    result.skip(email, SKIP_UNKNOWN_ORGANIZATION)
+            if not rows:
+                return result
+
+        # One array parameter, however large the batch
+        registered = await self.session.execute(
+            select(User.email).where(User.email == any_(_email_array(list(rows))))
+        )
+        for email in registered.scalars():
+            rows.pop(email.lower(), None)
+            result.skip(email.lower(), SKIP_ALREADY_REGISTERED)
+
+        if not rows:
+            return result
+
+        await self.session.execute(
+            update(Invitation)
+            .where(
+                Invitation.email == any_(_email_array(list(rows))),
+                Invitation.used_at.is_(None),
+                Invitation.expires_at > now,
+            )
+            .values(expires_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(insert(Invitation), list(rows.values()))
+
+        result.created = [Invitation(**row) for row in rows.values()]
+        return result
 
     async def validate_invitation(self, token: str) -> Invitation:
         """
@@ -254,29 +334,91 @@ class InvitationService:
         return secrets.token_urlsafe(64)
 
 
+SKIP_INVALID_EMAIL = "invalid_email"
+SKIP_INVALID_ROLE = "invalid_role"
+SKIP_ORGANIZATION_REQUIRED = "organization_required"
+SKIP_DUPLICATE = "duplicate"
+SKIP_ALREADY_REGISTERED = "already_registered"
+SKIP_UNKNOWN_ORGANIZATION = "unknown_organization"
+SKIP_UNKNOWN_DOMAIN = "unknown_domain"
+
+VALID_DOMAIN_IDS = {str(domain_id) for domain_id in HR_DOMAINS}
+
+
+@dataclass
+class BulkInvitationResult:
+    """Outcome of InvitationService.create_bulk_invitations()."""
+    created: List[Invitation] = field(default_factory=list)
+    skipped: List[Dict[str, str]] = field(default_factory=list)
+
+    def skip(self, email: str, reason: str) -> None:
+        self.skipped.append({"email": email, "reason": reason})
+
+
+def _is_uuid(value: Any) -> bool:
+    try:
+        UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+
+def _email_array(emails: List[str]):
+    return bindparam(None, emails, type_=ARRAY(String))
+
+
+def _invitation_email(invitation: Invitation, base_url: Optional[str]) -> Dict[str, Any]:
+    registration_url = f"{base_url or settings.FRONTEND_URL}/register?token={invitation.token}"
+    return {
+        "subject": "Invitation to Nudj | دعوة إلى نُضج",
+        "template_name": "invitation.html",
+        "context": {
+            "registration_url": registration_url,
+            "role": invitation.role.value,
+            "expires_at": invitation.expires_at.strftime("%Y-%m-%d"),
+        },
+    }
+
+
+async def send_invitation_emails(
+    session: AsyncSession,
+    invitations: List[Invitation],
+    base_url: Optional[str] = None,
+) -> int:
+    """
+    Queue invitation emails for many invitations with one INSERT.
+    
+    Like send_invitation_email(), delivery happens once the caller's
+    transaction commits. Returns the number of emails queued.
+    """
+    from src.backend.app.notifications.email_outbox import enqueue_emails
+
+    return await enqueue_emails(session, [
+        {"to_address": invitation.email, **_invitation_email(invitation, base_url)}
+        for invitation in invitations
+    ])
+
+
 async def send_invitation_email(
+    session: AsyncSession,
     invitation: Invitation,
-    base_url: str,
-) -> bool:
+    base_url: Optional[str] = None,
+) -> List["EmailOutbox"]:
     """
-    Send invitation email (placeholder implementation).
+    Queue the invitation email in the caller's transaction.
     
-    TODO: Integrate with SendGrid in production.
+    The email is delivered by the outbox worker once the transaction
+    commits.
     
     Args:
+        session: Session holding the invitation
         invitation: The invitation to send
         base_url: Application base URL for the registration link
+            (defaults to FRONTEND_URL)
         
     Returns:
-        True if email sent successfully
+        The queued outbox rows
     """
-    registration_url = f"{base_url}/register?token={invitation.token}"
-    
-    # Placeholder - log instead of sending
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(
-        f"[EMAIL PLACEHOLDER] Invitation sent to {invitation.email}: {registration_url}"
-    )
-    
-    return True
+    from src.backend.app.notifications.email_outbox import enqueue_email
+
+    return enqueue_email(session, recipients=[invitation.email], **_invitation_email(invitation, base_url))
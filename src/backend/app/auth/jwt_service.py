@@ -8,16 +8,26 @@ Features:
 - Refresh token generation (7 days expiry)
 - Token validation and decoding
 - Token revocation support via Redis
+- Short-lived stream tickets for EventSource connections
+- HS256 with a shared secret, or RS256/EdDSA with rotated keys and a kid
+  header so other services verify with the published JWKS
+- Lean per-request verification (verify_access_principal) returning a
+  slotted AccessPrincipal instead of a pydantic model
 """
-from datetime import datetime, timedelta
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 import hashlib
 import secrets
 
 import jwt
+from jwt import PyJWK
 from pydantic import BaseModel
 
 from src.backend.config import settings
+from src.backend.app.auth import signing_keys
+from src.backend.app.auth.permissions import PERMISSION_BITS, permissions_from_mask
+from src.backend.app.auth.signing_keys import ASYMMETRIC_ALGORITHMS, KeyRing
 
 
 class TokenPayload(BaseModel):
@@ -27,22 +37,53 @@ class TokenPayload(BaseModel):
     role: str
     org: Optional[str] = None  # Organization ID
     mfa: bool = False  # MFA verified
-    permissions: list[str] = []
+    permissions: list[str] = []  # Expanded from the token's permission mask
     exp: datetime
     iat: datetime
     jti: str  # JWT ID for revocation
 
 
+class AccessPrincipal:
+    """
+    Verified access token claims, for the per-request auth path.
+    
+    Built straight from the decoded payload: no validation (the signature
+    and expiry were just checked) and exp/iat stay epoch seconds.
+    """
+    __slots__ = ("sub", "email", "role", "org", "mfa", "permission_mask", "exp", "iat", "jti")
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.sub: str = payload["sub"]
+        self.email: str = payload["email"]
+        self.role: str = payload["role"]
+        self.org: Optional[str] = payload.get("org")
+        self.mfa: bool = payload.get("mfa", False)
+        self.permission_mask: int = payload.get("perm", 0)
+        self.exp: int = payload["exp"]
+        self.iat: int = payload["iat"]
+        self.jti: str = payload["jti"]
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.exp, timezone.utc)
+
+    def has_permission(self, permission: str) -> bool:
+        return bool(self.permission_mask & PERMISSION_BITS.get(permission, 0))
+
+
 class JWTService:
     """
     JWT token management service.
     
-    Uses HS256 for POC (migratable to RS256 for production).
+    HS256 signs with JWT_SECRET_KEY. RS256/EdDSA sign with the current key
+    from the key ring and verify with whichever key the token's kid names.
     """
 
-    def __init__(self):
+    def __init__(self, key_ring: Optional[KeyRing] = None):
         self.secret_key = settings.JWT_SECRET_KEY
         self.algorithm = settings.JWT_ALGORITHM
+        self.key_ring = key_ring if key_ring is not None else signing_keys.key_ring
+        self._hmac_key = self._prepare_hmac_key()
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
@@ -53,7 +94,7 @@ class JWTService:
         role: str,
         organization_id: Optional[str] = None,
         mfa_verified: bool = False,
-        permissions: list[str] = [],
+        permission_mask: int = 0,
         additional_claims: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
@@ -65,7 +106,7 @@ class JWTService:
             role: User's role (super_admin, analyst, etc.)
             organization_id: User's organization (null for Super Admin)
             mfa_verified: Whether MFA has been verified
-            permissions: List of permission strings
+            permission_mask: Role permission bits (see auth/permissions.py)
             additional_claims: Any extra claims to include
             
         Returns:
@@ -80,7 +121,7 @@ class JWTService:
             "role": role,
             "org": organization_id,
             "mfa": mfa_verified,
-            "permissions": permissions,
+            "perm": permission_mask,
             "exp": expire,
             "iat": now,
             "jti": self._generate_jti(),
@@ -90,7 +131,7 @@ class JWTService:
         if additional_claims:
             payload.update(additional_claims)
         
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return self._encode(payload)
 
     def create_refresh_token(
         self,
@@ -117,7 +158,7 @@ class JWTService:
             "type": "refresh",
         }
         
-        encoded = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        encoded = self._encode(payload)
         token_hash = self._hash_token(raw_token)
         
         return encoded, token_hash
@@ -144,7 +185,34 @@ class JWTService:
             "type": "mfa_pending",
         }
         
-        return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        return self._encode(payload)
+
+    def create_stream_ticket(
+        self,
+        user_id: str,
+        access_jti: str,
+    ) -> str:
+        """
+        Create a single-purpose ticket for opening an event stream.
+        
+        EventSource cannot send headers, so the ticket travels in the URL
+        where it may be logged; it is only accepted by stream endpoints,
+        lasts NOTIFICATION_STREAM_TICKET_SECONDS and dies with the access
+        token (sid) it was minted from.
+        """
+        now = datetime.utcnow()
+        expire = now + timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+        
+        payload = {
+            "sub": user_id,
+            "sid": access_jti,
+            "exp": expire,
+            "iat": now,
+            "jti": self._generate_jti(),
+            "type": "sse",
+        }
+        
+        return self._encode(payload)
 
     def decode_token(
         self,
@@ -156,7 +224,7 @@ class JWTService:
         
         Args:
             token: The JWT string
-            expected_type: Optional check for token type (access, refresh, mfa_pending)
+            expected_type: Optional check for token type (access, refresh, mfa_pending, sse)
             
         Returns:
             Decoded payload dict
@@ -165,12 +233,7 @@ class JWTService:
             jwt.ExpiredSignatureError: Token has expired
             jwt.InvalidTokenError: Token is invalid
         """
-        payload = jwt.decode(
-            token,
-            self.secret_key,
-            algorithms=[self.algorithm],
-            options={"verify_exp": True},
-        )
+        payload = self._decode(token, {"verify_exp": True})
         
         if expected_type and payload.get("type") != expected_type:
             raise jwt.InvalidTokenError(f"Expected {expected_type} token")
@@ -193,25 +256,64 @@ class JWTService:
             role=payload["role"],
             org=payload.get("org"),
             mfa=payload.get("mfa", False),
-            permissions=payload.get("permissions", []),
+            permissions=permissions_from_mask(payload.get("perm", 0)),
             exp=datetime.fromtimestamp(payload["exp"]),
             iat=datetime.fromtimestamp(payload["iat"]),
             jti=payload["jti"],
         )
 
+    def verify_access_principal(self, token: str) -> AccessPrincipal:
+        """
+        Verify an access token on the request path.
+        
+        Same checks as verify_access_token, without building a pydantic
+        model or converting timestamps.
+        
+        Raises:
+            jwt.ExpiredSignatureError: Token expired
+            jwt.InvalidTokenError: Token invalid
+        """
+        payload = self._decode(token, {"verify_exp": True})
+        if payload.get("type") != "access":
+            raise jwt.InvalidTokenError("Expected access token")
+        try:
+            return AccessPrincipal(payload)
+        except KeyError as e:
+            raise jwt.InvalidTokenError(f"Missing claim {e}")
+
     def get_token_jti(self, token: str) -> str:
         """Extract JTI from token without full validation."""
         try:
-            payload = jwt.decode(
-                token,
-                self.secret_key,
-                algorithms=[self.algorithm],
-                options={"verify_exp": False},
-            )
+            payload = self._decode(token, {"verify_exp": False})
             return payload.get("jti", "")
         except jwt.InvalidTokenError:
             return ""
 
+    def _encode(self, payload: Dict[str, Any]) -> str:
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+        key = self.key_ring.signing_key()
+        if key is None:
+            raise RuntimeError("No active JWT signing key loaded")
+        return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def _prepare_hmac_key(self) -> Optional[PyJWK]:
+        """The shared secret as a prepared key, so decode skips key parsing."""
+        if self.algorithm in ASYMMETRIC_ALGORITHMS:
+            return None
+        secret = urlsafe_b64encode(self.secret_key.encode()).rstrip(b"=").decode()
+        return PyJWK({"kty": "oct", "k": secret}, algorithm=self.algorithm)
+
+    def _decode(self, token: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return jwt.decode(token, self._hmac_key, algorithms=[self.algorithm], options=options)
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.key_ring.verification_key(kid) if kid else None
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown signing key")
+        # Pinned to the key's algorithm, whatever the header claims
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm], options=options)
+
     def _generate_jti(self) -> str:
         """Generate a unique JWT ID."""
         return secrets.token_urlsafe(16)
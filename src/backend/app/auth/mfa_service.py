@@ -6,33 +6,238 @@ TASK-013: Multi-factor authentication with TOTP.
 Features:
 - TOTP secret generation
 - QR code URI generation
-- Code verification
-- Backup codes
+- Code verification with replay protection (each time step is accepted
+  once per user)
+- Single-use backup codes, stored as HMAC digests
+- Per-user throttling of failed codes
+- Used steps and attempt counters are shared by all workers (Redis when
+  enabled, otherwise columns on users updated conditionally)
 """
+from abc import ABC, abstractmethod
 import secrets
 import hashlib
+import hmac
+import re
 from typing import List, Tuple, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import pyotp
+from sqlalchemy import String, case, literal, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.backend.config import settings
+from src.backend.database import get_async_session_factory
 from src.backend.app.auth.models import User
+from src.backend.app.common.cache import CacheBackend, get_cache
+from src.backend.app.common.redis_client import get_redis
 from src.backend.app.auth.exceptions import (
     MFAInvalidCodeException,
     MFANotEnabledException,
+    MFATooManyAttemptsException,
 )
 
+TOTP_CODE = re.compile(r"^\d{6}$")
+BACKUP_CODE = re.compile(r"^[0-9A-F]{8}$")
+
+
+class MFAStateStore(ABC):
+    """Used TOTP steps and attempt counters, shared by all workers."""
+
+    @abstractmethod
+    async def claim_step(self, user_id: str, step: int, earliest: int, ttl: int) -> bool:
+        """
+        Mark a time step used, along with the earlier steps back to earliest.
+
+        Returns False if the step (or a later one) was already used.
+        """
+
+    @abstractmethod
+    async def add_attempt(self, user_id: str, window_seconds: int) -> int:
+        """Count an attempt and return the count within the current window."""
+
+    @abstractmethod
+    async def reset_attempts(self, user_id: str) -> None:
+        ...
+
+
+class CacheMFAStateStore(MFAStateStore):
+    """
+    Cache keys: a used step is claimed with SET NX under
+    mfa:used:<user>:<step> and expires once it has left the window;
+    attempts are counted under mfa:attempts:<user>.
+    """
+
+    USED_PREFIX = "mfa:used:"
+    ATTEMPTS_PREFIX = "mfa:attempts:"
+
+    def __init__(self, cache: CacheBackend):
+        self.cache = cache
+
+    def _used_key(self, user_id: str, step: int) -> str:
+        return f"{self.USED_PREFIX}{user_id}:{step}"
+
+    def _attempts_key(self, user_id: str) -> str:
+        return f"{self.ATTEMPTS_PREFIX}{user_id}"
+
+    async def claim_step(self, user_id: str, step: int, earliest: int, ttl: int) -> bool:
+        if not await self.cache.set(self._used_key(user_id, step), "1", ttl=ttl, only_if_missing=True):
+            return False
+        for earlier in range(earliest, step):
+            await self.cache.set(self._used_key(user_id, earlier), "1", ttl=ttl, only_if_missing=True)
+        return True
+
+    async def add_attempt(self, user_id: str, window_seconds: int) -> int:
+        # The window starts at the first attempt
+        key = self._attempts_key(user_id)
+        attempts = await self.cache.incr_existing(key)
+        if attempts is None:
+            if await self.cache.set(key, "1", ttl=window_seconds, only_if_missing=True):
+                return 1
+            attempts = await self.cache.incr_existing(key) or 1
+        return attempts
+
+    async def reset_attempts(self, user_id: str) -> None:
+        await self.cache.delete(self._attempts_key(user_id))
+
+
+class DatabaseMFAStateStore(MFAStateStore):
+    """
+    Columns on users, changed with conditional UPDATEs so concurrent
+    requests on any worker see each other's writes. Each call commits in
+    its own session: a counted attempt survives the request failing.
+    """
+
+    async def claim_step(self, user_id: str, step: int, earliest: int, ttl: int) -> bool:
+        # Steps are claimed in order, so one column covers the earlier ones
+        factory = get_async_session_factory()
+        async with factory() as session:
+            result = await session.execute(
+                update(User)
+                .where(
+                    User.id == user_id,
+                    or_(User.mfa_last_used_step.is_(None), User.mfa_last_used_step < step),
+                )
+                .values(mfa_last_used_step=step)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            claimed = result.scalar_one_or_none() is not None
+            await session.commit()
+        return claimed
+
+    async def add_attempt(self, user_id: str, window_seconds: int) -> int:
+        now = datetime.now(timezone.utc)
+        expired = or_(
+            User.mfa_attempts_started_at.is_(None),
+            User.mfa_attempts_started_at <= now - timedelta(seconds=window_seconds),
+        )
+        factory = get_async_session_factory()
+        async with factory() as session:
+            # Both CASEs read the row as it was before the UPDATE
+            result = await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(
+                    mfa_attempts=case((expired, 1), else_=User.mfa_attempts + 1),
+                    mfa_attempts_started_at=case((expired, now), else_=User.mfa_attempts_started_at),
+                )
+                .returning(User.mfa_attempts)
+                .execution_options(synchronize_session=False)
+            )
+            attempts = result.scalar_one_or_none()
+            await session.commit()
+        return attempts or 1
+
+    async def reset_attempts(self, user_id: str) -> None:
+        factory = get_async_session_factory()
+        async with factory() as session:
+            await session.execute(
+                update(User)
+                .where(User.id == user_id, User.mfa_attempts > 0)
+                .values(mfa_attempts=0, mfa_attempts_started_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+
+class MFAVerifier:
+    """
+    TOTP replay protection and attempt throttling.
+
+    A used time step is claimed in the state store, so the same code (or
+    an older one from the accepted window) cannot be presented twice, even
+    to another worker. The store is Redis when enabled, otherwise the users
+    table; never per-process state.
+    """
+
+    def __init__(self, store: Optional[MFAStateStore] = None):
+        self._store = store
+        self.valid_window = settings.MFA_TOTP_VALID_WINDOW
+        self.max_attempts = settings.MFA_MAX_ATTEMPTS
+        self.attempt_window_seconds = settings.MFA_ATTEMPT_WINDOW_SECONDS
+
+    @property
+    def store(self) -> MFAStateStore:
+        if self._store is None:
+            self._store = CacheMFAStateStore(get_cache()) if get_redis() is not None else DatabaseMFAStateStore()
+        return self._store
+
+    async def verify_totp(
+        self,
+        user_id: str,
+        secret: str,
+        code: str,
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Check a TOTP code and claim its time step.
+
+        Returns False for a wrong code and for a step already used.
+        """
+        totp = pyotp.TOTP(secret)
+        current = totp.timecode(now or datetime.now())
+        steps = range(current - self.valid_window, current + self.valid_window + 1)
+        # Compare against every step so timing does not reveal which one matched
+        matches = [step for step in steps if hmac.compare_digest(totp.generate_otp(step), code)]
+        if not matches:
+            return False
+
+        # A step stays acceptable until it leaves the window on the far side
+        ttl = totp.interval * (2 * self.valid_window + 1)
+        # Codes from earlier steps must not be accepted after a later one
+        return await self.store.claim_step(user_id, matches[0], steps.start, ttl)
+
+    async def count_attempt(self, user_id: str) -> int:
+        """
+        Count an attempt before checking it.
+
+        Raises MFATooManyAttemptsException past MFA_MAX_ATTEMPTS within the
+        window. The increment comes first, so concurrent attempts cannot
+        all pass a check made before any of them is recorded.
+        """
+        attempts = await self.store.add_attempt(user_id, self.attempt_window_seconds)
+        if attempts > self.max_attempts:
+            raise MFATooManyAttemptsException()
+        return attempts
+
+    async def reset_attempts(self, user_id: str) -> None:
+        await self.store.reset_attempts(user_id)
+
+
+# Global verifier instance
+mfa_verifier = MFAVerifier()
+
 
 class MFAService:
     """
     TOTP-based multi-factor authentication service.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, verifier: Optional[MFAVerifier] = None):
         self.session = session
         self.issuer_name = settings.MFA_ISSUER_NAME
+        self.verifier = verifier or mfa_verifier
 
     async def generate_setup(self, user: User) -> dict:
         """
@@ -75,13 +280,14 @@ class MFAService:
             code: Verification code from authenticator app
             
         Returns:
-            List of backup codes
+            List of backup codes (only their digests are stored)
             
         Raises:
             MFAInvalidCodeException: Code verification failed
+            MFATooManyAttemptsException: Too many failed codes
         """
         # Verify the code
-        if not self._verify_totp(secret, code):
+        if not await self._verify_totp(user.id, secret, code):
             raise MFAInvalidCodeException()
         
         # Generate backup codes
@@ -90,6 +296,7 @@ class MFAService:
         # Store encrypted secret (in production, encrypt this)
         user.mfa_secret = secret  # TODO: Encrypt with Fernet
         user.mfa_enabled = True
+        user.mfa_backup_codes = dict.fromkeys(map(self.hash_backup_code, backup_codes), True)
         
         return backup_codes
 
@@ -103,20 +310,25 @@ class MFAService:
         
         Args:
             user: User to verify for
-            code: 6-digit TOTP code
+            code: 6-digit TOTP code or an unused backup code
             
         Returns:
             True if code is valid
             
         Raises:
             MFANotEnabledException: MFA not enabled
-            MFAInvalidCodeException: Invalid code
+            MFAInvalidCodeException: Invalid or already used code
+            MFATooManyAttemptsException: Too many failed codes
         """
         if not user.mfa_enabled or not user.mfa_secret:
             raise MFANotEnabledException()
         
-        # Verify TOTP code
-        if self._verify_totp(user.mfa_secret, code):
+        if await self._verify_totp(user.id, user.mfa_secret, code):
+            return True
+        
+        # Backup codes are throttled with TOTP failures
+        if await self._consume_backup_code(user, code):
+            await self.verifier.reset_attempts(user.id)
             return True
         
         raise MFAInvalidCodeException()
@@ -140,24 +352,59 @@ class MFAService:
             raise MFANotEnabledException()
         
         # Verify the code first
-        if not self._verify_totp(user.mfa_secret, code):
+        if not await self._verify_totp(user.id, user.mfa_secret, code):
             raise MFAInvalidCodeException()
         
         user.mfa_enabled = False
         user.mfa_secret = None
+        user.mfa_backup_codes = None
         
         return True
 
-    def _verify_totp(self, secret: str, code: str) -> bool:
+    async def _verify_totp(self, user_id: str, secret: str, code: str) -> bool:
         """
-        Verify a TOTP code.
+        Verify a TOTP code for a user.
         
-        Allows for 1 step tolerance (30 seconds each way).
+        Allows MFA_TOTP_VALID_WINDOW steps of tolerance (30 seconds each)
+        and accepts each step once. Every attempt is counted and a valid
+        code resets the count; raises MFATooManyAttemptsException once the
+        user is throttled.
         """
-        totp = pyotp.TOTP(secret)
-        return totp.verify(code, valid_window=1)
+        await self.verifier.count_attempt(user_id)
+        if TOTP_CODE.match(code) and await self.verifier.verify_totp(user_id, secret, code):
+            await self.verifier.reset_attempts(user_id)
+            return True
+        return False
 
-    def _generate_backup_codes(self, count: int = 10) -> List[str]:
+    async def _consume_backup_code(self, user: User, code: str) -> bool:
+        """
+        Use up a backup code.
+        
+        Membership is a dict lookup of the code's HMAC digest; removal is a
+        conditional UPDATE, so a code raced by two requests works only once.
+        """
+        normalized = code.replace("-", "").strip().upper()
+        if not BACKUP_CODE.match(normalized):
+            return False
+        codes = user.mfa_backup_codes or {}
+        digest = self.hash_backup_code(normalized)
+        if digest not in codes:
+            return False
+
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user.id, User.mfa_backup_codes.has_key(digest))
+            .values(mfa_backup_codes=User.mfa_backup_codes.op("-")(literal(digest, String)))
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            return False  # Used by a concurrent request
+        # Reflect the removal without scheduling another write
+        set_committed_value(user, "mfa_backup_codes", {k: v for k, v in codes.items() if k != digest})
+        return True
+
+    def _generate_backup_codes(self, count: int = settings.MFA_BACKUP_CODE_COUNT) -> List[str]:
         """
         Generate backup codes.
         
@@ -173,6 +420,11 @@ class MFAService:
 
     @staticmethod
     def hash_backup_code(code: str) -> str:
-        """Hash a backup code for storage."""
+        """
+        Hash a backup code for storage.
+        
+        Keyed with ENCRYPTION_KEY: backup codes are short, so a plain hash
+        of a leaked row could be brute-forced.
+        """
         normalized = code.replace("-", "").upper()
-        return hashlib.sha256(normalized.encode()).hexdigest()
+        return hmac.new(settings.ENCRYPTION_KEY.encode(), normalized.encode(), hashlib.sha256).hexdigest()
@@ -13,6 +13,9 @@ Models:
 - AnalystOrgAssignment: Analyst organization access
 - SSOConfiguration: Per-org SSO settings
 - DataDeletionRequest: PDPL compliance requests
+- JWTSigningKey: Rotated asymmetric JWT signing keys
+- UserImportJob: Background CSV/XLSX user imports
+- UserImportError: Rows rejected by a user import
 """
 from __future__ import annotations
 
@@ -22,6 +25,7 @@ from typing import Optional, List
 from uuid import uuid4
 
 from sqlalchemy import (
+    BigInteger,
     String,
     Boolean,
     DateTime,
@@ -30,12 +34,14 @@ from sqlalchemy import (
     Text,
     Integer,
     Index,
+    LargeBinary,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backend.database import Base
+from src.backend.app.common import text_search  # noqa: F401  (registers search DDL)
 
 
 # ============================================================================
@@ -56,6 +62,14 @@ class SSOProvider(str, enum.Enum):
     GOOGLE = "google"
 
 
+class ImportStatus(str, enum.Enum):
+    """User import job status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class DeletionStatus(str, enum.Enum):
     """Data deletion request status."""
     PENDING = "pending"
@@ -130,6 +144,12 @@ class User(TimestampMixin, Base):
     # MFA
     mfa_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     mfa_secret: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Encrypted TOTP secret
+    # Unused backup codes as {HMAC digest: true}: O(1) lookup and atomic removal
+    mfa_backup_codes: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    # Replay protection and throttling shared by all workers when Redis is off
+    mfa_last_used_step: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    mfa_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    mfa_attempts_started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # SSO
     sso_provider: Mapped[Optional[SSOProvider]] = mapped_column(Enum(SSOProvider), nullable=True)
@@ -163,6 +183,9 @@ class User(TimestampMixin, Base):
     __table_args__ = (
         Index("ix_users_org_role", "organization_id", "role"),
         Index("ix_users_sso", "sso_provider", "sso_external_id"),
+        # pg_trgm GIN indexes for admin search on email, name_en and
+        # nudj_normalize_arabic(name_ar) are created in migration 017, or
+        # after create_all by the DDL listeners in app/common/text_search.py
     )
 
     def __repr__(self) -> str:
@@ -201,7 +224,7 @@ class Invitation(TimestampMixin, Base):
     domain_ids: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
     # Lifecycle
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Audit
@@ -253,7 +276,7 @@ class RefreshToken(TimestampMixin, Base):
     token_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
 
     # Lifecycle
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Device info for security
@@ -295,7 +318,7 @@ class PasswordResetToken(TimestampMixin, Base):
     token_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
 
     # Lifecycle
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     def __repr__(self) -> str:
@@ -339,7 +362,7 @@ class UserSession(TimestampMixin, Base):
         default=datetime.utcnow,
         nullable=False,
     )
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
 
     # Relationship
     user: Mapped["User"] = relationship(back_populates="sessions")
@@ -558,3 +581,124 @@ class DataDeletionRequest(TimestampMixin, Base):
 
     def __repr__(self) -> str:
         return f"<DataDeletionRequest user={self.user_id} status={self.status.value}>"
+
+
+class JWTSigningKey(Base):
+    """
+    Asymmetric JWT signing key (RS256/EdDSA), identified by the token's kid.
+    
+    - The newest key whose activates_at has passed signs new tokens
+    - Keys are published (JWKS) before they activate and verify until every
+      token they signed has expired
+    - Private key stored as PKCS#8 PEM encrypted with ENCRYPTION_KEY
+    """
+    __tablename__ = "jwt_signing_keys"
+
+    kid: Mapped[str] = mapped_column(String(64), primary_key=True)
+    algorithm: Mapped[str] = mapped_column(String(16), nullable=False)
+    private_key_pem: Mapped[str] = mapped_column(Text, nullable=False)  # Encrypted
+    public_key_pem: Mapped[str] = mapped_column(Text, nullable=False)
+    activates_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<JWTSigningKey {self.kid} ({self.algorithm})>"
+
+
+class RevokedAccessToken(Base):
+    """
+    Revoked access-token id (jti), shared by all workers when Redis is off.
+    
+    - Kept until the token it revokes would have expired
+    - Expired rows are removed by the auth cleanup job
+    """
+    __tablename__ = "revoked_access_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RevokedAccessToken {self.jti}>"
+
+
+class UserImportJob(TimestampMixin, Base):
+    """
+    Background import of users from an uploaded CSV/XLSX file.
+    
+    - New emails become invitations, existing org users are updated
+    - Progress (processed_rows) is committed with each chunk, so an
+      interrupted job resumes after the last committed row
+    - The upload is kept in file_content, so any worker can run or resume
+      the job; it is cleared once the job finishes
+    - Rejected rows are written to user_import_errors
+    """
+    __tablename__ = "user_import_jobs"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    organization_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_by: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    # Uploaded file
+    file_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_content: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    file_type: Mapped[str] = mapped_column(String(10), nullable=False)  # csv, xlsx
+
+    # Progress
+    status: Mapped[str] = mapped_column(String(20), default=ImportStatus.PENDING.value, nullable=False)
+    total_rows: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    processed_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invited_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Whole-job failure
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<UserImportJob {self.file_name} ({self.status})>"
+
+
+class UserImportError(Base):
+    """
+    A row rejected by a user import.
+    
+    - Written with each chunk (one executemany), read back as the CSV
+      error report
+    """
+    __tablename__ = "user_import_errors"
+    __table_args__ = (
+        Index("ix_user_import_errors_job_row", "job_id", "row_number"),
+    )
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    job_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("user_import_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    row_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    email: Mapped[str] = mapped_column(Text, nullable=False)  # As uploaded
+    error: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserImportError row {self.row_number}: {self.error}>"
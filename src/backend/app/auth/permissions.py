@@ -5,11 +5,12 @@ TASK-013: Role-based access control and permission checks.
 
 Features:
 - Role hierarchy enforcement
-- Permission checking
+- Permission checking against precompiled bitsets: every permission is a
+  bit, every role an integer mask, and a check is a single AND
 - Tenant isolation guards
 - Domain access control for assessors
 """
-from typing import Optional, List, Set
+from typing import Dict, Iterable, Optional, List, Set
 from functools import lru_cache
 
 from src.backend.app.auth.models import Role
@@ -64,6 +65,39 @@ ROLE_PERMISSIONS = {
 }
 
 
+# Bit positions of every permission. Tokens carry masks built from these,
+# so only ever append: reordering would change what issued tokens grant.
+PERMISSIONS = (
+    "users:read", "users:write", "users:delete", "users:invite",
+    "orgs:read", "orgs:write", "orgs:delete",
+    "assessments:read", "assessments:write", "assessments:delete",
+    "reports:read", "reports:write", "reports:export",
+    "audit:read", "audit:export",
+    "settings:read", "settings:write",
+    "sso:configure",
+)
+
+PERMISSION_BITS: Dict[str, int] = {name: 1 << index for index, name in enumerate(PERMISSIONS)}
+
+
+def permission_mask(permissions: Iterable[str]) -> int:
+    """Mask with the bit of every given permission set (KeyError if unknown)."""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+def permissions_from_mask(mask: int) -> List[str]:
+    """Permission names in a mask, in registry order."""
+    return [name for name, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+ROLE_MASKS: Dict[Role, int] = {
+    role: permission_mask(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
 class PermissionService:
     """
     Permission checking and authorization service.
@@ -75,6 +109,11 @@ class PermissionService:
         """Get all permissions for a role."""
         return ROLE_PERMISSIONS.get(role, set())
 
+    @staticmethod
+    def get_role_mask(role: Role) -> int:
+        """Get the permission mask for a role."""
+        return ROLE_MASKS.get(role, 0)
+
     @staticmethod
     def has_permission(role: Role, permission: str) -> bool:
         """
@@ -87,20 +126,20 @@ class PermissionService:
         Returns:
             True if role has the permission
         """
-        permissions = PermissionService.get_role_permissions(role)
-        return permission in permissions
+        return bool(ROLE_MASKS.get(role, 0) & PERMISSION_BITS.get(permission, 0))
 
     @staticmethod
     def has_any_permission(role: Role, permissions: List[str]) -> bool:
         """Check if role has any of the given permissions."""
-        role_perms = PermissionService.get_role_permissions(role)
-        return bool(role_perms & set(permissions))
+        return bool(ROLE_MASKS.get(role, 0) & permission_mask(p for p in permissions if p in PERMISSION_BITS))
 
     @staticmethod
     def has_all_permissions(role: Role, permissions: List[str]) -> bool:
         """Check if role has all of the given permissions."""
-        role_perms = PermissionService.get_role_permissions(role)
-        return set(permissions).issubset(role_perms)
+        if any(p not in PERMISSION_BITS for p in permissions):
+            return False
+        required = permission_mask(permissions)
+        return ROLE_MASKS.get(role, 0) & required == required
 
     @staticmethod
     def is_higher_role(role1: Role, role2: Role) -> bool:
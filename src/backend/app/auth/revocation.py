@@ -0,0 +1,239 @@
+"""
+Access Token Revocation
+
+Denylist of revoked access-token ids (jti), checked by get_current_user.
+
+Features:
+- Revocation store keyed by jti and shared by all workers; an entry lives
+  only as long as the token it revokes would have (Redis sorted set scored
+  by the token's exp, or the revoked_access_tokens table without Redis)
+- In-process Bloom filter of every revoked jti, rebuilt from the store by a
+  per-worker scheduled sync; a jti the filter has never seen is accepted
+  without a network call, only filter hits are confirmed against the store
+- Before the first successful sync every lookup goes to the store
+
+A token revoked on another worker is rejected here once this worker has
+synced (TOKEN_REVOCATION_SYNC_SECONDS); the revoking worker adds it to its
+own filter immediately, including while a sync is rebuilding the filter.
+"""
+from abc import ABC, abstractmethod
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.auth.models import RevokedAccessToken
+from src.backend.app.common.redis_client import get_redis
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float) -> "BloomFilter":
+        items = list(items)
+        bloom = cls(max(capacity, len(items) * 2), error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> List[int]:
+        # Double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationStore(ABC):
+    """Revoked jtis with their token expiry (epoch seconds)."""
+
+    @abstractmethod
+    async def revoke(self, jti: str, exp: float) -> None:
+        ...
+
+    @abstractmethod
+    async def is_revoked(self, jti: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def active(self) -> List[str]:
+        """Every jti whose token has not expired yet."""
+
+
+class InMemoryRevocationStore(RevocationStore):
+    """Process-local store (tests)."""
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        self._prune()
+        self._entries[jti] = exp
+
+    async def is_revoked(self, jti: str) -> bool:
+        exp = self._entries.get(jti)
+        return exp is not None and exp > time.time()
+
+    async def active(self) -> List[str]:
+        self._prune()
+        return list(self._entries)
+
+    def _prune(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, exp in self._entries.items() if exp <= now]:
+            del self._entries[jti]
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Redis store shared by all workers.
+
+    One sorted set (jti scored by exp): the score is the entry's TTL, and
+    the sync reads all live entries with a single range query.
+    """
+
+    KEY = "nudj:auth:revoked_jti"
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(self.KEY, {jti: exp})
+            pipe.zremrangebyscore(self.KEY, "-inf", now)
+            # Drop the whole set once its newest entry has expired
+            pipe.expireat(self.KEY, int(math.ceil(exp)), gt=True)
+            await pipe.execute()
+
+    async def is_revoked(self, jti: str) -> bool:
+        exp = await self.redis.zscore(self.KEY, jti)
+        return exp is not None and exp > time.time()
+
+    async def active(self) -> List[str]:
+        return await self.redis.zrangebyscore(self.KEY, time.time(), "+inf")
+
+
+class DatabaseRevocationStore(RevocationStore):
+    """revoked_access_tokens table, shared by all workers when Redis is off."""
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        factory = get_async_session_factory()
+        async with factory() as session:
+            await session.execute(
+                pg_insert(RevokedAccessToken)
+                .values(jti=jti, expires_at=datetime.fromtimestamp(exp, timezone.utc))
+                .on_conflict_do_nothing()
+            )
+            await session.commit()
+
+    async def is_revoked(self, jti: str) -> bool:
+        factory = get_async_session_factory()
+        async with factory() as session:
+            result = await session.execute(
+                select(RevokedAccessToken.jti).where(
+                    RevokedAccessToken.jti == jti,
+                    RevokedAccessToken.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            return result.scalar_one_or_none() is not None
+
+    async def active(self) -> List[str]:
+        factory = get_async_session_factory()
+        async with factory() as session:
+            result = await session.execute(
+                select(RevokedAccessToken.jti).where(
+                    RevokedAccessToken.expires_at > datetime.now(timezone.utc)
+                )
+            )
+            return list(result.scalars().all())
+
+
+class RevocationList:
+    """
+    Revocation checks fronted by a Bloom filter.
+
+    Usage:
+        await revocation_list.revoke(payload["jti"], payload["exp"])
+        if await revocation_list.is_revoked(jti): ...
+    """
+
+    def __init__(
+        self,
+        store: Optional[RevocationStore] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+    ):
+        self._store = store
+        self.capacity = capacity or settings.TOKEN_REVOCATION_FILTER_CAPACITY
+        self.error_rate = error_rate or settings.TOKEN_REVOCATION_FILTER_ERROR_RATE
+        self._filter: Optional[BloomFilter] = None
+        # jtis revoked here while a sync is reading the store
+        self._revoked_during_sync: Optional[Set[str]] = None
+
+    @property
+    def store(self) -> RevocationStore:
+        if self._store is None:
+            redis = get_redis()
+            self._store = RedisRevocationStore(redis) if redis is not None else DatabaseRevocationStore()
+        return self._store
+
+    @property
+    def synced(self) -> bool:
+        return self._filter is not None
+
+    async def revoke(self, jti: str, exp: float) -> None:
+        """Revoke a token until its expiry (the JWT exp claim)."""
+        if not jti or exp <= time.time():
+            return
+        await self.store.revoke(jti, exp)
+        if self._revoked_during_sync is not None:
+            self._revoked_during_sync.add(jti)
+        if self._filter is not None:
+            self._filter.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if self._filter is not None and jti not in self._filter:
+            return False
+        return await self.store.is_revoked(jti)
+
+    async def sync(self) -> int:
+        """Rebuild the filter from the store. Returns the number of revoked jtis."""
+        self._revoked_during_sync = set()
+        try:
+            active = await self.store.active()
+            # The read may predate a local revoke(); keep those in the new filter
+            revoked = set(active) | self._revoked_during_sync
+            self._filter = BloomFilter.from_items(revoked, self.capacity, self.error_rate)
+        finally:
+            self._revoked_during_sync = None
+        return len(revoked)
+
+
+# Global revocation list
+revocation_list = RevocationList()
+
+
+async def sync_revocations() -> int:
+    """Scheduled job entry point (every worker keeps its own filter)."""
+    return await revocation_list.sync()
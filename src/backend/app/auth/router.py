@@ -12,9 +12,11 @@ Endpoints:
 - POST /auth/forgot-password - Request password reset
 - POST /auth/reset-password - Reset password with token
 - GET /auth/me - Get current user
+- GET /auth/.well-known/jwks.json - Public token verification keys
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, Request, Response, status, Query
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database import get_async_session
@@ -24,6 +26,7 @@ from src.backend.app.auth.session_service import SessionService
 from src.backend.app.auth.mfa_service import MFAService
 from src.backend.app.auth.invitation_service import InvitationService
 from src.backend.app.auth.dependencies import (
+    bearer_scheme,
     get_current_user,
     get_current_user_optional,
     get_client_info,
@@ -42,12 +45,14 @@ from src.backend.app.auth.schemas import (
     UserResponse,
     MFASetupResponse,
     MFAEnableRequest,
+    MFAEnableResponse,
     MFADisableRequest,
     SuccessResponse,
     SessionListResponse,
 )
 from src.backend.app.auth.models import User
 from src.backend.app.auth.permissions import PermissionService
+from src.backend.app.auth.signing_keys import key_ring
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -150,15 +155,17 @@ async def refresh_token(
 @router.post("/logout", response_model=SuccessResponse)
 async def logout(
     user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     session: AsyncSession = Depends(get_async_session),
 ):
     """
     Logout current user.
     
-    Revokes all tokens and ends session.
+    Revokes all tokens and ends session; the access token used for this
+    request is rejected from now on.
     """
     auth_service = AuthService(session)
-    await auth_service.logout(user.id)
+    await auth_service.logout(user.id, access_token=credentials.credentials)
     
     return SuccessResponse(
         message_en="Logged out successfully",
@@ -166,6 +173,17 @@ async def logout(
     )
 
 
+@router.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    """
+    Public keys for verifying tokens locally (JWK Set, RFC 7517).
+    
+    Empty when tokens are signed with a shared secret (HS256).
+    """
+    response.headers["Cache-Control"] = f"public, max-age={settings.JWT_KEY_REFRESH_SECONDS}"
+    return key_ring.jwks()
+
+
 @router.post("/forgot-password", response_model=SuccessResponse)
 async def forgot_password(
     request: ForgotPasswordRequest,
@@ -265,7 +283,7 @@ async def setup_mfa(
     return await mfa_service.generate_setup(user)
 
 
-@router.post("/mfa/enable", response_model=SuccessResponse)
+@router.post("/mfa/enable", response_model=MFAEnableResponse)
 async def enable_mfa(
     request: MFAEnableRequest,
     user: User = Depends(get_current_user),
@@ -273,13 +291,16 @@ async def enable_mfa(
 ):
     """
     Enable MFA after verifying setup code.
+    
+    Returns single-use backup codes; they cannot be shown again.
     """
     mfa_service = MFAService(session)
-    await mfa_service.enable_mfa(user, user.mfa_secret, request.code)
+    backup_codes = await mfa_service.enable_mfa(user, user.mfa_secret, request.code)
     
-    return SuccessResponse(
+    return MFAEnableResponse(
         message_en="MFA enabled successfully",
         message_ar="تم تفعيل المصادقة الثنائية بنجاح",
+        backup_codes=backup_codes,
     )
 
 
@@ -59,7 +59,8 @@ class LoginResponse(BaseModel):
 class MFAVerifyRequest(BaseModel):
     """MFA code verification request."""
     mfa_token: str
-    code: str = Field(..., min_length=6, max_length=6, pattern=r"^\d{6}$")
+    # 6-digit TOTP code or a XXXX-XXXX backup code
+    code: str = Field(..., min_length=6, max_length=9, pattern=r"^(\d{6}|[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4})$")
     trust_device: bool = False
 
 
@@ -131,6 +132,11 @@ class MFAEnableRequest(BaseModel):
     code: str = Field(..., min_length=6, max_length=6, pattern=r"^\d{6}$")
 
 
+class MFAEnableResponse(SuccessResponse):
+    """MFA enabled, with the backup codes to show once."""
+    backup_codes: List[str]
+
+
 class MFADisableRequest(BaseModel):
     """MFA disable verification."""
     code: str = Field(..., min_length=6, max_length=6, pattern=r"^\d{6}$")
@@ -159,7 +165,36 @@ class InviteUserRequest(BaseModel):
 
 class BulkInviteRequest(BaseModel):
     """Bulk invitation request."""
-    invitations: List[InviteUserRequest]
+    invitations: List[InviteUserRequest] = Field(..., max_length=10000)
+
+
+class BulkInviteSkipped(BaseModel):
+    """An invitation left out of a bulk invite."""
+    email: str
+    # invalid_email, invalid_role, organization_required, unknown_organization,
+    # unknown_domain, duplicate, already_registered
+    reason: str
+
+
+class BulkInviteResponse(SuccessResponse):
+    """Bulk invitation outcome."""
+    created: int
+    skipped: List[BulkInviteSkipped] = []
+
+
+class UserImportJobResponse(BaseModel):
+    """User import job progress."""
+    id: str
+    file_name: str
+    status: str  # pending, running, completed, failed
+    total_rows: Optional[int]
+    processed_rows: int
+    invited_count: int
+    updated_count: int
+    failed_count: int
+    error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
 
 
 class InvitationResponse(BaseModel):
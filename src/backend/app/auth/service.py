@@ -5,6 +5,7 @@ TASK-010: Core authentication service orchestrating login, registration, tokens.
 
 Features:
 - Login with lockout protection
+- MFA verification step completing a login
 - Registration via invitation
 - Token refresh with rotation
 - Logout with token revocation
@@ -19,7 +20,10 @@ from src.backend.config import settings
 from src.backend.app.auth.models import User, Role, RefreshToken
 from src.backend.app.auth.jwt_service import jwt_service
 from src.backend.app.auth.password_service import password_service
+from src.backend.app.auth.permissions import PermissionService
 from src.backend.app.auth.invitation_service import InvitationService
+from src.backend.app.auth.mfa_service import MFAService
+from src.backend.app.auth.revocation import revocation_list
 from src.backend.app.auth.exceptions import (
     InvalidCredentialsException,
     AccountLockedException,
@@ -118,6 +122,46 @@ class AuthService:
         # Generate tokens
         return await self._generate_auth_response(user, ip_address, user_agent)
 
+    async def verify_mfa(
+        self,
+        mfa_token: str,
+        code: str,
+        ip_address: str,
+        user_agent: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Complete a login with the MFA pending token and a code.
+        
+        Args:
+            mfa_token: MFA pending token from login()
+            code: TOTP code or backup code
+            ip_address: Client IP for audit
+            user_agent: Client user agent for audit
+            
+        Returns:
+            Dict with tokens and user info
+            
+        Raises:
+            TokenInvalidException: Pending token invalid or expired
+            AccountDeactivatedException: User is deactivated
+            MFAInvalidCodeException: Invalid or replayed code
+            MFATooManyAttemptsException: Too many failed codes
+        """
+        try:
+            payload = jwt_service.decode_token(mfa_token, expected_type="mfa_pending")
+        except Exception:
+            raise TokenInvalidException()
+        
+        user = await self.session.get(User, payload["sub"])
+        if not user:
+            raise TokenInvalidException()
+        if not user.is_active:
+            raise AccountDeactivatedException()
+        
+        await MFAService(self.session).verify_code(user, code)
+        
+        return await self._generate_auth_response(user, ip_address, user_agent)
+
     async def register(
         self,
         token: str,
@@ -250,6 +294,7 @@ class AuthService:
         user_id: str,
         refresh_token: Optional[str] = None,
         revoke_all: bool = False,
+        access_token: Optional[str] = None,
     ) -> None:
         """
         Logout user by revoking tokens.
@@ -258,9 +303,18 @@ class AuthService:
             user_id: User to logout
             refresh_token: Specific token to revoke
             revoke_all: Revoke all user's refresh tokens
+            access_token: Access token to deny for the rest of its lifetime
         """
         now = datetime.utcnow()
         
+        if access_token:
+            try:
+                payload = jwt_service.decode_token(access_token, expected_type="access")
+            except Exception:
+                payload = None  # Already unusable
+            if payload and payload.get("sub") == user_id:
+                await revocation_list.revoke(payload.get("jti", ""), payload["exp"])
+        
         if revoke_all:
             # Revoke all refresh tokens
             await self.session.execute(
@@ -301,9 +355,6 @@ class AuthService:
         user_agent: Optional[str],
     ) -> Dict[str, Any]:
         """Generate tokens and auth response."""
-        # Get permissions based on role
-        permissions = self._get_role_permissions(user.role)
-        
         # Create access token
         access_token = jwt_service.create_access_token(
             user_id=user.id,
@@ -311,7 +362,7 @@ class AuthService:
             role=user.role.value,
             organization_id=user.organization_id,
             mfa_verified=user.mfa_enabled,
-            permissions=permissions,
+            permission_mask=PermissionService.get_role_mask(user.role),
         )
         
         # Create and store refresh token
@@ -349,33 +400,5 @@ class AuthService:
             "role": user.role.value,
             "organization_id": user.organization_id,
             "mfa_enabled": user.mfa_enabled,
-            "permissions": self._get_role_permissions(user.role),
-        }
-
-    def _get_role_permissions(self, role: Role) -> list[str]:
-        """Get permissions for a role."""
-        # Hierarchical permissions
-        permissions_map = {
-            Role.SUPER_ADMIN: [
-                "users:read", "users:write", "users:delete",
-                "orgs:read", "orgs:write", "orgs:delete",
-                "assessments:read", "assessments:write",
-                "reports:read", "reports:write",
-                "audit:read", "settings:write",
-            ],
-            Role.ANALYST: [
-                "users:read",
-                "orgs:read",
-                "assessments:read", "assessments:write",
-                "reports:read", "reports:write",
-            ],
-            Role.CLIENT_ADMIN: [
-                "users:read", "users:write",
-                "assessments:read", "assessments:write",
-                "reports:read",
-            ],
-            Role.ASSESSOR: [
-                "assessments:read",
-            ],
+            "permissions": sorted(PermissionService.get_role_permissions(user.role)),
         }
-        return permissions_map.get(role, [])
@@ -7,18 +7,28 @@ Features:
 - Session creation and tracking
 - Activity-based timeout
 - Session listing and revocation
-- Redis for fast lookups
+- Activity recorded in a tracker (Redis, or in-process without it) and
+  written to user_sessions in coalesced periodic batches, so validating a
+  session never issues an UPDATE
 """
-from datetime import datetime, timedelta
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
 import hashlib
+import logging
 import secrets
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import bindparam, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.backend.config import settings
+from src.backend.database import get_async_session_factory
 from src.backend.app.auth.models import UserSession
+from src.backend.app.auth.cleanup import AuthCleanupService
+from src.backend.app.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
 
 
 class SessionService:
@@ -26,12 +36,13 @@ class SessionService:
     User session management service.
     
     Tracks active sessions with timeout based on inactivity.
-    Uses Redis for real-time activity tracking (placeholder for POC).
+    Recent activity lives in the session tracker until the next flush.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, tracker: Optional["SessionTracker"] = None):
         self.session = session
         self.timeout_minutes = settings.SESSION_TIMEOUT_MINUTES
+        self.tracker = tracker or get_session_tracker()
 
     async def create_session(
         self,
@@ -88,9 +99,13 @@ class SessionService:
         """
         Validate a session token.
         
+        Activity is recorded in the tracker (at most once per
+        SESSION_ACTIVITY_RESOLUTION_SECONDS) rather than written to the
+        row; flush_session_activity() persists it in batches.
+        
         Args:
             session_token: The raw session token
-            update_activity: Whether to update last_activity_at
+            update_activity: Whether to record activity
             
         Returns:
             UserSession if valid, None otherwise
@@ -107,23 +122,34 @@ class SessionService:
         if not user_session:
             return None
         
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
+        timeout = timedelta(minutes=self.timeout_minutes)
+        
+        # Activity not yet flushed to the row counts too
+        last_activity = _aware(user_session.last_activity_at)
+        tracked = await self.tracker.get_activity(user_session.id)
+        if tracked and tracked > last_activity:
+            last_activity = tracked
+        expires_at = max(_aware(user_session.expires_at), last_activity + timeout)
         
         # Check if expired
-        if user_session.expires_at < now:
+        if expires_at < now:
             return None
         
         # Check inactivity timeout
-        inactive_since = now - user_session.last_activity_at
-        if inactive_since > timedelta(minutes=self.timeout_minutes):
+        if now - last_activity > timeout:
             return None
         
-        # Update activity timestamp
         if update_activity:
-            user_session.last_activity_at = now
+            if now - last_activity >= timedelta(seconds=settings.SESSION_ACTIVITY_RESOLUTION_SECONDS):
+                await self.tracker.record_activity(user_session.id, now)
+                last_activity = now
             # Extend expiry on activity
-            user_session.expires_at = now + timedelta(minutes=self.timeout_minutes)
+            expires_at = last_activity + timeout
         
+        # Reflect tracked values without marking the row dirty
+        set_committed_value(user_session, "last_activity_at", last_activity)
+        set_committed_value(user_session, "expires_at", expires_at)
         return user_session
 
     async def get_user_sessions(
@@ -182,6 +208,8 @@ class SessionService:
                 UserSession.user_id == user_id,
             )
         )
+        if result.rowcount:
+            await self.tracker.discard(session_id)
         
         return result.rowcount > 0
 
@@ -211,56 +239,178 @@ class SessionService:
 
     async def cleanup_expired_sessions(self) -> int:
         """
-        Delete all expired sessions.
+        Delete all expired sessions, in chunks.
         
-        Should be run periodically via scheduled task.
+        Runs hourly as part of the scheduled "auth-cleanup" job (auth/cleanup.py).
         
         Returns:
             Number of sessions cleaned up
         """
-        result = await self.session.execute(
-            delete(UserSession).where(
-                UserSession.expires_at < datetime.utcnow()
-            )
-        )
-        
-        return result.rowcount
+        return await AuthCleanupService(self.session).purge_sessions(datetime.now(timezone.utc))
 
     def _hash_token(self, token: str) -> str:
         """Hash a session token for storage."""
         return hashlib.sha256(token.encode()).hexdigest()
 
 
-# Redis-based real-time session tracking (placeholder)
-class RedisSessionTracker:
+# =============================================================================
+# Activity tracking
+# =============================================================================
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class SessionTracker(ABC):
     """
-    Redis session tracker for real-time activity.
+    Pending session activity, keyed by session id.
     
-    NOTE: This is a placeholder for POC. In production, use Redis
-    for fast session lookups and activity tracking.
+    Only the latest activity per session is kept, so any number of requests
+    between two flushes cost one row update.
     """
-    
+
+    @abstractmethod
+    async def record_activity(self, session_id: str, at: datetime) -> None:
+        ...
+
+    @abstractmethod
+    async def get_activity(self, session_id: str) -> Optional[datetime]:
+        """Latest activity not yet flushed, if any."""
+
+    @abstractmethod
+    async def discard(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    async def take_pending(self) -> Dict[str, datetime]:
+        """Atomically remove and return all pending activity."""
+
+    @abstractmethod
+    async def restore(self, pending: Dict[str, datetime]) -> None:
+        """Put back activity whose flush failed (newer activity wins)."""
+
+
+class InMemorySessionTracker(SessionTracker):
+    """Process-local tracker (no Redis, and tests)."""
+
     def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}  # In-memory placeholder
+        self._pending: Dict[str, datetime] = {}
 
-    async def set_activity(self, session_id: str, user_id: str) -> None:
-        """Record session activity in Redis."""
-        self._cache[session_id] = {
-            "user_id": user_id,
-            "last_activity": datetime.utcnow().isoformat(),
-        }
+    async def record_activity(self, session_id: str, at: datetime) -> None:
+        self._pending[str(session_id)] = at
 
     async def get_activity(self, session_id: str) -> Optional[datetime]:
-        """Get last activity time from Redis."""
-        data = self._cache.get(session_id)
-        if data:
-            return datetime.fromisoformat(data["last_activity"])
-        return None
+        return self._pending.get(str(session_id))
+
+    async def discard(self, session_id: str) -> None:
+        self._pending.pop(str(session_id), None)
+
+    async def take_pending(self) -> Dict[str, datetime]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    async def restore(self, pending: Dict[str, datetime]) -> None:
+        for session_id, at in pending.items():
+            current = self._pending.get(session_id)
+            if current is None or current < at:
+                self._pending[session_id] = at
 
-    async def delete_session(self, session_id: str) -> None:
-        """Remove session from Redis."""
-        self._cache.pop(session_id, None)
+
+# Atomic read-and-clear so activity recorded during a flush is not lost
+_TAKE_PENDING_SCRIPT = """
+local pending = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return pending
+"""
+
+
+class RedisSessionTracker(SessionTracker):
+    """
+    Redis tracker shared by all workers.
+    
+    Pending activity is one hash (session id -> ISO timestamp); recording
+    is a single HSET.
+    """
+
+    KEY = "nudj:sessions:activity"
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._take_pending = redis.register_script(_TAKE_PENDING_SCRIPT)
+
+    async def record_activity(self, session_id: str, at: datetime) -> None:
+        await self.redis.hset(self.KEY, str(session_id), at.isoformat())
+
+    async def get_activity(self, session_id: str) -> Optional[datetime]:
+        value = await self.redis.hget(self.KEY, str(session_id))
+        return datetime.fromisoformat(value) if value else None
+
+    async def discard(self, session_id: str) -> None:
+        await self.redis.hdel(self.KEY, str(session_id))
+
+    async def take_pending(self) -> Dict[str, datetime]:
+        flat = await self._take_pending(keys=[self.KEY])
+        return {
+            flat[i]: datetime.fromisoformat(flat[i + 1])
+            for i in range(0, len(flat), 2)
+        }
+
+    async def restore(self, pending: Dict[str, datetime]) -> None:
+        # HSETNX: anything recorded since the take is newer
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id, at in pending.items():
+                pipe.hsetnx(self.KEY, session_id, at.isoformat())
+            await pipe.execute()
+
+
+_tracker: Optional[SessionTracker] = None
+
+
+def get_session_tracker() -> SessionTracker:
+    """Get the shared tracker (Redis when enabled, otherwise in-process)."""
+    global _tracker
+    if _tracker is None:
+        redis = get_redis()
+        _tracker = RedisSessionTracker(redis) if redis is not None else InMemorySessionTracker()
+    return _tracker
+
+
+async def write_session_activity(session: AsyncSession, pending: Dict[str, datetime]) -> int:
+    """
+    Write pending activity to user_sessions in one executemany UPDATE.
+    
+    Rows are only moved forward; expiry is extended from the activity time.
+    """
+    if not pending:
+        return 0
+    timeout = timedelta(minutes=settings.SESSION_TIMEOUT_MINUTES)
+    table = UserSession.__table__
+    stmt = (
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.last_activity_at < bindparam("b_activity"),
+        )
+        .values(last_activity_at=bindparam("b_activity"), expires_at=bindparam("b_expires"))
+    )
+    await session.execute(stmt, [
+        {"b_id": session_id, "b_activity": at, "b_expires": at + timeout}
+        for session_id, at in pending.items()
+    ])
+    await session.commit()
+    return len(pending)
 
 
-# Global tracker instance
-redis_tracker = RedisSessionTracker()
+async def flush_session_activity(tracker: Optional[SessionTracker] = None) -> int:
+    """Periodic job entry point. Returns the number of sessions written."""
+    tracker = tracker or get_session_tracker()
+    pending = await tracker.take_pending()
+    if not pending:
+        return 0
+    factory = get_async_session_factory()
+    try:
+        async with factory() as session:
+            return await write_session_activity(session, pending)
+    except Exception:
+        await tracker.restore(pending)
+        raise
@@ -0,0 +1,213 @@
+"""
+JWT Signing Keys
+
+Rotated asymmetric keys for RS256/EdDSA tokens (see JWT_ALGORITHM).
+
+Features:
+- Keys live in jwt_signing_keys so every worker signs and verifies with the
+  same set; tokens carry the signing key's id in the kid header
+- Rotation every JWT_KEY_ROTATION_DAYS (leader scheduler job); a new key is
+  published JWT_KEY_PUBLISH_AHEAD_MINUTES before it starts signing, so
+  workers and JWKS consumers already know it when the first token arrives
+- A superseded key keeps verifying until every token it signed has expired,
+  then it is deleted
+- KeyRing caches parsed key objects and the JWKS document; reloading only
+  parses keys it has not seen before
+"""
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt.algorithms import get_default_algorithms
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.auth.models import JWTSigningKey
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+# Serializes rotation across workers (see also SCHEDULER_LOCK_KEY)
+ROTATION_LOCK_KEY = 724_302
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _passphrase() -> bytes:
+    return settings.ENCRYPTION_KEY.encode()
+
+
+def max_token_lifetime() -> timedelta:
+    """Longest lifetime of any token signed with these keys."""
+    return max(
+        timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+
+
+def generate_key(algorithm: str, activates_at: datetime) -> JWTSigningKey:
+    """Create a new key pair (not yet added to a session)."""
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported JWT signing algorithm: {algorithm}")
+    return JWTSigningKey(
+        kid=secrets.token_urlsafe(12),
+        algorithm=algorithm,
+        private_key_pem=private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.BestAvailableEncryption(_passphrase()),
+        ).decode(),
+        public_key_pem=private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode(),
+        activates_at=activates_at,
+    )
+
+
+@dataclass
+class SigningKey:
+    """A parsed key, ready for PyJWT."""
+    kid: str
+    algorithm: str
+    private_key: Any
+    public_key: Any
+    activates_at: datetime
+
+    @classmethod
+    def from_row(cls, row: JWTSigningKey) -> "SigningKey":
+        private_key = serialization.load_pem_private_key(
+            row.private_key_pem.encode(), password=_passphrase()
+        )
+        return cls(row.kid, row.algorithm, private_key, private_key.public_key(), _aware(row.activates_at))
+
+    def to_jwk(self) -> Dict[str, Any]:
+        jwk = get_default_algorithms()[self.algorithm].to_jwk(self.public_key, as_dict=True)
+        return {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+class KeyRing:
+    """
+    In-process cache of the signing key set.
+
+    Usage:
+        key = key_ring.signing_key()          # sign with key.private_key
+        key = key_ring.verification_key(kid)  # verify with key.public_key
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, SigningKey] = {}
+        self._ordered: List[SigningKey] = []
+        self._jwks: Dict[str, Any] = {"keys": []}
+
+    def load(self, rows: Iterable[JWTSigningKey]) -> None:
+        keys = [self._keys.get(row.kid) or SigningKey.from_row(row) for row in rows]
+        self._ordered = sorted(keys, key=lambda key: key.activates_at)
+        self._keys = {key.kid: key for key in self._ordered}
+        self._jwks = {"keys": [key.to_jwk() for key in self._ordered]}
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Reload the key set from the database. Returns the number of keys."""
+        rows = (await session.execute(select(JWTSigningKey))).scalars().all()
+        self.load(rows)
+        return len(rows)
+
+    def signing_key(self, now: Optional[datetime] = None) -> Optional[SigningKey]:
+        """The newest key that has activated."""
+        now = now or datetime.now(timezone.utc)
+        for key in reversed(self._ordered):
+            if key.activates_at <= now:
+                return key
+        return None
+
+    def verification_key(self, kid: str) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+
+    def jwks(self) -> Dict[str, Any]:
+        """Public keys as a JWK Set, including keys not yet signing."""
+        return self._jwks
+
+
+class KeyRotationService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def rotate(self, now: Optional[datetime] = None) -> Optional[JWTSigningKey]:
+        """
+        Create the next key when due and delete keys no token can need.
+
+        Returns the created key, if any.
+        """
+        now = now or datetime.now(timezone.utc)
+        # Workers bootstrapping at the same time must not each create a key
+        await self.session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROTATION_LOCK_KEY}
+        )
+        rows = list(
+            (await self.session.execute(select(JWTSigningKey).order_by(JWTSigningKey.activates_at))).scalars()
+        )
+        rotation = timedelta(days=settings.JWT_KEY_ROTATION_DAYS)
+        ahead = timedelta(minutes=settings.JWT_KEY_PUBLISH_AHEAD_MINUTES)
+
+        created = None
+        newest = rows[-1] if rows else None
+        if newest is None:
+            # Nothing is signing yet, so there is nothing to wait for
+            created = generate_key(settings.JWT_ALGORITHM, now)
+        elif newest.algorithm != settings.JWT_ALGORITHM:
+            created = generate_key(settings.JWT_ALGORITHM, now + ahead)
+        elif _aware(newest.activates_at) + rotation - ahead <= now:
+            created = generate_key(
+                settings.JWT_ALGORITHM, max(_aware(newest.activates_at) + rotation, now + ahead)
+            )
+        if created is not None:
+            self.session.add(created)
+            rows.append(created)
+
+        # A key is retired once its successor activates; its tokens outlive that
+        lifetime = max_token_lifetime()
+        expired = [
+            key.kid for key, successor in zip(rows, rows[1:])
+            if _aware(successor.activates_at) + lifetime <= now
+        ]
+        if expired:
+            await self.session.execute(delete(JWTSigningKey).where(JWTSigningKey.kid.in_(expired)))
+        await self.session.commit()
+        return created
+
+
+# Global key ring
+key_ring = KeyRing()
+
+
+async def run_key_rotation() -> int:
+    """Scheduled job entry point. Returns 1 if a key was created."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        created = await KeyRotationService(session).rotate()
+        await key_ring.refresh(session)
+    return 1 if created is not None else 0
+
+
+async def refresh_signing_keys() -> int:
+    """Per-worker job picking up keys created by the rotating worker."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        return await key_ring.refresh(session)
+
+
+async def init_signing_keys() -> None:
+    """Startup: load the key set, creating the first key if there is none."""
+    await refresh_signing_keys()
+    if key_ring.signing_key() is None:
+        await run_key_rotation()
@@ -1,5 +1,6 @@
 from uuid import UUID, uuid4
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import Computed, ForeignKey, Index, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.backend.database import Base
@@ -10,10 +11,21 @@ class Comment(Base, TimestampMixin):
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
     user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
-    response_id: Mapped[UUID] = mapped_column(ForeignKey("assessment_element_responses.id"), nullable=False, index=True)
+    response_id: Mapped[UUID] = mapped_column(ForeignKey("assessment_element_responses.id", ondelete="CASCADE"), nullable=False, index=True)
     
     parent_id: Mapped[UUID] = mapped_column(ForeignKey("comments.id"), nullable=True, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Full-text index (see app/search); maintained by Postgres on write
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(content, '')) || "
+            "to_tsvector('arabic', coalesce(content, ''))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     # Relationships
     author: Mapped["User"] = relationship("User", foreign_keys=[user_id])
@@ -30,3 +42,14 @@ class Comment(Base, TimestampMixin):
         uselist=False
     )
     response: Mapped["AssessmentElementResponse"] = relationship("AssessmentElementResponse", back_populates="comments")
+
+    __table_args__ = (
+        # Paging of top-level threads per response
+        Index(
+            "ix_comments_response_roots",
+            "response_id",
+            "created_at",
+            postgresql_where=(parent_id == None),
+        ),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
@@ -23,7 +23,9 @@ async def add_comment(
 @router.get("/response/{response_id}", response_model=List[CommentResponse])
 async def get_comments(
     response_id: UUID,
+    limit: int = Query(50, ge=1, le=200, description="Top-level threads per page"),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db)
 ):
     service = CommentService(db)
-    return await service.get_response_comments(response_id)
+    return await service.get_response_comments(response_id, limit=limit, offset=offset)
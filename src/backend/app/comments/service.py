@@ -1,17 +1,18 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import UUID
-from typing import List
+from typing import Dict, List, Optional
 
+from src.backend.app.auth.models import User
+from src.backend.app.assessments.activity import element_activity_update
 from src.backend.app.comments.models import Comment
-from src.backend.app.comments.schemas import CommentCreate
+from src.backend.app.comments.schemas import CommentAuthor, CommentCreate, CommentResponse
 
 class CommentService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def add_comment(self, user_id: UUID, data: CommentCreate) -> Comment:
+    async def add_comment(self, user_id: UUID, data: CommentCreate) -> CommentResponse:
         comment = Comment(
             user_id=user_id,
             response_id=data.response_id,
@@ -19,26 +20,84 @@ class CommentService:
             content=data.content
         )
         self.session.add(comment)
+        await self.session.execute(element_activity_update(data.response_id, comments=1))
         await self.session.commit()
-        
-        # Reload with relationships
-        stmt = select(Comment).where(Comment.id == comment.id).options(
-            selectinload(Comment.author)
-        )
+
+        # Reload with the author
+        stmt = self._comment_columns().where(Comment.id == comment.id)
         result = await self.session.execute(stmt)
-        return result.scalar_one()
-
-    async def get_response_comments(self, response_id: UUID) -> List[Comment]:
-        # Fetch top-level comments with their nested replies
-        # selectinload handles the recursion for the replies relationship
-        stmt = select(Comment).where(
-            Comment.response_id == response_id,
-            Comment.parent_id == None
-        ).options(
-            selectinload(Comment.author),
-            selectinload(Comment.replies).selectinload(Comment.author),
-            selectinload(Comment.replies).selectinload(Comment.replies) # Support up to 3 levels of nesting easily
-        ).order_by(Comment.created_at.asc())
-        
+        return self._to_response(result.one())
+
+    async def get_response_comments(
+        self,
+        response_id: UUID,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[CommentResponse]:
+        """
+        Load a page of top-level threads with all of their replies.
+
+        One recursive CTE walks every thread in the page to any depth and is
+        joined to the authors, then the tree is assembled in a single pass.
+        """
+        roots = (
+            select(Comment.id)
+            .where(Comment.response_id == response_id, Comment.parent_id == None)
+            .order_by(Comment.created_at.asc(), Comment.id)
+            .offset(offset)
+        )
+        if limit is not None:
+            roots = roots.limit(limit)
+
+        thread = (
+            select(Comment.id)
+            .where(Comment.id.in_(roots.scalar_subquery()))
+            .cte("thread", recursive=True)
+        )
+        thread = thread.union_all(
+            select(Comment.id).join(thread, Comment.parent_id == thread.c.id)
+        )
+
+        stmt = (
+            self._comment_columns()
+            .join(thread, thread.c.id == Comment.id)
+            .order_by(Comment.created_at.asc(), Comment.id)
+        )
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+
+        nodes: Dict[UUID, CommentResponse] = {}
+        for row in result.all():
+            nodes[row.id] = self._to_response(row)
+
+        # Rows are in created_at order, so replies are appended in order
+        threads: List[CommentResponse] = []
+        for node in nodes.values():
+            parent = nodes.get(node.parent_id) if node.parent_id else None
+            if parent is not None:
+                parent.replies.append(node)
+            else:
+                threads.append(node)
+        return threads
+
+    def _comment_columns(self):
+        return select(
+            Comment.id,
+            Comment.user_id,
+            Comment.response_id,
+            Comment.parent_id,
+            Comment.content,
+            Comment.created_at,
+            User.name_en.label("author_name"),
+        ).join(User, User.id == Comment.user_id)
+
+    def _to_response(self, row) -> CommentResponse:
+        return CommentResponse(
+            id=row.id,
+            user_id=row.user_id,
+            response_id=row.response_id,
+            parent_id=row.parent_id,
+            content=row.content,
+            created_at=row.created_at,
+            author=CommentAuthor(id=row.user_id, full_name=row.author_name),
+            replies=[],
+        )
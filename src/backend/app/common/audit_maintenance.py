@@ -0,0 +1,122 @@
+"""
+Audit Log Maintenance
+
+Periodic upkeep for the partitioned audit log (migration 018):
+- creates monthly partitions AUDIT_PARTITIONS_AHEAD_MONTHS ahead
+- detaches partitions entirely older than AUDIT_RETENTION_DAYS (dropped
+  only if AUDIT_DROP_EXPIRED_PARTITIONS is set)
+- rebuilds the hourly rollup (audit_log_hourly_stats) for recently
+  completed hours; the current hour is never rolled up, readers add it
+  from the raw table
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.common import partitions
+from src.backend.app.common.models import AuditLog, AuditLogHourlyStat
+
+logger = logging.getLogger(__name__)
+
+TABLE = AuditLog.__tablename__
+
+
+def hour_start(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class AuditMaintenanceService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now(timezone.utc)
+        await self.maintain_partitions(now)
+        await self.refresh_rollup(now)
+
+    async def maintain_partitions(self, now: datetime) -> List[str]:
+        """Create upcoming partitions and detach expired ones. Returns detached names."""
+        if not await partitions.is_partitioned(self.session, TABLE):
+            return []
+        created = await partitions.ensure_monthly_partitions(
+            self.session, TABLE, now, settings.AUDIT_PARTITIONS_AHEAD_MONTHS
+        )
+        await self.session.commit()
+        if created:
+            logger.info(f"Created audit log partitions {', '.join(created)}")
+
+        if not settings.AUDIT_RETENTION_DAYS:
+            return []
+        cutoff = now - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+        detached = []
+        for name in await partitions.partitions_before(self.session, TABLE, cutoff):
+            await partitions.detach_partition(
+                self.session, TABLE, name, drop=settings.AUDIT_DROP_EXPIRED_PARTITIONS
+            )
+            await self.session.commit()
+            detached.append(name)
+            logger.info(
+                f"{'Dropped' if settings.AUDIT_DROP_EXPIRED_PARTITIONS else 'Detached'} "
+                f"audit log partition {name}"
+            )
+        return detached
+
+    async def refresh_rollup(self, now: datetime) -> int:
+        """
+        Rebuild rollup rows for completed hours not yet (or only recently) rolled up.
+
+        The last AUDIT_ROLLUP_LOOKBACK_HOURS are always rebuilt so entries
+        that arrive late (batched writer, replayed spill files) are counted.
+        Returns the number of rollup rows written.
+        """
+        end = hour_start(now)
+        start = end - timedelta(hours=settings.AUDIT_ROLLUP_LOOKBACK_HOURS)
+        latest = await self.session.scalar(select(func.max(AuditLogHourlyStat.hour)))
+        if latest is not None:
+            # Catch up on any hours missed while the job was not running
+            start = min(start, latest + timedelta(hours=1))
+        else:
+            oldest = await self.session.scalar(select(func.min(AuditLog.created_at)))
+            if oldest is None:
+                return 0
+            start = min(start, hour_start(oldest))
+        if start >= end:
+            return 0
+
+        await self.session.execute(
+            delete(AuditLogHourlyStat).where(
+                AuditLogHourlyStat.hour >= start,
+                AuditLogHourlyStat.hour < end,
+            )
+        )
+        bucket = func.date_trunc("hour", AuditLog.created_at)
+        rollup = (
+            select(bucket, AuditLog.organization_id, AuditLog.event_type, func.count())
+            .where(AuditLog.created_at >= start, AuditLog.created_at < end)
+            .group_by(bucket, AuditLog.organization_id, AuditLog.event_type)
+        )
+        result = await self.session.execute(
+            insert(AuditLogHourlyStat).from_select(
+                ["hour", "organization_id", "event_type", "count"], rollup
+            )
+        )
+        if settings.AUDIT_RETENTION_DAYS:
+            await self.session.execute(
+                delete(AuditLogHourlyStat).where(
+                    AuditLogHourlyStat.hour < now - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+                )
+            )
+        await self.session.commit()
+        return result.rowcount or 0
+
+
+async def run_audit_maintenance() -> None:
+    """Periodic job entry point."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        await AuditMaintenanceService(session).run()
@@ -4,20 +4,49 @@ Audit Service
 TASK-012: Append-only audit logging for security events.
 
 Features:
-- Log all auth events
+- Log all auth events (written in batches by audit_writer, outside the
+  caller's transaction)
 - Query and filter logs
-- CSV export for compliance
+- Streaming CSV export for compliance (server-side cursor, optional gzip,
+  no row cap)
 - 5-year retention support
 """
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional, List, Dict, Any
 from io import StringIO
 import csv
+import zlib
 
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.app.common.models import AuditLog, AuditEventType
+from src.backend.app.common.models import AuditLog, AuditEventType, AuditLogHourlyStat
+from src.backend.app.common.audit_maintenance import hour_start
+from src.backend.app.common.audit_writer import AuditWriter, audit_writer, build_entry
+
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_FETCH_SIZE = 2000
+
+EXPORT_HEADER = [
+    "Timestamp",
+    "Event Type",
+    "User ID",
+    "Email",
+    "IP Address",
+    "User Agent",
+    "Organization ID",
+    "Details",
+]
+
+
+async def gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip-compress a stream of text chunks incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
 
 
 class AuditService:
@@ -27,8 +56,9 @@ class AuditService:
     Provides append-only logging for security and compliance.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, writer: Optional[AuditWriter] = None):
         self.session = session
+        self.writer = writer or audit_writer
 
     async def log(
         self,
@@ -43,6 +73,10 @@ class AuditService:
         """
         Log an audit event.
         
+        The entry is queued for the background writer rather than added to
+        this session, so it is persisted even if the caller's transaction
+        rolls back, and the request does not wait for the INSERT.
+        
         Args:
             event_type: Type of event
             ip_address: Client IP
@@ -53,9 +87,9 @@ class AuditService:
             details: Additional event-specific details
             
         Returns:
-            Created AuditLog entry
+            AuditLog entry (not attached to the session)
         """
-        audit_log = AuditLog(
+        entry = build_entry(
             event_type=event_type,
             user_id=user_id,
             email=email,
@@ -64,11 +98,9 @@ class AuditService:
             organization_id=organization_id,
             details=details,
         )
+        await self.writer.submit(entry)
         
-        self.session.add(audit_log)
-        await self.session.flush()
-        
-        return audit_log
+        return AuditLog(**entry)
 
     async def log_login_success(
         self,
@@ -153,20 +185,14 @@ class AuditService:
         Returns:
             Tuple of (logs, total_count)
         """
-        conditions = []
-        
-        if event_type:
-            conditions.append(AuditLog.event_type == event_type)
-        if user_id:
-            conditions.append(AuditLog.user_id == user_id)
-        if organization_id:
-            conditions.append(AuditLog.organization_id == organization_id)
-        if start_date:
-            conditions.append(AuditLog.created_at >= start_date)
-        if end_date:
-            conditions.append(AuditLog.created_at <= end_date)
-        if ip_address:
-            conditions.append(AuditLog.ip_address == ip_address)
+        conditions = self._filter_conditions(
+            event_type=event_type,
+            user_id=user_id,
+            organization_id=organization_id,
+            start_date=start_date,
+            end_date=end_date,
+            ip_address=ip_address,
+        )
         
         # Build query
         query = select(AuditLog)
@@ -187,60 +213,122 @@ class AuditService:
         
         return list(logs), total
 
-    async def export_csv(
+    @staticmethod
+    def _filter_conditions(
+        event_type: Optional[AuditEventType] = None,
+        user_id: Optional[str] = None,
+        organization_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        ip_address: Optional[str] = None,
+    ) -> list:
+        conditions = []
+        
+        if event_type:
+            conditions.append(AuditLog.event_type == event_type)
+        if user_id:
+            conditions.append(AuditLog.user_id == user_id)
+        if organization_id:
+            conditions.append(AuditLog.organization_id == organization_id)
+        if start_date:
+            conditions.append(AuditLog.created_at >= start_date)
+        if end_date:
+            conditions.append(AuditLog.created_at <= end_date)
+        if ip_address:
+            conditions.append(AuditLog.ip_address == ip_address)
+        
+        return conditions
+
+    async def iter_csv(
         self,
         organization_id: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> str:
+        event_type: Optional[AuditEventType] = None,
+        fetch_size: int = EXPORT_FETCH_SIZE,
+    ) -> AsyncIterator[str]:
         """
-        Export audit logs as CSV.
+        Stream audit logs as CSV text, newest first.
+        
+        Rows come from a server-side cursor `fetch_size` at a time and each
+        batch is yielded as one chunk, so memory stays flat however many
+        rows match. There is no row cap and no count query.
         
         Args:
             organization_id: Filter by organization
             start_date: Start of date range
             end_date: End of date range
+            event_type: Filter by event type
+            fetch_size: Rows per cursor fetch / yielded chunk
             
-        Returns:
-            CSV string
+        Yields:
+            CSV text chunks (the first one is the header)
         """
-        logs, _ = await self.query_logs(
+        conditions = self._filter_conditions(
+            event_type=event_type,
             organization_id=organization_id,
             start_date=start_date,
             end_date=end_date,
-            page=1,
-            page_size=10000,  # Max export size
         )
+        # Plain columns (no ORM entities) keep the per-row footprint small
+        query = select(
+            AuditLog.created_at,
+            AuditLog.event_type,
+            AuditLog.user_id,
+            AuditLog.email,
+            AuditLog.ip_address,
+            AuditLog.user_agent,
+            AuditLog.organization_id,
+            AuditLog.details,
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = query.order_by(AuditLog.created_at.desc())
         
         output = StringIO()
         writer = csv.writer(output)
+        writer.writerow(EXPORT_HEADER)
+        yield output.getvalue()
         
-        # Header
-        writer.writerow([
-            "Timestamp",
-            "Event Type",
-            "User ID",
-            "Email",
-            "IP Address",
-            "User Agent",
-            "Organization ID",
-            "Details",
-        ])
-        
-        # Data rows
-        for log in logs:
-            writer.writerow([
-                log.created_at.isoformat(),
-                log.event_type.value,
-                log.user_id or "",
-                log.email or "",
-                log.ip_address,
-                log.user_agent or "",
-                log.organization_id or "",
-                str(log.details) if log.details else "",
-            ])
+        result = await self.session.stream(query.execution_options(yield_per=fetch_size))
+        async for rows in result.partitions():
+            output.seek(0)
+            output.truncate()
+            writer.writerows(
+                [
+                    row.created_at.isoformat(),
+                    row.event_type.value,
+                    row.user_id or "",
+                    row.email or "",
+                    row.ip_address,
+                    row.user_agent or "",
+                    row.organization_id or "",
+                    str(row.details) if row.details else "",
+                ]
+                for row in rows
+            )
+            yield output.getvalue()
+
+    async def export_csv(
+        self,
+        organization_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> str:
+        """
+        Export audit logs as a single CSV string.
         
-        return output.getvalue()
+        Builds the whole export in memory; prefer iter_csv for anything
+        that may be large.
+        """
+        return "".join([
+            chunk
+            async for chunk in self.iter_csv(
+                organization_id=organization_id,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        ])
 
     async def get_security_stats(
         self,
@@ -250,6 +338,10 @@ class AuditService:
         """
         Get security statistics for dashboard.
         
+        Completed hours come from the hourly rollup (audit_maintenance);
+        only entries newer than the last rolled-up hour are counted from
+        the raw log. The window starts at the top of the hour.
+        
         Args:
             organization_id: Filter by organization
             hours: Time window in hours
@@ -257,13 +349,29 @@ class AuditService:
         Returns:
             Dict with event counts
         """
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = hour_start(datetime.now(timezone.utc) - timedelta(hours=hours))
+        counts: Dict[str, int] = {}
+        
+        latest = await self.session.scalar(select(func.max(AuditLogHourlyStat.hour)))
+        raw_since = since
+        if latest is not None and latest >= since:
+            raw_since = latest + timedelta(hours=1)
+            conditions = [AuditLogHourlyStat.hour >= since, AuditLogHourlyStat.hour < raw_since]
+            if organization_id:
+                conditions.append(AuditLogHourlyStat.organization_id == organization_id)
+            result = await self.session.execute(
+                select(AuditLogHourlyStat.event_type, func.sum(AuditLogHourlyStat.count))
+                .where(and_(*conditions))
+                .group_by(AuditLogHourlyStat.event_type)
+            )
+            for event_type, count in result.all():
+                counts[event_type.value] = int(count)
         
-        conditions = [AuditLog.created_at >= since]
+        conditions = [AuditLog.created_at >= raw_since]
         if organization_id:
             conditions.append(AuditLog.organization_id == organization_id)
         
-        # Count by event type
+        # Count the not yet rolled-up tail by event type
         query = (
             select(AuditLog.event_type, func.count())
             .where(and_(*conditions))
@@ -271,7 +379,8 @@ class AuditService:
         )
         
         result = await self.session.execute(query)
-        counts = {row[0].value: row[1] for row in result.all()}
+        for event_type, count in result.all():
+            counts[event_type.value] = counts.get(event_type.value, 0) + count
         
         return {
             "failed_logins": counts.get("login_failed", 0),
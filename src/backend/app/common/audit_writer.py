@@ -0,0 +1,285 @@
+"""
+Audit Writer
+
+Batched, out-of-transaction persistence for audit log entries.
+
+Features:
+- AuditService.log() only enqueues; requests never wait on an audit INSERT
+  and a rolled-back request still keeps its audit trail
+- Background task drains the queue in batches with one multi-row INSERT
+- Bounded queue: when full, callers wait briefly (backpressure) and then
+  spill the entry to disk instead of dropping it
+- Entries still queued at shutdown, or in a batch the database rejected,
+  are appended to a JSON-lines spill file and replayed on the next startup
+- Replay is idempotent (entry ids are assigned at enqueue time and inserts
+  skip rows that already exist)
+- Only spill files of processes that are no longer running are replayed
+  (a live worker may still append to its own); lines that cannot be parsed
+  are moved to a .corrupt file instead of blocking the rest
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.common.models import AuditEventType, AuditLog
+
+logger = logging.getLogger(__name__)
+
+SPILL_SUFFIX = ".jsonl"
+QUARANTINE_SUFFIX = ".corrupt"
+# audit-<writer pid>.jsonl, or .replaying-<replayer pid> once claimed
+SPILL_NAME = re.compile(r"^audit-(\d+)\.jsonl(?:\.replaying-(\d+))?$")
+
+
+def build_entry(
+    event_type: AuditEventType,
+    ip_address: str,
+    user_id: Optional[str] = None,
+    email: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    organization_id: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Column values for one audit_logs row, stamped with id and time now."""
+    return {
+        "id": str(uuid4()),
+        "event_type": event_type,
+        "user_id": user_id,
+        "email": email,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "organization_id": organization_id,
+        "details": details,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _serialize(entry: Dict[str, Any]) -> str:
+    return json.dumps({
+        **entry,
+        "event_type": entry["event_type"].value,
+        "created_at": entry["created_at"].isoformat(),
+    }, default=str)
+
+
+def _deserialize(line: str) -> Dict[str, Any]:
+    entry = json.loads(line)
+    entry["event_type"] = AuditEventType(entry["event_type"])
+    entry["created_at"] = datetime.fromisoformat(entry["created_at"])
+    return entry
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def _read_spill(path: Path) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parsed entries and the raw lines that could not be parsed."""
+    entries, corrupt = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entries.append(_deserialize(line))
+            except (ValueError, KeyError, TypeError):
+                # Typically a partial last line from a crash mid-append
+                corrupt.append(line if line.endswith("\n") else line + "\n")
+    return entries, corrupt
+
+
+class AuditWriter:
+    """
+    Background audit log writer.
+
+    Usage:
+        await audit_writer.start()   # replays spilled entries first
+        await audit_writer.submit(build_entry(...))
+        ...
+        await audit_writer.stop()    # flushes, spills whatever is left
+    """
+
+    def __init__(
+        self,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        self.max_queue_size = max_queue_size or settings.AUDIT_QUEUE_MAX_SIZE
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self.enqueue_timeout = (
+            settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS if enqueue_timeout is None else enqueue_timeout
+        )
+        self.spill_dir = Path(spill_dir or settings.AUDIT_SPILL_DIR)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spill_lock = asyncio.Lock()
+        self._in_flight: List[Dict[str, Any]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so the queue binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        try:
+            await self.replay_spilled()
+        except Exception:
+            logger.exception("Replaying spilled audit entries failed; will retry on next start")
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        remaining = self._in_flight + self._drain(self._queue.qsize() if self._queue else 0)
+        self._in_flight = []
+        if remaining:
+            try:
+                await self.write_batch(remaining)
+            except Exception:
+                logger.exception(f"Final audit flush failed; spilling {len(remaining)} entries")
+                await self.spill(remaining)
+
+    async def submit(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry, waiting up to enqueue_timeout if the queue is full."""
+        try:
+            self.queue.put_nowait(entry)
+            return
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self.queue.put(entry), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audit queue full; spilling entry to disk")
+            await self.spill([entry])
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            try:
+                batch += self._drain(self.batch_size - 1)
+                if len(batch) < self.batch_size:
+                    # Let a burst accumulate into one INSERT
+                    await asyncio.sleep(self.flush_interval)
+                    batch += self._drain(self.batch_size - len(batch))
+                await self.write_batch(batch)
+            except asyncio.CancelledError:
+                # stop() flushes these together with the rest of the queue
+                self._in_flight = batch
+                raise
+            except Exception:
+                logger.exception(f"Audit batch insert failed; spilling {len(batch)} entries")
+                await self.spill(batch)
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    async def write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        """Insert entries with multi-row INSERTs in one transaction."""
+        factory = get_async_session_factory()
+        async with factory() as session:
+            for start in range(0, len(entries), self.batch_size):
+                chunk = entries[start:start + self.batch_size]
+                await session.execute(
+                    pg_insert(AuditLog).values(chunk).on_conflict_do_nothing()
+                )
+            await session.commit()
+
+    async def spill(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries to this process's spill file and fsync it."""
+        if not entries:
+            return
+        lines = "".join(_serialize(entry) + "\n" for entry in entries)
+        async with self._spill_lock:
+            await asyncio.to_thread(self._append, self._spill_path(), lines)
+
+    def _spill_path(self) -> Path:
+        return self.spill_dir / f"audit-{os.getpid()}{SPILL_SUFFIX}"
+
+    def _append(self, path: Path, lines: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def replay_spilled(self) -> int:
+        """Insert entries from spill files left by earlier runs. Returns rows replayed."""
+        if not self.spill_dir.is_dir():
+            return 0
+        replayed = 0
+        for path in sorted(self.spill_dir.glob(f"*{SPILL_SUFFIX}*")):
+            match = SPILL_NAME.match(path.name)
+            if not match:
+                continue
+            writer_pid, replayer_pid = match.groups()
+            # Still appended to by its worker, or being replayed by another one.
+            # Files left claimed by a crashed replay are picked up as well.
+            owner = int(replayer_pid or writer_pid)
+            if owner != os.getpid() and _pid_alive(owner):
+                continue
+
+            # Claim the file so concurrent workers don't replay it twice
+            original = path.with_name(f"audit-{writer_pid}{SPILL_SUFFIX}")
+            claimed = original.with_name(f"{original.name}.replaying-{os.getpid()}")
+            try:
+                async with self._spill_lock:  # Our own file may be appended to
+                    path.rename(claimed)
+                entries, corrupt = await asyncio.to_thread(_read_spill, claimed)
+            except FileNotFoundError:
+                continue
+            try:
+                if entries:
+                    await self.write_batch(entries)
+            except Exception:
+                # Put the file back for the next attempt
+                claimed.rename(original)
+                raise
+            if corrupt:
+                quarantine = original.with_name(f"audit-{writer_pid}{QUARANTINE_SUFFIX}")
+                await asyncio.to_thread(self._append, quarantine, "".join(corrupt))
+                logger.warning(f"Moved {len(corrupt)} unreadable audit spill lines to {quarantine}")
+            claimed.unlink(missing_ok=True)
+            replayed += len(entries)
+        if replayed:
+            logger.info(f"Replayed {replayed} spilled audit entries")
+        return replayed
+
+
+# Global writer instance
+audit_writer = AuditWriter()
@@ -0,0 +1,117 @@
+"""
+Key-Value Cache
+
+Small async cache abstraction with two backends:
+- InMemoryCache: per-process dict with TTLs (default, and used in tests)
+- RedisCache: shared across workers when REDIS_ENABLED is true
+
+Values are strings; callers own their key namespaces and serialization.
+"""
+from abc import ABC, abstractmethod
+import time
+from typing import Dict, Optional, Tuple
+
+from src.backend.app.common.redis_client import get_redis
+
+
+class CacheBackend(ABC):
+    """Interface shared by the cache backends."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: Optional[int] = None, only_if_missing: bool = False) -> bool:
+        """Store a value. Returns False if only_if_missing and the key exists."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def incr_existing(self, key: str, amount: int = 1) -> Optional[int]:
+        """
+        Increment an integer value only if the key exists.
+
+        Returns the new value, or None when the key is missing so the caller
+        can recompute it from the source of truth instead of starting at 0.
+        """
+
+
+class InMemoryCache(CacheBackend):
+    """Process-local cache. Expired entries are evicted lazily on access."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None, only_if_missing: bool = False) -> bool:
+        if only_if_missing and self._live(key):
+            return False
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (str(value), expires_at)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def incr_existing(self, key: str, amount: int = 1) -> Optional[int]:
+        entry = self._live(key)
+        if not entry:
+            return None
+        value = int(entry[0]) + amount
+        self._data[key] = (str(value), entry[1])
+        return value
+
+
+# Atomic "INCRBY if EXISTS" (plain INCRBY would create the key at 0)
+_INCR_EXISTING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+class RedisCache(CacheBackend):
+    """Redis-backed cache shared by all workers."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self._incr_existing = redis.register_script(_INCR_EXISTING_SCRIPT)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None, only_if_missing: bool = False) -> bool:
+        return bool(await self.redis.set(key, value, ex=ttl, nx=only_if_missing))
+
+    async def delete(self, key: str) -> None:
+        await self.redis.delete(key)
+
+    async def incr_existing(self, key: str, amount: int = 1) -> Optional[int]:
+        result = await self._incr_existing(keys=[key], args=[amount])
+        return int(result) if result is not None else None
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """Get the shared cache (Redis when enabled, otherwise in-process)."""
+    global _cache
+    if _cache is None:
+        redis = get_redis()
+        _cache = RedisCache(redis) if redis is not None else InMemoryCache()
+    return _cache
@@ -7,6 +7,8 @@ Provides:
 - TimestampMixin for created_at/updated_at
 - AuditEventType enum for all auth events
 - AuditLog model (append-only)
+- AuditLogHourlyStat rollup for dashboards
+- JobRun history of scheduled background jobs
 """
 from __future__ import annotations
 
@@ -22,6 +24,7 @@ from sqlalchemy import (
     Enum,
     Text,
     Index,
+    Integer,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
@@ -109,7 +112,8 @@ class AuditLog(Base):
     - This table is append-only by design
     - No UPDATE or DELETE operations allowed
     - 5-year retention policy
-    - Partitioned by month for performance (handled at DB level)
+    - Range-partitioned by month on created_at (migration 018); partitions
+      are created ahead and detached after retention by audit_maintenance
     """
     __tablename__ = "audit_logs"
 
@@ -150,10 +154,12 @@ class AuditLog(Base):
         index=True,
     )
 
-    # Timestamp (no updated_at since append-only)
+    # Timestamp (no updated_at since append-only). Part of the primary key
+    # because it is the partition key.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=datetime.utcnow,
+        primary_key=True,
         nullable=False,
         index=True,
     )
@@ -167,3 +173,53 @@ class AuditLog(Base):
 
     def __repr__(self) -> str:
         return f"<AuditLog {self.event_type.value} at {self.created_at}>"
+
+
+class AuditLogHourlyStat(Base):
+    """
+    Hourly event counts per organization, rolled up from audit_logs.
+    
+    Rebuilt for recent hours by the audit maintenance job; the security
+    dashboard reads this instead of grouping the raw log.
+    """
+    __tablename__ = "audit_log_hourly_stats"
+
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    organization_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False), nullable=True)
+    event_type: Mapped[AuditEventType] = mapped_column(Enum(AuditEventType), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_audit_log_hourly_stats_hour", "hour"),
+        Index("ix_audit_log_hourly_stats_org_hour", "organization_id", "hour"),
+    )
+    # No database primary key (organization_id is nullable); rows are only
+    # written in bulk by the rollup
+    __mapper_args__ = {"primary_key": [hour, organization_id, event_type]}
+
+
+class JobRunStatus(str, enum.Enum):
+    SUCCESS = "success"
+    FAILED = "failed"
+
+
+class JobRun(Base):
+    """One execution of a scheduled job (see common/scheduler.py)."""
+    __tablename__ = "scheduled_job_runs"
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    job_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    duration_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    rows_affected: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scheduled_job_runs_job_started", "job_name", "started_at"),
+        Index("ix_scheduled_job_runs_started", "started_at"),
+    )
@@ -0,0 +1,105 @@
+"""
+Monthly Range Partitions
+
+Helpers for tables range-partitioned by month on a timestamp column
+(notifications, audit logs).
+
+Partitions are named {table}_pYYYYMM and cover [month start, next month
+start). Each partitioned table also has a {table}_default partition that
+should stay empty as long as partitions are created ahead of time.
+
+Table names are interpolated into DDL, so only pass trusted constants.
+"""
+import re
+from datetime import date, datetime
+from typing import List, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def is_partitioned(session: AsyncSession, table: str) -> bool:
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.scalar() is not None
+
+
+async def list_monthly_partitions(session: AsyncSession, table: str) -> List[Tuple[str, date]]:
+    """Return (name, month) for each attached monthly partition, oldest first."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    partitions = []
+    for (name,) in result.all():
+        match = pattern.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+async def ensure_monthly_partitions(
+    session: AsyncSession, table: str, start: Union[date, datetime], months_ahead: int
+) -> List[str]:
+    """Create missing partitions from start's month through months_ahead. Returns created names."""
+    existing = {name for name, _ in await list_monthly_partitions(session, table)}
+    created = []
+    first = month_start(start)
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        await session.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(name)
+    return created
+
+
+async def partitions_before(session: AsyncSession, table: str, cutoff: Union[date, datetime]) -> List[str]:
+    """Names of partitions whose whole range ends on or before cutoff."""
+    return [
+        name
+        for name, month in await list_monthly_partitions(session, table)
+        if datetime.combine(add_months(month, 1), datetime.min.time()) <= _as_datetime(cutoff)
+    ]
+
+
+async def detach_partition(session: AsyncSession, table: str, name: str, drop: bool = True) -> None:
+    """Detach a partition from its parent and (by default) drop it."""
+    await session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+    if drop:
+        await session.execute(text(f'DROP TABLE "{name}"'))
+
+
+def _as_datetime(value: Union[date, datetime]) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.combine(value, datetime.min.time())
@@ -0,0 +1,50 @@
+"""
+Redis Client
+
+Shared async Redis connection for optional multi-worker features
+(notification fan-out, shared caches).
+
+Redis is optional: when REDIS_ENABLED is false every caller falls back to
+its in-process implementation, so a single-worker deployment or a test run
+needs no Redis server.
+"""
+import logging
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from src.backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis_client: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """
+    Get the shared Redis client, or None if Redis is disabled.
+
+    Usage:
+        redis = get_redis()
+        if redis is not None:
+            await redis.publish(channel, message)
+    """
+    global _redis_client
+    if not settings.REDIS_ENABLED:
+        return None
+    if _redis_client is None:
+        _redis_client = Redis.from_url(
+            settings.REDIS_URL,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True,
+        )
+        logger.info(f"Redis client configured: {settings.REDIS_URL}")
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client (application shutdown)."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
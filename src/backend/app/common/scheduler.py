@@ -0,0 +1,242 @@
+"""
+Scheduler
+
+In-process runner for periodic background jobs, started from the FastAPI
+lifespan.
+
+Features:
+- Leader election with a Postgres advisory lock: with several API workers
+  only the one holding the lock runs leader-only jobs; another takes over
+  when its connection goes away
+- Per-process jobs (leader_only=False) for work every worker must do
+- A job never overlaps with itself; failures are logged, not fatal
+- Every run is recorded in scheduled_job_runs (duration, rows affected,
+  error), history is pruned after SCHEDULER_JOB_RUN_RETENTION_DAYS
+
+Usage:
+    scheduler.add_job("auth-cleanup", 3600, run_auth_cleanup)
+    await scheduler.start()
+    ...
+    await scheduler.stop()
+
+Jobs are async callables taking no arguments; returning an int records it
+as the number of rows affected.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.common.models import JobRun, JobRunStatus
+
+logger = logging.getLogger(__name__)
+
+# How often a follower tries to take over leadership
+LEADER_RETRY_SECONDS = 30
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    interval_seconds: float
+    func: Callable[[], Awaitable[Optional[int]]]
+    leader_only: bool = True
+    record: bool = True  # Write a scheduled_job_runs row per run
+    next_run_at: float = 0.0  # time.monotonic()
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+
+class Scheduler:
+    """Periodic job runner with advisory-lock leader election."""
+
+    def __init__(
+        self,
+        lock_key: Optional[int] = None,
+        tick_seconds: Optional[float] = None,
+        record_runs: bool = True,
+    ):
+        self.lock_key = lock_key or settings.SCHEDULER_LOCK_KEY
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.record_runs = record_runs
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._lock_conn: Optional[AsyncConnection] = None
+        self._next_acquire_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_conn is not None
+
+    def add_job(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], Awaitable[Optional[int]]],
+        leader_only: bool = True,
+        record: bool = True,
+    ) -> ScheduledJob:
+        """Register a job; its first run is one interval after start."""
+        job = ScheduledJob(name, interval_seconds, func, leader_only, record)
+        self.jobs[name] = job
+        return job
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        now = time.monotonic()
+        for job in self.jobs.values():
+            job.next_run_at = now + job.interval_seconds
+        self._task = asyncio.create_task(self._run(), name="scheduler")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        running = [job.task for job in self.jobs.values() if job.running]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        await self._release_leadership()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._check_leadership()
+                self._launch_due_jobs()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self.tick_seconds)
+
+    def _launch_due_jobs(self) -> None:
+        now = time.monotonic()
+        for job in self.jobs.values():
+            if job.next_run_at > now or job.running:
+                continue
+            if job.leader_only and not self.is_leader:
+                continue
+            job.next_run_at = now + job.interval_seconds
+            job.task = asyncio.create_task(self.run_job(job), name=f"job:{job.name}")
+
+    async def run_job(self, job: ScheduledJob) -> Optional[int]:
+        """Run a job once and record the outcome."""
+        started_at = datetime.now(timezone.utc)
+        start = time.monotonic()
+        rows, error = None, None
+        try:
+            result = await job.func()
+            rows = result if isinstance(result, int) else None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.exception(f"Scheduled job {job.name} failed")
+        duration_ms = int((time.monotonic() - start) * 1000)
+        if self.record_runs and job.record:
+            await self._record(job, started_at, duration_ms, rows, error)
+        return rows
+
+    async def _record(
+        self,
+        job: ScheduledJob,
+        started_at: datetime,
+        duration_ms: int,
+        rows: Optional[int],
+        error: Optional[str],
+    ) -> None:
+        try:
+            factory = get_async_session_factory()
+            async with factory() as session:
+                session.add(JobRun(
+                    job_name=job.name,
+                    started_at=started_at,
+                    duration_ms=duration_ms,
+                    rows_affected=rows,
+                    status=JobRunStatus.FAILED if error else JobRunStatus.SUCCESS,
+                    error=error[:2000] if error else None,
+                ))
+                await session.commit()
+        except Exception:
+            logger.exception(f"Could not record run of job {job.name}")
+
+    # -------------------------------------------------------------------------
+    # Leader election
+    # -------------------------------------------------------------------------
+
+    async def _check_leadership(self) -> None:
+        if self._lock_conn is not None:
+            try:
+                await self._lock_conn.execute(text("SELECT 1"))
+                return
+            except Exception:
+                logger.warning("Scheduler lost its leader connection")
+                await self._release_leadership()
+        now = time.monotonic()
+        if now >= self._next_acquire_at and any(job.leader_only for job in self.jobs.values()):
+            # Followers retry occasionally rather than opening a connection every tick
+            self._next_acquire_at = now + LEADER_RETRY_SECONDS
+            self._lock_conn = await self._try_acquire()
+            if self._lock_conn is not None:
+                logger.info("Scheduler acquired leadership")
+
+    async def _try_acquire(self) -> Optional[AsyncConnection]:
+        """Take the advisory lock on a dedicated connection, or return None."""
+        engine = get_async_session_factory().kw["bind"]
+        # Autocommit: the lock is session-level and must not pin a transaction
+        conn = await engine.connect()
+        try:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = (
+                await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            ).scalar()
+        except Exception:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return None
+        return conn
+
+    async def _release_leadership(self) -> None:
+        if self._lock_conn is None:
+            return
+        conn, self._lock_conn = self._lock_conn, None
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+        except Exception:
+            pass  # Closing the connection releases the lock anyway
+        try:
+            await conn.close()
+        except Exception:
+            logger.exception("Closing scheduler lock connection failed")
+
+
+async def prune_job_runs() -> int:
+    """Delete job run history older than SCHEDULER_JOB_RUN_RETENTION_DAYS."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SCHEDULER_JOB_RUN_RETENTION_DAYS)
+    factory = get_async_session_factory()
+    async with factory() as session:
+        result = await session.execute(delete(JobRun).where(JobRun.started_at < cutoff))
+        await session.commit()
+        return result.rowcount or 0
+
+
+# Global scheduler instance
+scheduler = Scheduler()
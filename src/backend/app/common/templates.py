@@ -0,0 +1,118 @@
+"""
+Template Registry
+
+Shared Jinja2 environments for email and report templates.
+
+Features:
+- One Environment per template directory, created once per process
+- All templates compiled at startup (optionally persisted to a bytecode cache)
+- Auto-reload (re-stat on every render) only in development
+- Autoescaping for .html templates: values such as notification titles
+  come from other users
+- Per-locale cache of rendered layout shells (e.g. base.html), so a page
+  that extends a layout only renders its own content block per request
+"""
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from src.backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the content block while rendering a layout shell
+_CONTENT_MARKER = "\x00__content__\x00"
+
+
+class TemplateRegistry:
+    """
+    Registry of named template environments.
+
+    Usage:
+        template_registry.register("notifications", Path(__file__).parent / "templates")
+        html = template_registry.render("notifications", "invitation.html", {...})
+    """
+
+    def __init__(self, auto_reload: Optional[bool] = None, bytecode_cache_dir: Optional[str] = None):
+        self.auto_reload = (
+            settings.ENVIRONMENT == "development" if auto_reload is None else auto_reload
+        )
+        bytecode_cache_dir = bytecode_cache_dir or settings.TEMPLATE_BYTECODE_CACHE_DIR
+        self._bytecode_cache = None
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            self._bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        self._environments: Dict[str, Environment] = {}
+        self._layouts: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+    def register(self, namespace: str, directory) -> Environment:
+        """Register a template directory under a namespace (idempotent)."""
+        if namespace not in self._environments:
+            self._environments[namespace] = Environment(
+                loader=FileSystemLoader(str(directory)),
+                autoescape=select_autoescape(["html"]),
+                auto_reload=self.auto_reload,
+                bytecode_cache=self._bytecode_cache,
+                cache_size=-1,  # Template sets are small; never evict
+            )
+        return self._environments[namespace]
+
+    def environment(self, namespace: str) -> Environment:
+        return self._environments[namespace]
+
+    def get_template(self, namespace: str, name: str) -> Template:
+        return self._environments[namespace].get_template(name)
+
+    def precompile(self) -> int:
+        """Compile every registered template. Returns the number compiled."""
+        count = 0
+        for namespace, env in self._environments.items():
+            for name in env.list_templates(extensions=["html", "txt"]):
+                env.get_template(name)
+                count += 1
+        logger.info(f"Precompiled {count} templates")
+        return count
+
+    def render(
+        self,
+        namespace: str,
+        name: str,
+        context: Dict[str, Any],
+        locale: str = "en",
+        layout: Optional[str] = "base.html",
+    ) -> str:
+        """
+        Render a template.
+
+        Templates that fill a `content` block (i.e. extend the layout) are
+        rendered block-only and wrapped in the cached layout shell for the
+        locale; other templates are rendered in full.
+        """
+        template = self.get_template(namespace, name)
+        context = {**context, "locale": locale}
+        if layout is None or "content" not in template.blocks:
+            return template.render(**context)
+
+        head, tail = self._layout_shell(namespace, layout, locale)
+        block = template.blocks["content"](template.new_context(context))
+        return head + "".join(block) + tail
+
+    def _layout_shell(self, namespace: str, layout: str, locale: str) -> Tuple[str, str]:
+        key = (namespace, layout, locale)
+        shell = None if self.auto_reload else self._layouts.get(key)
+        if shell is None:
+            env = self._environments[namespace]
+            wrapper = env.from_string(
+                "{% extends layout %}{% block content %}" + _CONTENT_MARKER + "{% endblock %}"
+            )
+            head, tail = wrapper.render(layout=layout, locale=locale).split(_CONTENT_MARKER, 1)
+            shell = (head, tail)
+            if not self.auto_reload:
+                self._layouts[key] = shell
+        return shell
+
+
+# Global registry instance
+template_registry = TemplateRegistry()
@@ -0,0 +1,71 @@
+"""
+Text Search Helpers
+
+Substring matching that can use pg_trgm GIN indexes.
+
+Features:
+- Arabic normalization shared by Python and SQL: alef variants, alef
+  maqsura and taa marbuta are folded and diacritics/tatweel removed, so
+  "أحمد", "احمد" and "أَحْمَد" all match each other
+- normalized_arabic() wraps a column in the immutable SQL function used by
+  the expression index (migration 017); the index is only used when the
+  query applies the exact same expression
+- ILIKE patterns with %/_ in user input escaped
+- The function and the users trigram indexes are also created by
+  Base.metadata.create_all() (DEBUG setups), not only by migration 017
+"""
+from sqlalchemy import DDL, event, func
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.backend.database import Base
+
+# Keep in sync with the nudj_normalize_arabic() SQL function (migration 017)
+NORMALIZE_ARABIC_FUNCTION = "nudj_normalize_arabic"
+
+# Same statements as migration 017, run after create_all on PostgreSQL
+SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE OR REPLACE FUNCTION {NORMALIZE_ARABIC_FUNCTION}(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $$ SELECT translate(value, 'أإآٱىةًٌٍَُِّْٰـ', 'اااايه') $$
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_name_en_trgm ON users USING gin (name_en gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS ix_users_name_ar_trgm "
+    f"ON users USING gin ({NORMALIZE_ARABIC_FUNCTION}(name_ar) gin_trgm_ops)",
+]
+
+for _statement in SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+ARABIC_FOLDS = {
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ى": "ي",
+    "ة": "ه",
+}
+
+# Tanween, harakat, shadda, sukun, superscript alef, tatweel
+ARABIC_STRIPPED = "ًٌٍَُِّْٰـ"
+
+_TRANSLATION = str.maketrans(
+    {**ARABIC_FOLDS, **{char: None for char in ARABIC_STRIPPED}}
+)
+
+
+def normalize_arabic(value: str) -> str:
+    """Python equivalent of nudj_normalize_arabic()."""
+    return value.translate(_TRANSLATION)
+
+
+def normalized_arabic(column) -> ColumnElement:
+    return getattr(func, NORMALIZE_ARABIC_FUNCTION)(column)
+
+
+def contains_pattern(term: str) -> str:
+    """ILIKE pattern matching `term` anywhere, with wildcards in the term escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
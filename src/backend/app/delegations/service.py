@@ -55,7 +55,7 @@ class DelegationService:
             user_id=delegation.user_id,
             title=title,
             message=message,
-            type=NotificationType.ACTION,
+            type=NotificationType.ACTION_REQUIRED,
             link=f"/assessments/{assessment.id}"
         ))
 
@@ -0,0 +1,116 @@
+"""
+Notification Broker
+
+In-process pub/sub feeding the notification push channel (SSE).
+
+Features:
+- Per-connection bounded queues keyed by user
+- Optional Redis fan-out so every API worker sees every event
+- Slow consumers drop their oldest events instead of blocking publishers
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from src.backend.app.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "nudj:notifications"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class NotificationBroker:
+    """
+    Publish notification events to connected users.
+
+    Without Redis, events are delivered to subscribers in this process only.
+    With Redis enabled, publish() goes through a Redis channel and a listener
+    task in each worker delivers to its local subscribers.
+
+    Usage:
+        async with notification_broker.subscribe(user_id) as queue:
+            event = await queue.get()
+
+        await notification_broker.publish(user_id, "notification", payload)
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def start(self) -> None:
+        """Start the Redis listener (no-op when Redis is disabled)."""
+        if get_redis() is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="notification-broker")
+
+    async def stop(self) -> None:
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Register a connection for a user's events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        key = str(user_id)
+        self._subscribers[key].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[key].discard(queue)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+
+    async def publish(self, user_id: Any, event: str, data: Dict[str, Any]) -> None:
+        """Publish one event to a user."""
+        await self.publish_many([user_id], event, data)
+
+    async def publish_many(self, user_ids, event: str, data: Dict[str, Any]) -> None:
+        """Publish the same event to several users with a single message."""
+        message = {"users": [str(u) for u in user_ids], "event": event, "data": data}
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.publish(REDIS_CHANNEL, json.dumps(message, default=str))
+                return
+            except Exception as e:
+                # Fall back to local delivery rather than losing the event here too
+                logger.warning(f"Redis publish failed, delivering locally only: {e}")
+        self._deliver(message)
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        event = {"event": message["event"], "data": message["data"]}
+        for user_id in message["users"]:
+            for queue in self._subscribers.get(user_id, ()):
+                if queue.full():
+                    queue.get_nowait()  # Drop oldest for slow consumers
+                queue.put_nowait(event)
+
+    async def _listen(self) -> None:
+        redis = get_redis()
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    async for raw in pubsub.listen():
+                        if raw.get("type") != "message":
+                            continue
+                        self._deliver(json.loads(raw["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification broker lost Redis subscription: {e}")
+                await asyncio.sleep(1)
+
+
+# Global broker instance
+notification_broker = NotificationBroker()
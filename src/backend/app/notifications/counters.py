@@ -0,0 +1,128 @@
+"""
+Unread Notification Counters
+
+Per-user unread counts maintained on write, so the badge endpoint never
+runs COUNT(*) over notifications.
+
+- notification_unread_counts holds one row per user. Every write that
+  changes unread state adjusts it in the same transaction (create,
+  mark read, mark all read, retention), so it cannot drift from the rows
+  it counts; reads are a primary-key lookup
+- Increments upsert the row; decrements never go below zero
+- Rows are locked in user id order, so concurrent bulk writes cannot
+  deadlock on each other
+- With Redis, reads are additionally cached for
+  NOTIFICATION_UNREAD_COUNT_TTL_SECONDS and the key is deleted after each
+  committed change; without it every worker reads the row directly
+"""
+import asyncio
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.app.common.cache import CacheBackend, RedisCache, get_cache
+from src.backend.app.notifications.models import Notification, NotificationUnreadCount
+
+# Rows per upsert statement
+COUNTER_CHUNK_SIZE = 1000
+
+_counts = NotificationUnreadCount.__table__
+
+
+def _shared_cache() -> Optional[CacheBackend]:
+    cache = get_cache()
+    return cache if isinstance(cache, RedisCache) else None
+
+
+class UnreadCounter:
+    """
+    Maintained unread counts.
+
+    increment/decrement/recompute only execute statements; the caller
+    commits them with the notification change and then calls invalidate().
+    """
+
+    KEY_PREFIX = "notifications:unread:"
+
+    def __init__(self, session: AsyncSession, cache: Optional[CacheBackend] = None):
+        self.session = session
+        self.cache = cache or _shared_cache()
+
+    def _key(self, user_id: UUID) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+
+    async def get(self, user_id: UUID) -> int:
+        if self.cache is not None:
+            cached = await self.cache.get(self._key(user_id))
+            if cached is not None:
+                return int(cached)
+
+        count = (await self.session.execute(
+            select(NotificationUnreadCount.unread_count).where(NotificationUnreadCount.user_id == user_id)
+        )).scalar() or 0
+        if self.cache is not None:
+            # Don't overwrite a value another request set meanwhile
+            await self.cache.set(
+                self._key(user_id), str(count),
+                ttl=settings.NOTIFICATION_UNREAD_COUNT_TTL_SECONDS,
+                only_if_missing=True,
+            )
+        return count
+
+    async def increment(self, user_ids: Iterable[UUID]) -> None:
+        """Add one unread notification for each user."""
+        ordered = sorted({str(user_id) for user_id in user_ids})
+        for start in range(0, len(ordered), COUNTER_CHUNK_SIZE):
+            stmt = pg_insert(NotificationUnreadCount).values([
+                {"user_id": user_id, "unread_count": 1}
+                for user_id in ordered[start:start + COUNTER_CHUNK_SIZE]
+            ])
+            await self.session.execute(stmt.on_conflict_do_update(
+                index_elements=[NotificationUnreadCount.user_id],
+                set_={"unread_count": NotificationUnreadCount.unread_count + stmt.excluded.unread_count},
+            ))
+
+    async def decrement(self, user_id: UUID, count: int = 1) -> None:
+        await self.decrement_many({user_id: count})
+
+    async def decrement_many(self, counts: Dict[UUID, int]) -> None:
+        """Remove `count` unread notifications per user (one executemany)."""
+        params = [
+            {"counted_user_id": user_id, "read_count": count}
+            for user_id, count in sorted(counts.items(), key=lambda item: str(item[0]))
+            if count
+        ]
+        if not params:
+            return
+        await self.session.execute(
+            update(_counts)
+            .where(_counts.c.user_id == bindparam("counted_user_id"))
+            .values(unread_count=func.greatest(_counts.c.unread_count - bindparam("read_count"), 0)),
+            params,
+        )
+
+    async def recompute(self, user_ids: Iterable[UUID]) -> None:
+        """Recount from notifications, for bulk removals that return no rows."""
+        ordered = sorted({str(user_id) for user_id in user_ids})
+        if not ordered:
+            return
+        unread = (
+            select(func.count())
+            .where(Notification.user_id == _counts.c.user_id, Notification.is_read == False)
+            .scalar_subquery()
+        )
+        await self.session.execute(
+            update(_counts).where(_counts.c.user_id.in_(ordered)).values(unread_count=unread)
+        )
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached value after a committed change."""
+        if self.cache is not None:
+            await self.cache.delete(self._key(user_id))
+
+    async def invalidate_many(self, user_ids: Iterable[UUID]) -> None:
+        await asyncio.gather(*(self.invalidate(user_id) for user_id in set(user_ids)))
@@ -0,0 +1,156 @@
+"""
+Notification Digests
+
+Rolls a user's unread notifications into one periodic email (hourly or
+daily, per NotificationPreference) instead of one email per event.
+
+Due users are processed in batches: one query selects due preferences,
+one windowed query fetches the top items for the whole batch, outbox
+rows are queued and last_digest_at is advanced in the same transaction.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.auth.models import User
+from src.backend.app.notifications.email_outbox import enqueue_email
+from src.backend.app.notifications.models import (
+    DigestFrequency,
+    Notification,
+    NotificationPreference,
+)
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PERIODS = {
+    DigestFrequency.HOURLY: timedelta(hours=1),
+    DigestFrequency.DAILY: timedelta(days=1),
+}
+DIGEST_BATCH_SIZE = 500
+
+
+def digest_link(link: Optional[str]) -> Optional[str]:
+    """Absolute frontend URL for an in-app path; anything else gets no link."""
+    if not link or not link.startswith("/") or link.startswith("//"):
+        return None
+    return f"{settings.FRONTEND_URL}{link}"
+
+
+class DigestService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def send_due_digests(self, now: Optional[datetime] = None) -> int:
+        """Queue digest emails for every due user. Returns emails queued."""
+        now = now or datetime.utcnow()
+        queued = 0
+        for frequency, period in DIGEST_PERIODS.items():
+            while True:
+                due = await self._due_users(frequency, now - period)
+                if not due:
+                    break
+                queued += await self._send_batch(due, frequency, period, now)
+                if len(due) < DIGEST_BATCH_SIZE:
+                    break
+        return queued
+
+    async def _due_users(self, frequency: DigestFrequency, cutoff: datetime) -> List:
+        stmt = (
+            select(NotificationPreference.user_id, NotificationPreference.last_digest_at, User.email)
+            .join(User, User.id == NotificationPreference.user_id)
+            .where(
+                NotificationPreference.digest_frequency == frequency,
+                or_(
+                    NotificationPreference.last_digest_at.is_(None),
+                    NotificationPreference.last_digest_at <= cutoff
+                ),
+                User.is_active == True
+            )
+            .limit(DIGEST_BATCH_SIZE)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def _send_batch(self, due: List, frequency: DigestFrequency, period: timedelta, now: datetime) -> int:
+        ranked = (
+            select(
+                Notification.user_id,
+                Notification.title,
+                Notification.message,
+                Notification.link,
+                Notification.coalesced_count,
+                func.row_number().over(
+                    partition_by=Notification.user_id,
+                    order_by=Notification.created_at.desc(),
+                ).label("rank"),
+                func.count().over(partition_by=Notification.user_id).label("total"),
+            )
+            .join(NotificationPreference, NotificationPreference.user_id == Notification.user_id)
+            .where(
+                Notification.user_id.in_([row.user_id for row in due]),
+                Notification.is_read == False,
+                # Pending = created or merged into since this user's previous digest
+                func.coalesce(Notification.last_coalesced_at, Notification.created_at) > func.coalesce(
+                    NotificationPreference.last_digest_at, now - period
+                )
+            )
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(ranked).where(ranked.c.rank <= settings.NOTIFICATION_DIGEST_MAX_ITEMS)
+        )
+
+        items: Dict[str, List[Dict]] = defaultdict(list)
+        totals: Dict[str, int] = {}
+        for row in result.all():
+            user_id = str(row.user_id)
+            items[user_id].append({
+                "title": row.title,
+                "message": row.message,
+                "link": digest_link(row.link),
+                "count": row.coalesced_count,
+            })
+            totals[user_id] = row.total
+
+        queued = 0
+        for row in due:
+            user_id = str(row.user_id)
+            if user_id not in items:
+                continue
+            enqueue_email(
+                self.session,
+                recipients=[row.email],
+                subject=f"Your {frequency.value} notification digest | ملخص الإشعارات",
+                template_name="digest.html",
+                context={
+                    "items": items[user_id],
+                    "total": totals[user_id],
+                    "more": totals[user_id] - len(items[user_id]),
+                    "notifications_url": f"{settings.FRONTEND_URL}/notifications",
+                },
+            )
+            queued += 1
+
+        await self.session.execute(
+            update(NotificationPreference)
+            .where(NotificationPreference.user_id.in_([row.user_id for row in due]))
+            .values(last_digest_at=now)
+        )
+        await self.session.commit()
+        return queued
+
+
+async def run_notification_digests() -> int:
+    """Periodic job entry point."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        queued = await DigestService(session).send_due_digests()
+    if queued:
+        logger.info(f"Queued {queued} notification digest emails")
+    return queued
@@ -0,0 +1,260 @@
+"""
+Email Outbox
+
+Transactional email delivery.
+
+Features:
+- enqueue_email() adds outbox rows in the caller's transaction;
+  enqueue_emails() queues many individual emails with one INSERT
+- Background worker claims due rows in batches (FOR UPDATE SKIP LOCKED,
+  safe with several API workers) and sends them over one pooled connection
+- Send rate limiting, exponential-backoff retries, per-row delivery status
+- Claimed rows carry a lease, so a crash mid-batch only delays delivery
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.notifications.email_service import EmailService, email_service
+from src.backend.app.notifications.email_transport import PermanentDeliveryError
+from src.backend.app.notifications.models import EmailOutbox, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed batch stays reserved before another worker may retry it
+CLAIM_LEASE_SECONDS = 300
+
+
+def enqueue_email(
+    session: AsyncSession,
+    recipients: List[str],
+    subject: str,
+    template_name: str,
+    context: Dict[str, Any],
+) -> List[EmailOutbox]:
+    """
+    Queue an email for delivery as part of the current transaction.
+
+    One row is created per recipient. Context must be JSON-serializable.
+    Nothing is sent unless the caller's transaction commits.
+    """
+    rows = [
+        EmailOutbox(
+            to_address=recipient,
+            subject=subject,
+            template_name=template_name,
+            context=context,
+        )
+        for recipient in recipients
+    ]
+    session.add_all(rows)
+    return rows
+
+
+async def enqueue_emails(session: AsyncSession, emails: List[Dict[str, Any]]) -> int:
+    """
+    Queue many individual emails with one executemany INSERT.
+
+    Each dict holds to_address, subject, template_name and context. As with
+    enqueue_email, nothing is sent unless the caller's transaction commits.
+    Returns the number of rows queued.
+    """
+    if not emails:
+        return 0
+    await session.execute(insert(EmailOutbox), emails)
+    return len(emails)
+
+
+@dataclass
+class ClaimedEmail:
+    id: UUID
+    to_address: str
+    subject: str
+    template_name: str
+    context: Dict[str, Any]
+    attempts: int
+
+
+class EmailOutboxWorker:
+    """
+    Background delivery loop for the email outbox.
+
+    Usage:
+        await email_outbox_worker.start()
+        ...
+        await email_outbox_worker.stop()
+    """
+
+    def __init__(
+        self,
+        service: Optional[EmailService] = None,
+        batch_size: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        self.service = service or email_service
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.rate_per_second = rate_per_second or settings.EMAIL_OUTBOX_RATE_PER_SECOND
+        self.max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        self.retry_base_seconds = retry_base_seconds or settings.EMAIL_OUTBOX_RETRY_SECONDS
+        self.poll_seconds = poll_seconds or settings.EMAIL_OUTBOX_POLL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+        self._next_send_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="email-outbox")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.service.transport.close()
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=self.retry_base_seconds * (2 ** (attempts - 1)))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.process_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                delivered = 0
+            if delivered < self.batch_size:
+                # Drained: drop the idle SMTP connection until there is work again
+                await self.service.transport.close()
+                await asyncio.sleep(self.poll_seconds)
+
+    async def process_batch(self) -> int:
+        """Claim, send and record one batch. Returns the number of rows claimed."""
+        factory = get_async_session_factory()
+        async with factory() as session:
+            claimed = await self._claim(session)
+            if not claimed:
+                return 0
+
+            sent, failures = await self.send_batch(claimed)
+            await self._record(session, sent, failures)
+            return len(claimed)
+
+    async def _claim(self, session: AsyncSession) -> List[ClaimedEmail]:
+        now = datetime.utcnow()
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                EmailOutbox.status.in_([EmailStatus.PENDING, EmailStatus.SENDING]),
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(due.scalar_subquery()))
+            .values(
+                status=EmailStatus.SENDING,
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+            )
+            .returning(
+                EmailOutbox.id,
+                EmailOutbox.to_address,
+                EmailOutbox.subject,
+                EmailOutbox.template_name,
+                EmailOutbox.context,
+                EmailOutbox.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.execute(stmt)
+        claimed = [ClaimedEmail(*row) for row in result.all()]
+        await session.commit()
+        return claimed
+
+    async def send_batch(
+        self, emails: List[ClaimedEmail]
+    ) -> Tuple[List[UUID], List[Tuple[ClaimedEmail, str, bool]]]:
+        """
+        Send claimed emails over the shared transport.
+
+        Returns the ids that were sent and (email, error, permanent) for
+        each failure.
+        """
+        sent: List[UUID] = []
+        failures: List[Tuple[ClaimedEmail, str, bool]] = []
+        for email in emails:
+            await self._throttle()
+            try:
+                html_content = self.service.render(email.template_name, email.context)
+                message = self.service.build_message([email.to_address], email.subject, html_content)
+                await self.service.transport.send(message)
+                sent.append(email.id)
+            except PermanentDeliveryError as e:
+                failures.append((email, str(e), True))
+            except Exception as e:
+                failures.append((email, str(e), False))
+        return sent, failures
+
+    async def _throttle(self) -> None:
+        """Space sends to stay under the provider's rate limit."""
+        now = time.monotonic()
+        if self._next_send_at > now:
+            await asyncio.sleep(self._next_send_at - now)
+            now = self._next_send_at
+        self._next_send_at = now + 1.0 / self.rate_per_second
+
+    async def _record(
+        self,
+        session: AsyncSession,
+        sent: List[UUID],
+        failures: List[Tuple[ClaimedEmail, str, bool]],
+    ) -> None:
+        now = datetime.utcnow()
+        if sent:
+            await session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(sent))
+                .values(status=EmailStatus.SENT, sent_at=now, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        for email, error, permanent in failures:
+            exhausted = permanent or email.attempts >= self.max_attempts
+            await session.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == email.id)
+                .values(
+                    status=EmailStatus.FAILED if exhausted else EmailStatus.PENDING,
+                    last_error=error[:1000],
+                    next_attempt_at=now + self.retry_delay(email.attempts),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            logger.warning(
+                f"Email {email.id} to {email.to_address} failed "
+                f"(attempt {email.attempts}/{self.max_attempts}): {error}"
+            )
+        await session.commit()
+
+
+# Global worker instance
+email_outbox_worker = EmailOutboxWorker()
@@ -0,0 +1,102 @@
+"""
+Email Transports
+
+Delivery backends used by EmailService and the outbox worker.
+
+- SMTPTransport: one persistent aiosmtplib connection, reused across sends
+  and reconnected when the server drops it
+- InMemoryTransport: local SMTP stand-in that keeps messages in memory
+  (development mock mode and tests)
+"""
+import asyncio
+import logging
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentDeliveryError(Exception):
+    """The server rejected the message; retrying will not help."""
+
+
+class SMTPTransport:
+    """Pooled SMTP connection (a single connection, serialized by a lock)."""
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        start_tls: bool = True,
+        timeout: float = 30.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.timeout = timeout
+        self._client: Optional[aiosmtplib.SMTP] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        self._client = client
+        return client
+
+    async def send(self, message: EmailMessage) -> None:
+        async with self._lock:
+            client = self._client
+            if client is None or not client.is_connected:
+                client = await self._connect()
+            try:
+                await client.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Idle connection was closed by the server; retry once
+                client = await self._connect()
+                await client.send_message(message)
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused) as e:
+                raise PermanentDeliveryError(str(e)) from e
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._client is not None and self._client.is_connected:
+                try:
+                    await self._client.quit()
+                except aiosmtplib.SMTPException:
+                    self._client.close()
+            self._client = None
+
+
+class InMemoryTransport:
+    """
+    Local SMTP stand-in.
+
+    Sent messages are appended to `messages`. Set `fail_with` to an
+    exception to simulate provider errors.
+    """
+
+    def __init__(self):
+        self.messages: List[EmailMessage] = []
+        self.fail_with: Optional[Exception] = None
+
+    async def send(self, message: EmailMessage) -> None:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.messages.append(message)
+        logger.info(f"[MOCK EMAIL] To: {message['To']} | Subject: {message['Subject']}")
+
+    async def close(self) -> None:
+        pass
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Text, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime, Text, Enum, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -14,6 +14,17 @@ class NotificationType(str, enum.Enum):
     ERROR = "error"
     ACTION_REQUIRED = "action_required"
 
+class EmailStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    SENDING = "SENDING"  # Claimed by a worker; lease ends at next_attempt_at
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class DigestFrequency(str, enum.Enum):
+    OFF = "off"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -26,8 +37,90 @@ class Notification(Base):
     
     link = Column(String(500), nullable=True) # Optional action link
     is_read = Column(Boolean, default=False, nullable=False)
+    # Number of same type/link events merged into this row
+    coalesced_count = Column(Integer, default=1, nullable=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False) # First occurrence
+    last_coalesced_at = Column(DateTime, nullable=True) # Latest merged event
     
     # Relationships
     user = relationship("User", backref="notifications")
+
+    __table_args__ = (
+        # Newest-first list per user
+        Index("ix_notifications_user_created", "user_id", created_at.desc()),
+        # Unread list and counter recompute only scan unread rows
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            created_at.desc(),
+            postgresql_where=(is_read == False),
+        ),
+        # Retention purge of old read rows
+        Index(
+            "ix_notifications_read_created",
+            created_at,
+            postgresql_where=(is_read == True),
+        ),
+    )
+
+class NotificationPreference(Base):
+    """Per-user notification delivery preferences."""
+    __tablename__ = "notification_preferences"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    digest_frequency = Column(String(20), default=DigestFrequency.OFF, nullable=False)
+    # Notifications created after this are pending for the next digest
+    last_digest_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_notification_preferences_digest", "digest_frequency", "last_digest_at"),
+    )
+
+class NotificationUnreadCount(Base):
+    """
+    Per-user unread notification count.
+
+    Adjusted in the same transaction as every write that changes unread
+    state (see counters.py), so badge reads are a primary-key lookup.
+    """
+    __tablename__ = "notification_unread_counts"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, default=0, nullable=False)
+
+class EmailOutbox(Base):
+    """
+    Transactional email outbox.
+
+    Rows are added in the caller's transaction and delivered by the
+    background EmailOutboxWorker, so an email goes out only if the change
+    that triggered it was committed.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_address = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+
+    # Rendered at delivery time
+    template_name = Column(String(255), nullable=False)
+    context = Column(JSONB, nullable=False, default=dict)
+
+    status = Column(String(20), default=EmailStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Worker polls only undelivered rows that are due
+        Index(
+            "ix_email_outbox_due",
+            next_attempt_at,
+            postgresql_where=status.in_([EmailStatus.PENDING.value, EmailStatus.SENDING.value]),
+        ),
+    )
@@ -0,0 +1,120 @@
+"""
+Notification Retention
+
+Deletes old notifications according to the retention settings:
+- read notifications older than NOTIFICATION_RETENTION_READ_DAYS
+- any notification older than NOTIFICATION_RETENTION_UNREAD_DAYS
+
+Rows are deleted in small committed chunks so the purge never holds many
+row locks or produces one huge transaction. Unread counters are adjusted in
+the same transaction as each deletion. When the table is range
+partitioned (migration 013), partitions entirely past both cutoffs are
+dropped instead, and upcoming monthly partitions are created ahead.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, distinct, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config import settings
+from src.backend.database import get_async_session_factory
+from src.backend.app.common import partitions
+from src.backend.app.notifications.counters import UnreadCounter
+from src.backend.app.notifications.models import Notification
+
+logger = logging.getLogger(__name__)
+
+TABLE = Notification.__tablename__
+
+
+class NotificationRetentionService:
+    def __init__(self, session: AsyncSession, batch_size: Optional[int] = None):
+        self.session = session
+        self.batch_size = batch_size or settings.NOTIFICATION_PURGE_BATCH_SIZE
+        self.unread_counter = UnreadCounter(session)
+
+    async def purge(self, now: Optional[datetime] = None) -> int:
+        """Apply the retention policy. Returns the number of rows removed."""
+        now = now or datetime.utcnow()
+        read_days = settings.NOTIFICATION_RETENTION_READ_DAYS
+        unread_days = settings.NOTIFICATION_RETENTION_UNREAD_DAYS
+        read_cutoff = now - timedelta(days=read_days) if read_days else None
+        unread_cutoff = now - timedelta(days=unread_days) if unread_days else None
+
+        removed = 0
+        if await partitions.is_partitioned(self.session, TABLE):
+            removed += await self._maintain_partitions(now, read_cutoff, unread_cutoff)
+
+        if read_cutoff:
+            removed += await self._purge_chunks(
+                Notification.is_read == True,
+                Notification.created_at < read_cutoff,
+            )
+        if unread_cutoff:
+            removed += await self._purge_chunks(Notification.created_at < unread_cutoff)
+        return removed
+
+    async def _purge_chunks(self, *conditions) -> int:
+        removed = 0
+        while True:
+            chunk = (
+                select(Notification.id)
+                .where(*conditions)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            stmt = (
+                delete(Notification)
+                .where(Notification.id.in_(chunk))
+                .returning(Notification.user_id, Notification.is_read)
+                .execution_options(synchronize_session=False)
+            )
+            rows = (await self.session.execute(stmt)).all()
+            unread = Counter(user_id for user_id, is_read in rows if not is_read)
+            await self.unread_counter.decrement_many(unread)
+            await self.session.commit()
+
+            await self.unread_counter.invalidate_many(unread)
+            removed += len(rows)
+            if len(rows) < self.batch_size:
+                return removed
+
+    async def _maintain_partitions(
+        self, now: datetime, read_cutoff: Optional[datetime], unread_cutoff: Optional[datetime]
+    ) -> int:
+        await partitions.ensure_monthly_partitions(
+            self.session, TABLE, now, settings.NOTIFICATION_PARTITIONS_AHEAD_MONTHS
+        )
+        await self.session.commit()
+
+        # A partition can only go once every row in it is past retention
+        if not (read_cutoff and unread_cutoff):
+            return 0
+        removed = 0
+        for name in await partitions.partitions_before(self.session, TABLE, min(read_cutoff, unread_cutoff)):
+            unread_users = (await self.session.execute(
+                select(distinct(text("user_id"))).select_from(text(f'"{name}"')).where(text("NOT is_read"))
+            )).scalars().all()
+            count = (await self.session.execute(text(f'SELECT count(*) FROM "{name}"'))).scalar() or 0
+            await partitions.detach_partition(self.session, TABLE, name)
+            # Detached rows are no longer counted
+            await self.unread_counter.recompute(unread_users)
+            await self.session.commit()
+            await self.unread_counter.invalidate_many(unread_users)
+            removed += count
+            logger.info(f"Dropped notification partition {name} ({count} rows)")
+        return removed
+
+
+async def run_notification_retention() -> int:
+    """Periodic job entry point."""
+    factory = get_async_session_factory()
+    async with factory() as session:
+        removed = await NotificationRetentionService(session).purge()
+    if removed:
+        logger.info(f"Notification retention removed {removed} rows")
+    return removed
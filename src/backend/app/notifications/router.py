@@ -1,13 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
+from src.backend.config import settings
 from src.backend.database import get_db
-from src.backend.app.auth.dependencies import get_current_user
-from src.backend.app.auth.models import User
+from src.backend.app.auth.dependencies import (
+    bearer_scheme,
+    get_current_user,
+    get_jwt_service,
+    get_user_from_stream_ticket,
+    require_role,
+)
+from src.backend.app.auth.jwt_service import JWTService
+from src.backend.app.auth.models import Role, User
 from src.backend.app.notifications.service import NotificationService
-from src.backend.app.notifications.schemas import NotificationResponse, NotificationUpdate
+from src.backend.app.notifications.models import DigestFrequency
+from src.backend.app.notifications.schemas import (
+    NotificationBroadcast,
+    NotificationPreferenceResponse,
+    NotificationPreferenceUpdate,
+    NotificationResponse,
+    NotificationUpdate,
+)
+from src.backend.app.notifications.broker import notification_broker
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -27,6 +47,65 @@ async def get_notifications(
         unread_only=unread_only
     )
 
+@router.post("/stream-ticket")
+async def create_stream_ticket(
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    jwt_service: JWTService = Depends(get_jwt_service),
+):
+    """Mint a short-lived ticket for opening the notification stream."""
+    ticket = jwt_service.create_stream_ticket(
+        str(current_user.id), jwt_service.get_token_jti(credentials.credentials)
+    )
+    return {"ticket": ticket, "expires_in": settings.NOTIFICATION_STREAM_TICKET_SECONDS}
+
+async def get_stream_user(
+    ticket: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+    jwt_service: JWTService = Depends(get_jwt_service),
+) -> User:
+    # EventSource cannot send headers, so browsers pass a stream ticket
+    # instead; access tokens are never read from the URL
+    if not credentials and ticket:
+        return await get_user_from_stream_ticket(ticket, db, jwt_service)
+    return await get_current_user(credentials, db, jwt_service)
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: User = Depends(get_stream_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Server-Sent Events channel for notifications.
+
+    Emits `notification` events for new notifications and `read` events
+    when notifications are marked read elsewhere.
+    """
+    user_id = current_user.id
+    # Release the DB connection now; the stream may stay open for hours
+    await db.close()
+
+    async def event_stream():
+        async with notification_broker.subscribe(user_id) as queue:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # Keeps proxies from closing an idle stream
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/unread-count")
 async def get_unread_count(
     current_user: User = Depends(get_current_user),
@@ -36,6 +115,27 @@ async def get_unread_count(
     count = await service.get_unread_count(current_user.id)
     return {"count": count}
 
+@router.get("/preferences", response_model=NotificationPreferenceResponse)
+async def get_preferences(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    service = NotificationService(db)
+    preferences = await service.get_preferences(current_user.id)
+    return preferences or NotificationPreferenceResponse()
+
+@router.put("/preferences", response_model=NotificationPreferenceResponse)
+async def update_preferences(
+    data: NotificationPreferenceUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Opt in to (or out of) hourly/daily email digests of unread notifications."""
+    service = NotificationService(db)
+    return await service.set_digest_frequency(
+        current_user.id, DigestFrequency(data.digest_frequency.value)
+    )
+
 @router.patch("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_as_read(
     notification_id: UUID,
@@ -58,3 +158,23 @@ async def mark_all_as_read(
     service = NotificationService(db)
     count = await service.mark_all_as_read(current_user.id)
     return {"updated_count": count}
+
+@router.post("/broadcast", status_code=status.HTTP_201_CREATED)
+async def broadcast_notification(
+    data: NotificationBroadcast,
+    current_user: User = Depends(require_role(Role.SUPER_ADMIN, Role.CLIENT_ADMIN)),
+    db: AsyncSession = Depends(get_db)
+):
+    """Send one notification to many users (e.g. deadline reminders)."""
+    if current_user.role == Role.CLIENT_ADMIN:
+        # Client admins can only reach their own organization
+        if data.organization_id and str(data.organization_id) != str(current_user.organization_id):
+            raise HTTPException(status_code=403, detail="Cannot notify another organization")
+        data.organization_id = current_user.organization_id
+
+    if not (data.user_ids or data.organization_id or data.role or data.assessment_id):
+        raise HTTPException(status_code=400, detail="At least one recipient filter is required")
+
+    service = NotificationService(db)
+    count = await service.broadcast(data)
+    return {"created_count": count}
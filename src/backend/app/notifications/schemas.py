@@ -1,9 +1,11 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
 
+from src.backend.app.auth.models import Role
+
 class NotificationType(str, Enum):
     INFO = "info"
     SUCCESS = "success"
@@ -20,6 +22,18 @@ class NotificationBase(BaseModel):
 class NotificationCreate(NotificationBase):
     user_id: UUID
 
+class NotificationBroadcast(NotificationBase):
+    """
+    Send the same notification to an audience.
+
+    Criteria combine with AND, e.g. assessment_id + role=assessor notifies
+    the assessors taking part in that assessment. At least one is required.
+    """
+    user_ids: Optional[List[UUID]] = None
+    organization_id: Optional[UUID] = None
+    role: Optional[Role] = None
+    assessment_id: Optional[UUID] = None
+
 class NotificationUpdate(BaseModel):
     is_read: Optional[bool] = None
 
@@ -27,7 +41,24 @@ class NotificationResponse(NotificationBase):
     id: UUID
     user_id: UUID
     is_read: bool
+    coalesced_count: int = 1
     created_at: datetime
+    last_coalesced_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class DigestFrequency(str, Enum):
+    OFF = "off"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+class NotificationPreferenceResponse(BaseModel):
+    digest_frequency: DigestFrequency = DigestFrequency.OFF
+    last_digest_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class NotificationPreferenceUpdate(BaseModel):
+    digest_frequency: DigestFrequency
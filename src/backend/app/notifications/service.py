@@ -1,29 +1,189 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, desc, func
-from uuid import UUID
-from typing import List, Optional
+from sqlalchemy import select, update, insert, desc, union
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+from typing import Iterable, List, Optional
 
-from src.backend.app.notifications.models import Notification, NotificationType
-from src.backend.app.notifications.schemas import NotificationCreate
+from src.backend.config import settings
+from src.backend.app.auth.models import Role, User, UserDomainAssignment
+from src.backend.app.assessments.models import Assessment
+from src.backend.app.delegations.models import AssessmentDelegation, DelegationStatus
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.backend.app.notifications.models import (
+    DigestFrequency, Notification, NotificationPreference, NotificationType,
+)
+from src.backend.app.notifications.schemas import (
+    NotificationBase, NotificationBroadcast, NotificationCreate, NotificationResponse,
+)
+from src.backend.app.notifications.broker import notification_broker
+from src.backend.app.notifications.counters import UnreadCounter
+
+# Rows per INSERT statement (9 bind params each, well under asyncpg's 32767)
+BULK_INSERT_CHUNK_SIZE = 1000
 
 class NotificationService:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.unread_counter = UnreadCounter(session)
 
     async def create_notification(self, data: NotificationCreate) -> Notification:
+        merged = await self._coalesce(data)
+        if merged:
+            # Still one unread row, so the badge and pushed list are unchanged
+            await self.session.commit()
+            return merged
+
         notification = Notification(
             user_id=data.user_id,
             title=data.title,
             message=data.message,
             type=data.type,
             link=data.link,
-            is_read=False
+            is_read=False,
+            coalesced_count=1,
         )
         self.session.add(notification)
+        await self.unread_counter.increment([data.user_id])
         await self.session.commit()
         await self.session.refresh(notification)
+        await self.unread_counter.invalidate(notification.user_id)
+
+        # Push to connected clients only once the row is committed
+        await notification_broker.publish(
+            notification.user_id,
+            "notification",
+            NotificationResponse.model_validate(notification).model_dump(mode="json"),
+        )
         return notification
 
+    async def _coalesce(self, data: NotificationCreate) -> Optional[Notification]:
+        """
+        Merge into a recent unread notification with the same type and link.
+
+        The existing row takes the new title/message and counts the merged
+        events. created_at stays at the first occurrence, so the window is
+        bounded by it rather than sliding with every merge; the latest event
+        time goes to last_coalesced_at. Notifications without a link are
+        never merged.
+        """
+        window = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS
+        if not window or not data.link:
+            return None
+
+        now = datetime.utcnow()
+        target = (
+            select(Notification.id)
+            .where(
+                Notification.user_id == data.user_id,
+                Notification.is_read == False,
+                Notification.type == data.type,
+                Notification.link == data.link,
+                Notification.created_at >= now - timedelta(seconds=window)
+            )
+            .order_by(desc(Notification.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Notification)
+            .where(Notification.id == target)
+            .values(
+                title=data.title,
+                message=data.message,
+                coalesced_count=Notification.coalesced_count + 1,
+                last_coalesced_at=now,
+            )
+            .returning(Notification)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def create_many(self, user_ids: Iterable[UUID], data: NotificationBase) -> int:
+        """
+        Create the same notification for many users in one transaction.
+
+        Rows go out as multi-row INSERTs with client-side ids and a shared
+        timestamp, so nothing is refreshed afterwards; connected clients get
+        a single broker message. Returns the number of notifications created.
+        """
+        recipients = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        if not recipients:
+            return 0
+
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "title": data.title,
+                "message": data.message,
+                "type": data.type,
+                "link": data.link,
+                "is_read": False,
+                "coalesced_count": 1,
+                "created_at": created_at,
+            }
+            for user_id in recipients
+        ]
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            await self.session.execute(
+                insert(Notification).values(rows[start:start + BULK_INSERT_CHUNK_SIZE])
+            )
+        await self.unread_counter.increment(recipients)
+        await self.session.commit()
+
+        await self.unread_counter.invalidate_many(recipients)
+        # Ids differ per recipient; clients refetch their list on this event
+        payload = NotificationBase.model_validate(data).model_dump(mode="json")
+        payload.update(is_read=False, created_at=created_at.isoformat())
+        await notification_broker.publish_many(recipients, "notification", payload)
+        return len(rows)
+
+    async def broadcast(self, data: NotificationBroadcast) -> int:
+        """Notify every active user matching the broadcast criteria."""
+        recipients = await self.resolve_audience(
+            user_ids=data.user_ids,
+            organization_id=data.organization_id,
+            role=data.role,
+            assessment_id=data.assessment_id,
+        )
+        return await self.create_many(recipients, data)
+
+    async def resolve_audience(
+        self,
+        user_ids: Optional[List[UUID]] = None,
+        organization_id: Optional[UUID] = None,
+        role: Optional[Role] = None,
+        assessment_id: Optional[UUID] = None,
+    ) -> List[str]:
+        """Resolve broadcast criteria (ANDed) to active user ids in one query."""
+        stmt = select(User.id).where(User.is_active == True)
+
+        if user_ids is not None:
+            stmt = stmt.where(User.id.in_([str(u) for u in user_ids]))
+        if organization_id:
+            stmt = stmt.where(User.organization_id == str(organization_id))
+        if role:
+            stmt = stmt.where(User.role == role)
+        if assessment_id:
+            # Participants: domain assignees, active delegatees and the creator
+            participants = union(
+                select(UserDomainAssignment.user_id).where(
+                    UserDomainAssignment.assessment_id == str(assessment_id)
+                ),
+                select(AssessmentDelegation.user_id).where(
+                    AssessmentDelegation.assessment_id == assessment_id,
+                    AssessmentDelegation.status == DelegationStatus.ACTIVE
+                ),
+                select(Assessment.created_by).where(Assessment.id == assessment_id),
+            )
+            stmt = stmt.where(User.id.in_(participants))
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_user_notifications(
         self, 
         user_id: UUID, 
@@ -42,28 +202,32 @@ class NotificationService:
         return result.scalars().all()
 
     async def get_unread_count(self, user_id: UUID) -> int:
-        stmt = select(func.count()).where(
+        return await self.unread_counter.get(user_id)
+
+    async def mark_as_read(self, notification_id: UUID, user_id: UUID) -> Optional[Notification]:
+        # Conditional update so only an actual change moves the counter
+        stmt = update(Notification).where(
+            Notification.id == notification_id,
             Notification.user_id == user_id,
             Notification.is_read == False
-        )
+        ).values(is_read=True)
         result = await self.session.execute(stmt)
-        return result.scalar() or 0
+        if result.rowcount:
+            await self.unread_counter.decrement(user_id)
+        await self.session.commit()
+
+        if result.rowcount:
+            await self.unread_counter.invalidate(user_id)
+            # Keeps the user's other tabs/devices in sync
+            await notification_broker.publish(user_id, "read", {"ids": [str(notification_id)]})
 
-    async def mark_as_read(self, notification_id: UUID, user_id: UUID) -> Optional[Notification]:
         # ensure user owns the notification
         stmt = select(Notification).where(
             Notification.id == notification_id, 
             Notification.user_id == user_id
         )
         result = await self.session.execute(stmt)
-        notification = result.scalar_one_or_none()
-        
-        if notification:
-            notification.is_read = True
-            await self.session.commit()
-            await self.session.refresh(notification)
-            
-        return notification
+        return result.scalar_one_or_none()
 
     async def mark_all_as_read(self, user_id: UUID) -> int:
         stmt = update(Notification).where(
@@ -72,5 +236,28 @@ class NotificationService:
         ).values(is_read=True)
         
         result = await self.session.execute(stmt)
+        if result.rowcount:
+            await self.unread_counter.decrement(user_id, result.rowcount)
         await self.session.commit()
+        await self.unread_counter.invalidate(user_id)
+        if result.rowcount:
+            await notification_broker.publish(user_id, "read", {"all": True})
         return result.rowcount
+
+    async def get_preferences(self, user_id: UUID) -> Optional[NotificationPreference]:
+        return await self.session.get(NotificationPreference, user_id)
+
+    async def set_digest_frequency(self, user_id: UUID, frequency: DigestFrequency) -> NotificationPreference:
+        # First digest only covers notifications created after opting in
+        stmt = pg_insert(NotificationPreference).values(
+            user_id=user_id,
+            digest_frequency=frequency.value,
+            last_digest_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        ).on_conflict_do_update(
+            index_elements=[NotificationPreference.user_id],
+            set_={"digest_frequency": frequency.value, "updated_at": datetime.utcnow()},
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+        return await self.session.get(NotificationPreference, user_id, populate_existing=True)
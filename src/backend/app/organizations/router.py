@@ -2,6 +2,7 @@ from typing import List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.database import get_db
@@ -9,6 +10,8 @@ from src.backend.app.auth.dependencies import get_current_user
 from src.backend.app.auth.models import User, Role
 from src.backend.app.organizations.schemas import OrganizationCreate, OrganizationResponse, OrganizationUpdate
 from src.backend.app.organizations.service import OrganizationService
+from src.backend.app.assessments.evidence_service import EvidenceService
+from src.backend.app.assessments.evidence_export import EvidenceArchiveStreamer
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
@@ -54,6 +57,29 @@ async def get_organization(
     service = OrganizationService(db)
     return await service.get_organization(org_id)
 
+@router.get("/{org_id}/evidence/export")
+async def export_organization_evidence(
+    org_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    # Super Admin or Client Admin of THAT org
+    if current_user.role != Role.SUPER_ADMIN and (
+        current_user.role != Role.CLIENT_ADMIN or current_user.organization_id != str(org_id)
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    service = OrganizationService(db)
+    await service.get_organization(org_id)
+
+    evidence_service = EvidenceService(db)
+    entries = evidence_service.iter_organization_evidence(org_id)
+    return StreamingResponse(
+        EvidenceArchiveStreamer().stream(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=evidence_org_{org_id}.zip"}
+    )
+
 @router.put("/{org_id}", response_model=OrganizationResponse)
 async def update_organization(
     org_id: UUID,
@@ -1,6 +1,6 @@
 from io import BytesIO
-from jinja2 import Environment, FileSystemLoader
 from src.backend.app.reports.schemas import AssessmentReportData
+from src.backend.app.common.templates import template_registry
 import os
 
 # Optional weasyprint import - only needed for PDF generation
@@ -15,14 +15,18 @@ except (ImportError, OSError) as e:
     logger = logging.getLogger(__name__)
     logger.warning(f"WeasyPrint not available: {e}. PDF generation will be disabled.")
 
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+template_registry.register("reports", TEMPLATE_DIR)
+
 class PDFGenerator:
-    def __init__(self, template_dir: str):
+    def __init__(self):
         if not WEASYPRINT_AVAILABLE:
             raise RuntimeError(
                 "WeasyPrint is not installed or system dependencies are missing. "
                 "PDF generation is unavailable. Install GTK+ libraries for Windows."
             )
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        # Shared, precompiled environment - no per-request parsing
+        self.env = template_registry.environment("reports")
 
     def generate_report(self, data: AssessmentReportData) -> bytes:
         if not WEASYPRINT_AVAILABLE:
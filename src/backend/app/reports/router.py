@@ -10,7 +10,6 @@ from src.backend.database import get_db
 from src.backend.app.reports.service import ReportingService
 # Correct import assuming generator.py is in the same package
 from src.backend.app.reports.generator import PDFGenerator
-import os
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -35,8 +34,7 @@ async def download_assessment_report(
         raise HTTPException(status_code=404, detail=str(e))
         
     # Generate PDF
-    template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
-    generator = PDFGenerator(template_dir)
+    generator = PDFGenerator()
     pdf_bytes = generator.generate_report(report_data)
     
     # Return as stream
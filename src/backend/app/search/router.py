@@ -0,0 +1,42 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.database import get_db
+from src.backend.app.auth.dependencies import get_current_user
+from src.backend.app.auth.models import Role, User
+from src.backend.app.common.schemas import PaginatedResponse
+from src.backend.app.search.schemas import SearchResult, SearchSource
+from src.backend.app.search.service import SearchService
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=PaginatedResponse[SearchResult])
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Search terms (websearch syntax)"),
+    organization_id: Optional[UUID] = Query(None),
+    sources: Optional[List[SearchSource]] = Query(None, description="Limit to these result types"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    if (
+        organization_id is not None
+        and current_user.role in (Role.CLIENT_ADMIN, Role.ASSESSOR)
+        and str(organization_id) != str(current_user.organization_id)
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    service = SearchService(db)
+    items, total = await service.search(
+        q,
+        current_user,
+        organization_id=str(organization_id) if organization_id else None,
+        sources=sources,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    return PaginatedResponse[SearchResult].create(items, total, page, page_size)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class SearchSource(str, Enum):
+    COMMENT = "comment"
+    RESPONSE = "response"
+    EVIDENCE = "evidence"
+
+
+class SearchResult(BaseModel):
+    source: SearchSource
+    id: UUID
+    response_id: UUID
+    assessment_id: UUID
+    organization_id: UUID
+    domain_id: int
+    element_id: int
+    rank: float
+    snippet: str
+    created_at: datetime
@@ -0,0 +1,243 @@
+"""
+Full-Text Search
+
+Ranked search over comments, element response notes and evidence text.
+
+Features:
+- Matches against stored tsvector columns (english + arabic configurations)
+  through their GIN indexes; nothing is re-tokenized at query time
+- websearch syntax ("quoted phrases", -exclusions, OR)
+- Tenant scoped: results are limited to the caller's organizations, and
+  assessors to the assessments they created or the domains delegated to them
+- Ranked and paginated in SQL; snippets are only built for the returned page
+- Snippets are HTML-escaped before highlighting, so <mark> is their only
+  markup, and use the configuration that matched the row
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, and_, case, cast, exists, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.app.auth.models import AnalystOrgAssignment, Role, User
+from src.backend.app.assessments.models import (
+    Assessment,
+    AssessmentDomain,
+    AssessmentElementResponse,
+    Evidence,
+)
+from src.backend.app.comments.models import Comment
+from src.backend.app.delegations.models import AssessmentDelegation, DelegationStatus
+from src.backend.app.search.schemas import SearchResult, SearchSource
+
+SEARCH_CONFIGS = ("english", "arabic")
+
+HEADLINE_OPTIONS = "MaxWords=35, MinWords=15, MaxFragments=2, StartSel=<mark>, StopSel=</mark>"
+
+
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+
+def build_tsquery(text: str):
+    """OR of the query parsed under each configuration, matching either index half."""
+    queries = [func.websearch_to_tsquery(config, text) for config in SEARCH_CONFIGS]
+    combined = queries[0]
+    for query in queries[1:]:
+        combined = combined.op("||")(query)
+    return combined
+
+
+def matched_config(vector, text: str):
+    """First configuration whose parse of the query matches the row."""
+    return case(
+        *[
+            (vector.op("@@")(func.websearch_to_tsquery(config, text)), literal(config))
+            for config in SEARCH_CONFIGS[:-1]
+        ],
+        else_=literal(SEARCH_CONFIGS[-1]),
+    )
+
+
+def escape_html(body):
+    """Escape user text in SQL so ts_headline's <mark> tags are the only markup."""
+    for char, entity in HTML_ESCAPES:
+        body = func.replace(body, char, entity)
+    return body
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(
+        self,
+        text: str,
+        user: User,
+        organization_id: Optional[str] = None,
+        sources: Optional[Sequence[SearchSource]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[SearchResult], int]:
+        """
+        Search within the organizations visible to `user`.
+
+        Returns the requested page, best matches first, and the total match count.
+        """
+        stmt = self.build_query(text, user, organization_id, sources, limit, offset)
+        rows = (await self.session.execute(stmt)).all()
+        total = rows[0].total if rows else 0
+        if not rows and offset:
+            # Past the last page: still report the total
+            total = await self._count(text, user, organization_id, sources)
+        return [self._to_result(row) for row in rows], total
+
+    def build_query(
+        self,
+        text: str,
+        user: User,
+        organization_id: Optional[str] = None,
+        sources: Optional[Sequence[SearchSource]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Select:
+        tsquery = build_tsquery(text)
+        matches = self._matches(text, user, organization_id, sources).subquery("matches")
+
+        page = (
+            select(matches, func.count().over().label("total"))
+            .order_by(matches.c.rank.desc(), matches.c.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        return (
+            select(
+                page.c.source,
+                page.c.id,
+                page.c.response_id,
+                page.c.assessment_id,
+                page.c.organization_id,
+                page.c.domain_id,
+                page.c.element_id,
+                page.c.rank,
+                page.c.created_at,
+                page.c.total,
+                func.ts_headline(
+                    cast(page.c.config, REGCONFIG), escape_html(page.c.body), tsquery, HEADLINE_OPTIONS,
+                ).label("snippet"),
+            )
+            .order_by(page.c.rank.desc(), page.c.created_at.desc())
+        )
+
+    async def _count(self, text, user, organization_id, sources) -> int:
+        matches = self._matches(text, user, organization_id, sources).subquery()
+        return await self.session.scalar(select(func.count()).select_from(matches)) or 0
+
+    def _matches(self, text: str, user: User, organization_id: Optional[str], sources):
+        tsquery = build_tsquery(text)
+        sources = set(sources or SearchSource)
+        selects = []
+        if SearchSource.COMMENT in sources:
+            selects.append(self._source_select(
+                SearchSource.COMMENT, Comment, Comment.response_id, Comment.content, tsquery, text,
+            ))
+        if SearchSource.RESPONSE in sources:
+            selects.append(self._source_select(
+                SearchSource.RESPONSE,
+                AssessmentElementResponse,
+                AssessmentElementResponse.id,
+                AssessmentElementResponse.comment,
+                tsquery,
+                text,
+                created_at=AssessmentElementResponse.updated_at,
+            ))
+        if SearchSource.EVIDENCE in sources:
+            selects.append(self._source_select(
+                SearchSource.EVIDENCE,
+                Evidence,
+                Evidence.response_id,
+                func.left(func.coalesce(Evidence.extracted_text, ""), 100000),
+                tsquery,
+                text,
+                file_name=Evidence.file_name,
+            ))
+
+        scope = self._scope(user, organization_id)
+        selects = [s.where(scope) if scope is not None else s for s in selects]
+        return selects[0] if len(selects) == 1 else union_all(*selects)
+
+    def _source_select(self, source, model, response_id, body, tsquery, text, created_at=None, file_name=None):
+        if file_name is not None:
+            # Lead evidence snippets with the file name
+            body = file_name.op("||")(literal(": ")).op("||")(body)
+        vector = model.search_vector
+        stmt = (
+            select(
+                literal(source.value).label("source"),
+                model.id.label("id"),
+                response_id.label("response_id"),
+                Assessment.id.label("assessment_id"),
+                Assessment.organization_id.label("organization_id"),
+                AssessmentDomain.domain_id.label("domain_id"),
+                AssessmentElementResponse.element_id.label("element_id"),
+                func.ts_rank_cd(vector, tsquery).label("rank"),
+                (created_at if created_at is not None else model.created_at).label("created_at"),
+                body.label("body"),
+                matched_config(vector, text).label("config"),
+            )
+            .select_from(model)
+            .where(vector.op("@@")(tsquery))
+        )
+        if model is not AssessmentElementResponse:
+            stmt = stmt.join(AssessmentElementResponse, AssessmentElementResponse.id == response_id)
+        return (
+            stmt
+            .join(AssessmentDomain, AssessmentDomain.id == AssessmentElementResponse.domain_record_id)
+            .join(Assessment, Assessment.id == AssessmentDomain.assessment_id)
+        )
+
+    def _scope(self, user: User, organization_id: Optional[str]):
+        """
+        Visibility filter for the caller; None means unrestricted (super admin, no filter).
+
+        Assessors see what AssessmentService.check_access allows: assessments
+        they created, and domains delegated to them (or whole assessments).
+        """
+        conditions = []
+        if organization_id is not None:
+            conditions.append(Assessment.organization_id == organization_id)
+        if user.role == Role.ANALYST:
+            assigned = select(AnalystOrgAssignment.organization_id).where(
+                AnalystOrgAssignment.user_id == user.id
+            )
+            conditions.append(Assessment.organization_id.in_(assigned.scalar_subquery()))
+        elif user.role != Role.SUPER_ADMIN:
+            conditions.append(Assessment.organization_id == user.organization_id)
+        if user.role == Role.ASSESSOR:
+            delegated = exists().where(
+                AssessmentDelegation.assessment_id == Assessment.id,
+                AssessmentDelegation.user_id == user.id,
+                AssessmentDelegation.status == DelegationStatus.ACTIVE,
+                or_(
+                    AssessmentDelegation.domain_id == AssessmentDomain.id,
+                    AssessmentDelegation.domain_id.is_(None),
+                ),
+            )
+            conditions.append(or_(Assessment.created_by == user.id, delegated))
+
+        return and_(*conditions) if conditions else None
+
+    @staticmethod
+    def _to_result(row) -> SearchResult:
+        return SearchResult(
+            source=row.source,
+            id=row.id,
+            response_id=row.response_id,
+            assessment_id=row.assessment_id,
+            organization_id=row.organization_id,
+            domain_id=row.domain_id,
+            element_id=row.element_id,
+            rank=row.rank,
+            snippet=row.snippet or "",
+            created_at=row.created_at,
+        )
@@ -4,7 +4,7 @@ Nudj Application Configuration
 TASK-003: Pydantic Settings for all application configuration.
 
 Loads from environment variables with .env file support.
-Sections: Database, Redis, JWT, Session, Email, SMS, Security, App.
+Sections: Database, Redis, JWT, Session, Email, Evidence, SMS, Security, App.
 """
 from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     ENVIRONMENT: str = "development"  # development, staging, production
+    FRONTEND_URL: str = "http://localhost:5173"  # Used for links in emails
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None  # Persist compiled Jinja templates
 
     # ==========================================================================
     # Database (PostgreSQL with asyncpg)
@@ -41,6 +43,7 @@ class Settings(BaseSettings):
     # ==========================================================================
     # Redis
     # ==========================================================================
+    REDIS_ENABLED: bool = False  # Multi-worker fan-out and shared caches
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_PASSWORD: Optional[str] = None
 
@@ -48,9 +51,18 @@ class Settings(BaseSettings):
     # JWT Authentication
     # ==========================================================================
     JWT_SECRET_KEY: str = "CHANGE_ME_IN_PRODUCTION_USE_SECURE_RANDOM_STRING"
-    JWT_ALGORITHM: str = "HS256"  # HS256 for POC, RS256 for production
+    JWT_ALGORITHM: str = "HS256"  # HS256 (shared secret), or RS256/EdDSA with rotated keys
+    # RS256/EdDSA keys (jwt_signing_keys), published at /api/auth/.well-known/jwks.json
+    JWT_KEY_ROTATION_DAYS: int = 30
+    JWT_KEY_PUBLISH_AHEAD_MINUTES: int = 30  # New keys are in JWKS this long before signing
+    JWT_KEY_REFRESH_SECONDS: int = 60  # Workers reload the key set (also JWKS max-age)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Revoked access tokens (jti denylist in Redis, or revoked_access_tokens without
+    # it); each worker keeps a Bloom filter of it
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 5
+    TOKEN_REVOCATION_FILTER_CAPACITY: int = 10_000
+    TOKEN_REVOCATION_FILTER_ERROR_RATE: float = 0.001
 
     # ==========================================================================
     # Session Management
@@ -58,6 +70,9 @@ class Settings(BaseSettings):
     SESSION_TIMEOUT_MINUTES: int = 30  # Inactivity timeout
     SESSION_TIMEOUT_MIN: int = 15  # Minimum allowed
     SESSION_TIMEOUT_MAX: int = 120  # Maximum allowed
+    # Activity is tracked in Redis/in-process and written to user_sessions in batches
+    SESSION_ACTIVITY_FLUSH_SECONDS: int = 30
+    SESSION_ACTIVITY_RESOLUTION_SECONDS: int = 15  # Closer requests are not re-recorded
 
     # ==========================================================================
     # Password Policy
@@ -97,6 +112,80 @@ class Settings(BaseSettings):
     EMAIL_HOST_USER: Optional[str] = None
     EMAIL_HOST_PASSWORD: Optional[str] = None
 
+    # Outbox delivery worker
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_RATE_PER_SECOND: float = 10.0  # Provider send limit
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_RETRY_SECONDS: float = 60.0  # Doubles per attempt
+
+    # ==========================================================================
+    # Notifications
+    # ==========================================================================
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: int = 15
+    NOTIFICATION_STREAM_TICKET_SECONDS: int = 60  # Lifetime of the ?ticket= used to open the stream
+    # Cached unread counters (Redis only) are re-read from notification_unread_counts after this long
+    NOTIFICATION_UNREAD_COUNT_TTL_SECONDS: int = 60
+    # Unread notifications with the same type/link are merged within this window (0 = off)
+    NOTIFICATION_COALESCE_WINDOW_SECONDS: int = 300
+    NOTIFICATION_DIGEST_CHECK_SECONDS: int = 300  # How often due digests are looked for
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = 20  # Listed per email; the rest are counted
+    # Retention (0 = keep forever)
+    NOTIFICATION_RETENTION_READ_DAYS: int = 90
+    NOTIFICATION_RETENTION_UNREAD_DAYS: int = 365
+    NOTIFICATION_PURGE_BATCH_SIZE: int = 1000  # Rows deleted per transaction
+    NOTIFICATION_PURGE_INTERVAL_SECONDS: int = 3600
+    NOTIFICATION_PARTITIONS_AHEAD_MONTHS: int = 2  # Monthly partitions created ahead
+
+    # ==========================================================================
+    # Scheduler (in-process periodic jobs, see common/scheduler.py)
+    # ==========================================================================
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SECONDS: float = 5.0
+    SCHEDULER_LOCK_KEY: int = 724_301  # pg advisory lock held by the leader worker
+    SCHEDULER_JOB_RUN_RETENTION_DAYS: int = 30
+    # Expired auth rows (sessions, refresh/reset tokens, invitations)
+    AUTH_CLEANUP_INTERVAL_SECONDS: int = 3600
+    AUTH_CLEANUP_BATCH_SIZE: int = 1000  # Rows deleted per transaction
+    INVITATION_RETENTION_DAYS: int = 30  # Kept this long after expiry for admins
+
+    # ==========================================================================
+    # Audit Log (batched background writer, see common/audit_writer.py)
+    # ==========================================================================
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500  # Rows per multi-row INSERT
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # How long a caller waits on a full queue before its entry is spilled to disk
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.5
+    AUDIT_SPILL_DIR: str = "audit_spill"  # Replayed on startup
+    # Partitions past retention are detached (kept as standalone tables for
+    # archiving) unless AUDIT_DROP_EXPIRED_PARTITIONS is set
+    AUDIT_RETENTION_DAYS: int = 1826  # 5 years
+    AUDIT_DROP_EXPIRED_PARTITIONS: bool = False
+    AUDIT_PARTITIONS_AHEAD_MONTHS: int = 2
+    AUDIT_MAINTENANCE_INTERVAL_SECONDS: int = 300  # Rollup refresh + partition upkeep
+    AUDIT_ROLLUP_LOOKBACK_HOURS: int = 2  # Recent hours rebuilt each run (late writes)
+
+    # ==========================================================================
+    # Evidence Processing (background sniffing, text extraction, thumbnails)
+    # ==========================================================================
+    EVIDENCE_PROCESSING_WORKERS: int = 2
+    EVIDENCE_PROCESSING_MAX_ATTEMPTS: int = 3
+    EVIDENCE_PROCESSING_RETRY_SECONDS: float = 30.0  # Doubles per attempt
+    EVIDENCE_THUMBNAIL_SIZE: int = 256  # Max width/height in pixels
+    # A PROCESSING row claimed longer ago than this is assumed orphaned
+    EVIDENCE_PROCESSING_STALE_MINUTES: int = 15
+    EVIDENCE_MAX_DECOMPRESSED_BYTES: int = 50 * 1024 * 1024  # DOCX parts / PDF streams
+
+    # ==========================================================================
+    # User Import (CSV/XLSX onboarding from HR system exports)
+    # ==========================================================================
+    USER_IMPORT_DIR: str = "uploads/imports"  # Scratch copies of uploads being imported
+    USER_IMPORT_MAX_BYTES: int = 20 * 1024 * 1024  # 20MB
+    USER_IMPORT_CHUNK_SIZE: int = 500  # Rows validated and written per transaction
+    # A running job without progress for this long is assumed orphaned and resumed
+    USER_IMPORT_STALE_MINUTES: int = 10
+
     # ==========================================================================
     # SMS Service (Saudi OTP)
     # ==========================================================================
@@ -111,6 +200,11 @@ class Settings(BaseSettings):
     # ==========================================================================
     MFA_ISSUER_NAME: str = "Nudj HR Platform"
     MFA_MANDATORY_ROLES: List[str] = ["super_admin", "analyst"]
+    MFA_TOTP_VALID_WINDOW: int = 1  # Accepted steps either side of the current one
+    MFA_BACKUP_CODE_COUNT: int = 10
+    # Failed codes per user before verification is refused for the window
+    MFA_MAX_ATTEMPTS: int = 5
+    MFA_ATTEMPT_WINDOW_SECONDS: int = 300
 
     # ==========================================================================
     # Security Headers & CORS
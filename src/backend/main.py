@@ -27,6 +27,54 @@ from src.backend.app.notifications.router import router as notifications_router
 from src.backend.app.comments.router import router as comments_router
 from src.backend.app.delegations.router import router as delegations_router
 from src.backend.app.framework.router import router as framework_router
+from src.backend.app.search.router import router as search_router
+from src.backend.app.assessments.evidence_processing import evidence_processor, resume_evidence_processing
+from src.backend.app.admin.user_import import resume_user_imports, user_import_worker
+from src.backend.app.notifications.broker import notification_broker
+from src.backend.app.notifications.email_outbox import email_outbox_worker
+from src.backend.app.notifications.digest import run_notification_digests
+from src.backend.app.notifications.retention import run_notification_retention
+from src.backend.app.common.scheduler import prune_job_runs, scheduler
+from src.backend.app.common.audit_writer import audit_writer
+from src.backend.app.common.audit_maintenance import run_audit_maintenance
+from src.backend.app.auth.session_service import flush_session_activity
+from src.backend.app.auth.cleanup import run_auth_cleanup
+from src.backend.app.auth.revocation import revocation_list, sync_revocations
+from src.backend.app.auth.signing_keys import (
+    ASYMMETRIC_ALGORITHMS,
+    init_signing_keys,
+    refresh_signing_keys,
+    run_key_rotation,
+)
+from src.backend.app.common.redis_client import close_redis
+from src.backend.app.common.templates import template_registry
+
+
+# Periodic jobs (leader-only unless every worker must run them)
+scheduler.add_job("notification-digest", settings.NOTIFICATION_DIGEST_CHECK_SECONDS, run_notification_digests)
+scheduler.add_job("notification-retention", settings.NOTIFICATION_PURGE_INTERVAL_SECONDS, run_notification_retention)
+scheduler.add_job("audit-maintenance", settings.AUDIT_MAINTENANCE_INTERVAL_SECONDS, run_audit_maintenance)
+scheduler.add_job("auth-cleanup", settings.AUTH_CLEANUP_INTERVAL_SECONDS, run_auth_cleanup)
+scheduler.add_job("job-run-retention", 86400, prune_job_runs)
+scheduler.add_job(
+    "evidence-processing-resume", settings.EVIDENCE_PROCESSING_STALE_MINUTES * 60, resume_evidence_processing,
+)
+scheduler.add_job("user-import-resume", settings.USER_IMPORT_STALE_MINUTES * 60, resume_user_imports)
+# In-process trackers hold per-worker activity, so every worker flushes its own
+scheduler.add_job(
+    "session-activity-flush", settings.SESSION_ACTIVITY_FLUSH_SECONDS, flush_session_activity,
+    leader_only=False, record=False,
+)
+scheduler.add_job(
+    "token-revocation-sync", settings.TOKEN_REVOCATION_SYNC_SECONDS, sync_revocations,
+    leader_only=False, record=False,
+)
+if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS:
+    scheduler.add_job("jwt-key-rotation", 3600, run_key_rotation)
+    scheduler.add_job(
+        "jwt-key-refresh", settings.JWT_KEY_REFRESH_SECONDS, refresh_signing_keys,
+        leader_only=False, record=False,
+    )
 
 
 # Configure logging
@@ -56,11 +104,44 @@ async def lifespan(app: FastAPI):
             from src.backend.app.delegations import models as delegations_models
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
+
+    # Compile email/report templates once instead of on first use
+    template_registry.precompile()
+
+    # Tokens cannot be issued or verified without the signing key set
+    if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS:
+        await init_signing_keys()
+
+    # Load the revoked-token filter; until it loads every check hits the store
+    try:
+        await revocation_list.sync()
+    except Exception:
+        logger.exception("Initial token revocation sync failed")
+
+    # Background workers
+    await audit_writer.start()
+    await evidence_processor.start()
+    await user_import_worker.start()
+    await notification_broker.start()
+    await email_outbox_worker.start()
+    if settings.SCHEDULER_ENABLED:
+        await scheduler.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Nudj Platform API...")
+    await evidence_processor.stop()
+    await user_import_worker.stop()
+    await notification_broker.stop()
+    await email_outbox_worker.stop()
+    await scheduler.stop()
+    try:
+        await flush_session_activity()
+    except Exception:
+        logger.exception("Final session activity flush failed")
+    await audit_writer.stop()
+    await close_redis()
 
 
 # Create FastAPI application
@@ -104,6 +185,7 @@ app.include_router(notifications_router, prefix="/api")
 app.include_router(comments_router, prefix="/api")
 app.include_router(delegations_router, prefix="/api")
 app.include_router(framework_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
 
 
 # Health check endpoint
@@ -1,3 +1,4 @@
+import { useEffect } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { api } from '@/lib/api';
 import { Notification } from '@/features/notifications/types/notification.types';
@@ -17,7 +18,7 @@ export function useNotifications(limit = 20) {
             });
             return data;
         },
-        refetchInterval: 30000, // Poll every 30s
+        // Kept fresh by useNotificationStream instead of polling
     });
 }
 
@@ -28,10 +29,59 @@ export function useUnreadCount() {
             const { data } = await api.get<{ count: number }>('/notifications/unread-count');
             return data.count;
         },
-        refetchInterval: 30000, // Poll every 30s
+        // Kept fresh by useNotificationStream instead of polling
     });
 }
 
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || '/api';
+
+/**
+ * Subscribe to the server-sent notification stream and refresh the
+ * notification queries when something changes.
+ */
+export function useNotificationStream() {
+    const queryClient = useQueryClient();
+
+    useEffect(() => {
+        if (!localStorage.getItem('accessToken')) return;
+
+        let source: EventSource | undefined;
+        let retry: ReturnType<typeof setTimeout> | undefined;
+        let closed = false;
+        const refresh = () => queryClient.invalidateQueries({ queryKey: notificationKeys.all });
+
+        const connect = async () => {
+            // EventSource cannot send an Authorization header, so the URL
+            // carries a short-lived stream ticket instead of the access token
+            const { data } = await api.post<{ ticket: string }>('/notifications/stream-ticket');
+            if (closed) return;
+            source = new EventSource(
+                `${API_BASE_URL}/notifications/stream?ticket=${encodeURIComponent(data.ticket)}`
+            );
+            source.addEventListener('notification', refresh);
+            source.addEventListener('read', refresh);
+            // Catch up on anything missed while disconnected
+            source.addEventListener('open', refresh);
+            // The ticket has expired by the time EventSource retries, so
+            // reconnect with a fresh one
+            source.addEventListener('error', () => {
+                source?.close();
+                scheduleReconnect();
+            });
+        };
+        const scheduleReconnect = () => {
+            if (!closed) retry = setTimeout(() => connect().catch(scheduleReconnect), 5000);
+        };
+        connect().catch(scheduleReconnect);
+
+        return () => {
+            closed = true;
+            clearTimeout(retry);
+            source?.close();
+        };
+    }, [queryClient]);
+}
+
 export function useMarkAsRead() {
     const queryClient = useQueryClient();
 
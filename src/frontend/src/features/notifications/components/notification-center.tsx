@@ -1,7 +1,7 @@
 import { Bell } from "lucide-react";
 import { useState } from "react";
 import { formatDistanceToNow } from "date-fns";
-import { useNotifications, useUnreadCount, useMarkAsRead, useMarkAllAsRead } from "@/features/notifications/api/notifications.api";
+import { useNotifications, useUnreadCount, useMarkAsRead, useMarkAllAsRead, useNotificationStream } from "@/features/notifications/api/notifications.api";
 import { Button } from "@/components/ui/button";
 import {
   Popover,
@@ -13,6 +13,7 @@ import { cn } from "@/lib/utils";
 
 export function NotificationCenter() {
   const [open, setOpen] = useState(false);
+  useNotificationStream();
   const { data: notifications, isLoading } = useNotifications();
   const { data: unreadCount = 0 } = useUnreadCount();
   const markAsRead = useMarkAsRead();
@@ -0,0 +1,15 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: timing micro-benchmarks, run only with -m benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks are slow and timing-sensitive; keep them out of the default run
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark (run with -m benchmark)")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,85 @@
+import csv
+import gzip
+from datetime import datetime
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.backend.app.common.audit_service import AuditService, EXPORT_HEADER, gzip_chunks
+from src.backend.app.common.models import AuditEventType
+
+
+def _row(n):
+    return SimpleNamespace(
+        created_at=datetime(2026, 10, 1, 12, n),
+        event_type=AuditEventType.LOGIN_FAILED,
+        user_id=None,
+        email=f"user{n}@example.com",
+        ip_address="10.0.0.1",
+        user_agent=None,
+        organization_id=None,
+        details={"reason": "invalid_credentials"},
+    )
+
+
+def _streaming_session(partitions):
+    async def _partitions():
+        for partition in partitions:
+            yield partition
+
+    result = MagicMock()
+    result.partitions = _partitions
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=result)
+    session.execute = AsyncMock()
+    return session
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_streams_one_chunk_per_cursor_batch():
+    # Arrange
+    session = _streaming_session([[_row(1), _row(2)], [_row(3)]])
+
+    # Act
+    chunks = await _collect(AuditService(session).iter_csv(fetch_size=2))
+
+    # Assert
+    assert len(chunks) == 3  # header + two batches
+    rows = list(csv.reader(StringIO("".join(chunks))))
+    assert rows[0] == EXPORT_HEADER
+    assert [r[3] for r in rows[1:]] == ["user1@example.com", "user2@example.com", "user3@example.com"]
+    session.execute.assert_not_awaited()  # no count query
+
+
+@pytest.mark.asyncio
+async def test_iter_csv_uses_server_side_cursor_without_limit():
+    # Arrange
+    session = _streaming_session([])
+
+    # Act
+    await _collect(AuditService(session).iter_csv(organization_id="org-1", fetch_size=500))
+
+    # Assert
+    stmt = session.stream.await_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 500
+    assert stmt._limit_clause is None
+
+
+@pytest.mark.asyncio
+async def test_gzip_chunks_round_trips():
+    # Arrange
+    async def chunks():
+        yield "a,b\n"
+        yield "1,2\n"
+
+    # Act
+    data = b"".join(await _collect(gzip_chunks(chunks())))
+
+    # Assert
+    assert gzip.decompress(data).decode() == "a,b\n1,2\n"
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.backend.app.common import audit_maintenance, partitions
+from src.backend.app.common.audit_maintenance import AuditMaintenanceService
+from src.backend.app.common.audit_service import AuditService
+from src.backend.app.common.models import AuditEventType
+
+NOW = datetime(2026, 10, 19, 14, 25, tzinfo=timezone.utc)
+
+
+def _session(scalars=(), results=()):
+    session = MagicMock()
+    session.scalar = AsyncMock(side_effect=list(scalars))
+    session.execute = AsyncMock(side_effect=list(results) or None)
+    session.commit = AsyncMock()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_are_detached_but_kept_by_default():
+    # Arrange
+    session = _session()
+    detach = AsyncMock()
+    with patch.object(partitions, "is_partitioned", new=AsyncMock(return_value=True)), \
+         patch.object(partitions, "ensure_monthly_partitions", new=AsyncMock(return_value=[])) as ensure, \
+         patch.object(partitions, "partitions_before", new=AsyncMock(return_value=["audit_logs_p202101"])), \
+         patch.object(partitions, "detach_partition", new=detach):
+        # Act
+        detached = await AuditMaintenanceService(session).maintain_partitions(NOW)
+
+    # Assert
+    assert detached == ["audit_logs_p202101"]
+    ensure.assert_awaited_once()
+    detach.assert_awaited_once_with(session, "audit_logs", "audit_logs_p202101", drop=False)
+
+
+@pytest.mark.asyncio
+async def test_rollup_rebuilds_recent_completed_hours():
+    # Arrange
+    latest = datetime(2026, 10, 19, 13, tzinfo=timezone.utc)
+    session = _session(scalars=[latest])
+
+    # Act
+    await AuditMaintenanceService(session).refresh_rollup(NOW)
+
+    # Assert
+    delete_stmt, insert_stmt = (c.args[0] for c in session.execute.await_args_list[:2])
+    params = delete_stmt.compile(dialect=postgresql.dialect()).params
+    lookback = timedelta(hours=audit_maintenance.settings.AUDIT_ROLLUP_LOOKBACK_HOURS)
+    assert params["hour_1"] == datetime(2026, 10, 19, 14, tzinfo=timezone.utc) - lookback
+    assert params["hour_2"] == datetime(2026, 10, 19, 14, tzinfo=timezone.utc)
+    assert "date_trunc" in str(insert_stmt.compile(dialect=postgresql.dialect()))
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rollup_is_skipped_when_there_are_no_logs():
+    # Arrange
+    session = _session(scalars=[None, None])
+
+    # Act
+    written = await AuditMaintenanceService(session).refresh_rollup(NOW)
+
+    # Assert
+    assert written == 0
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_security_stats_add_raw_tail_to_rollup():
+    # Arrange
+    latest = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    rollup = MagicMock(all=MagicMock(return_value=[(AuditEventType.LOGIN_FAILED, 40)]))
+    raw = MagicMock(all=MagicMock(return_value=[(AuditEventType.LOGIN_FAILED, 2), (AuditEventType.ACCOUNT_LOCKED, 1)]))
+    session = _session(scalars=[latest], results=[rollup, raw])
+
+    # Act
+    stats = await AuditService(session).get_security_stats(hours=24)
+
+    # Assert
+    assert stats["failed_logins"] == 42
+    assert stats["account_lockouts"] == 1
+    raw_stmt = session.execute.await_args_list[1].args[0]
+    assert raw_stmt.compile(dialect=postgresql.dialect()).params["created_at_1"] == latest + timedelta(hours=1)
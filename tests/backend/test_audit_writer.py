@@ -0,0 +1,157 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.backend.app.common.audit_service import AuditService
+from src.backend.app.common.audit_writer import AuditWriter, build_entry
+from src.backend.app.common.models import AuditEventType
+
+
+def _entry(**kwargs):
+    return build_entry(event_type=AuditEventType.LOGIN_SUCCESS, ip_address="10.0.0.1", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_log_enqueues_without_touching_session():
+    # Arrange
+    session = MagicMock()
+    session.flush = AsyncMock()
+    writer = AuditWriter(max_queue_size=10, spill_dir="unused")
+
+    # Act
+    log = await AuditService(session, writer=writer).log_login_success(
+        user_id=None, email="a@example.com", ip_address="10.0.0.1"
+    )
+
+    # Assert
+    assert writer.queue.qsize() == 1
+    assert log.email == "a@example.com"
+    session.add.assert_not_called()
+    session.flush.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_spills_after_backpressure_timeout(tmp_path):
+    # Arrange
+    writer = AuditWriter(max_queue_size=1, enqueue_timeout=0.01, spill_dir=str(tmp_path))
+    await writer.submit(_entry(email="first@example.com"))
+
+    # Act
+    await writer.submit(_entry(email="second@example.com"))
+
+    # Assert
+    assert writer.queue.qsize() == 1
+    spilled = list(tmp_path.glob("*.jsonl"))
+    assert len(spilled) == 1
+    assert "second@example.com" in spilled[0].read_text()
+
+
+@pytest.mark.asyncio
+async def test_spilled_entries_are_replayed_and_removed(tmp_path):
+    # Arrange
+    writer = AuditWriter(spill_dir=str(tmp_path))
+    entries = [_entry(details={"n": i}) for i in range(3)]
+    await writer.spill(entries)
+    writer.write_batch = AsyncMock()
+
+    # Act
+    replayed = await writer.replay_spilled()
+
+    # Assert
+    assert replayed == 3
+    written = writer.write_batch.await_args.args[0]
+    assert [e["id"] for e in written] == [e["id"] for e in entries]
+    assert written[0]["event_type"] is AuditEventType.LOGIN_SUCCESS
+    assert written[0]["created_at"] == entries[0]["created_at"]
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_files_of_live_workers(tmp_path):
+    # Arrange: a spill file owned by another running process
+    writer = AuditWriter(spill_dir=str(tmp_path))
+    await writer.spill([_entry()])
+    live = tmp_path / f"audit-{os.getppid()}.jsonl"
+    next(tmp_path.iterdir()).rename(live)
+    writer.write_batch = AsyncMock()
+
+    # Act
+    replayed = await writer.replay_spilled()
+
+    # Assert
+    assert replayed == 0
+    assert list(tmp_path.iterdir()) == [live]
+    writer.write_batch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unparseable_lines_are_quarantined(tmp_path, monkeypatch):
+    # Arrange: a dead worker's file ending in a partial line
+    monkeypatch.setattr("src.backend.app.common.audit_writer._pid_alive", lambda pid: False)
+    writer = AuditWriter(spill_dir=str(tmp_path))
+    entries = [_entry(), _entry()]
+    await writer.spill(entries)
+    spilled = next(tmp_path.iterdir())
+    dead = spilled.with_name("audit-999999.jsonl")
+    dead.write_text(spilled.read_text() + '{"id": "partial', encoding="utf-8")
+    spilled.unlink()
+    writer.write_batch = AsyncMock()
+
+    # Act
+    replayed = await writer.replay_spilled()
+
+    # Assert
+    assert replayed == 2
+    assert [p.name for p in tmp_path.iterdir()] == ["audit-999999.corrupt"]
+    assert (tmp_path / "audit-999999.corrupt").read_text() == '{"id": "partial\n'
+
+
+@pytest.mark.asyncio
+async def test_failed_replay_keeps_spill_file(tmp_path):
+    # Arrange
+    writer = AuditWriter(spill_dir=str(tmp_path))
+    await writer.spill([_entry()])
+    writer.write_batch = AsyncMock(side_effect=ConnectionError("db down"))
+
+    # Act
+    with pytest.raises(ConnectionError):
+        await writer.replay_spilled()
+
+    # Assert
+    assert [p.suffix for p in tmp_path.iterdir()] == [".jsonl"]
+
+
+@pytest.mark.asyncio
+async def test_background_task_batches_entries(tmp_path):
+    # Arrange
+    writer = AuditWriter(batch_size=10, flush_interval=0.01, spill_dir=str(tmp_path))
+    writer.write_batch = AsyncMock()
+    await writer.start()
+
+    # Act
+    for _ in range(5):
+        await writer.submit(_entry())
+    await asyncio.sleep(0.05)
+    await writer.stop()
+
+    # Assert
+    writer.write_batch.assert_awaited_once()
+    assert len(writer.write_batch.await_args.args[0]) == 5
+
+
+@pytest.mark.asyncio
+async def test_stop_spills_entries_when_final_flush_fails(tmp_path):
+    # Arrange
+    writer = AuditWriter(spill_dir=str(tmp_path))
+    writer.write_batch = AsyncMock(side_effect=ConnectionError("db down"))
+    await writer.submit(_entry())
+    await writer.submit(_entry())
+
+    # Act
+    await writer.stop()
+
+    # Assert
+    lines = next(tmp_path.glob("*.jsonl")).read_text().splitlines()
+    assert len(lines) == 2
@@ -0,0 +1,122 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.auth.invitation_service import InvitationService, send_invitation_emails
+from src.backend.app.auth.models import Invitation, Role
+from src.backend.app.notifications.models import EmailOutbox
+
+ORG = "5c1d2e3f-0a9b-4c8d-8e7f-6a5b4c3d2e1f"
+
+
+OTHER_ORG = "0b7a6c1e-4f1e-4c1a-9d7e-1d2c3b4a5f6e"
+
+
+def _session(registered=(), organizations=(ORG,)):
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(scalars=MagicMock(return_value=iter(organizations))),  # known organizations
+        MagicMock(scalars=MagicMock(return_value=iter(registered))),  # registered users
+        MagicMock(),  # expire pending invitations
+        MagicMock(),  # insert
+    ])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_validates_dedupes_and_inserts_once():
+    # Arrange
+    session = _session(registered=["taken@example.com"])
+    data = [
+        {"email": "New@Example.com", "role": Role.ASSESSOR, "organization_id": ORG, "domain_ids": ["1"]},
+        {"email": "new@example.com", "role": Role.ANALYST, "organization_id": ORG},
+        {"email": "taken@example.com", "role": Role.ANALYST, "organization_id": ORG},
+        {"email": "not-an-email", "role": Role.ANALYST, "organization_id": ORG},
+        {"email": "role@example.com", "role": "janitor", "organization_id": ORG},
+        {"email": "orphan@example.com", "role": Role.ASSESSOR},
+        {"email": "second@example.com", "role": "client_admin", "organization_id": ORG},
+    ]
+
+    # Act
+    result = await InvitationService(session).create_bulk_invitations(data, invited_by="u-1")
+
+    # Assert
+    assert [inv.email for inv in result.created] == ["new@example.com", "second@example.com"]
+    assert result.created[0].domain_ids == {"ids": ["1"]}
+    assert {(s["email"], s["reason"]) for s in result.skipped} == {
+        ("new@example.com", "duplicate"),
+        ("taken@example.com", "already_registered"),
+        ("not-an-email", "invalid_email"),
+        ("role@example.com", "invalid_role"),
+        ("orphan@example.com", "organization_required"),
+    }
+    assert session.execute.await_count == 4
+    insert_stmt, rows = session.execute.await_args_list[3].args
+    assert insert_stmt.table.name == Invitation.__tablename__
+    assert [row["email"] for row in rows] == ["new@example.com", "second@example.com"]
+    assert len({row["token"] for row in rows}) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_skips_unknown_organizations_and_domains():
+    # Arrange
+    session = _session()
+    data = [
+        {"email": "ok@example.com", "role": Role.ASSESSOR, "organization_id": ORG, "domain_ids": ["2", "9"]},
+        {"email": "ghost@example.com", "role": Role.ASSESSOR, "organization_id": OTHER_ORG},
+        {"email": "garbled@example.com", "role": Role.ASSESSOR, "organization_id": "not-a-uuid"},
+        {"email": "domain@example.com", "role": Role.ASSESSOR, "organization_id": ORG, "domain_ids": ["42"]},
+    ]
+
+    # Act
+    result = await InvitationService(session).create_bulk_invitations(data, invited_by="u-1")
+
+    # Assert: bad ids are reported instead of failing the INSERT
+    assert [inv.email for inv in result.created] == ["ok@example.com"]
+    assert {(s["email"], s["reason"]) for s in result.skipped} == {
+        ("ghost@example.com", "unknown_organization"),
+        ("garbled@example.com", "unknown_organization"),
+        ("domain@example.com", "unknown_domain"),
+    }
+    _, rows = session.execute.await_args_list[3].args
+    assert [row["organization_id"] for row in rows] == [ORG]
+
+
+@pytest.mark.asyncio
+async def test_bulk_invite_skips_queries_when_nothing_is_valid():
+    # Arrange
+    session = _session()
+
+    # Act
+    result = await InvitationService(session).create_bulk_invitations(
+        [{"email": "bad", "role": Role.ANALYST, "organization_id": ORG}], invited_by="u-1"
+    )
+
+    # Assert
+    assert result.created == []
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invitation_emails_are_queued_in_one_insert():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock()
+    result = await InvitationService(_session()).create_bulk_invitations(
+        [
+            {"email": f"user{i}@example.com", "role": Role.ASSESSOR, "organization_id": ORG}
+            for i in range(3)
+        ],
+        invited_by="u-1",
+    )
+
+    # Act
+    queued = await send_invitation_emails(session, result.created, base_url="https://app")
+
+    # Assert
+    assert queued == 3
+    stmt, rows = session.execute.await_args.args
+    assert stmt.table.name == EmailOutbox.__tablename__
+    assert rows[0]["to_address"] == "user0@example.com"
+    assert rows[0]["context"]["registration_url"] == f"https://app/register?token={result.created[0].token}"
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.backend.app.comments.service import CommentService
+
+
+def _row(comment_id, parent_id, minutes, response_id):
+    return SimpleNamespace(
+        id=comment_id,
+        user_id=uuid4(),
+        response_id=response_id,
+        parent_id=parent_id,
+        content=f"comment {minutes}",
+        created_at=datetime(2026, 10, 1) + timedelta(minutes=minutes),
+        author_name="Reviewer",
+    )
+
+
+@pytest.mark.asyncio
+async def test_threads_are_assembled_to_arbitrary_depth_in_one_query():
+    # Arrange
+    response_id = uuid4()
+    first, second, reply, deep, deeper = (uuid4() for _ in range(5))
+    rows = [
+        _row(first, None, 0, response_id),
+        _row(reply, first, 1, response_id),
+        _row(second, None, 2, response_id),
+        _row(deep, reply, 3, response_id),
+        _row(deeper, deep, 4, response_id),
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+
+    # Act
+    threads = await CommentService(session).get_response_comments(response_id, limit=10)
+
+    # Assert
+    session.execute.assert_awaited_once()
+    assert [t.id for t in threads] == [first, second]
+    assert threads[0].replies[0].id == reply
+    assert threads[0].replies[0].replies[0].replies[0].id == deeper
+    assert threads[1].replies == []
+    assert threads[0].author.full_name == "Reviewer"
+
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import List
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.assessments.evidence_service import EvidenceService
+from src.backend.app.assessments.models import AssessmentElementResponse, Evidence
+from src.backend.app.assessments.router import router
+from src.backend.app.assessments.schemas import (
+    AssessmentDomainSummary,
+    AssessmentElementSummary,
+    AssessmentSummary,
+)
+from src.backend.app.comments.schemas import CommentCreate
+from src.backend.app.comments.service import CommentService
+
+
+def _recording_session(result=None):
+    calls = []
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=lambda stmt: calls.append(stmt) or result)
+    session.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+    session.delete = AsyncMock(side_effect=lambda row: calls.append(("delete", row)))
+    return session, calls
+
+
+@pytest.mark.asyncio
+async def test_add_comment_bumps_element_counters_in_same_transaction():
+    # Arrange
+    response_id = uuid4()
+    row = SimpleNamespace(
+        id=uuid4(), user_id=uuid4(), response_id=response_id, parent_id=None,
+        content="Looks good", created_at=datetime(2026, 10, 1), author_name="Reviewer",
+    )
+    session, calls = _recording_session(MagicMock(one=MagicMock(return_value=row)))
+
+    # Act
+    await CommentService(session).add_comment(row.user_id, CommentCreate(response_id=response_id, content="Looks good"))
+
+    # Assert
+    update_stmt = calls[0]
+    assert calls[1] == "commit"
+    assert update_stmt.table.name == AssessmentElementResponse.__tablename__
+    assert update_stmt.compile().params["comment_count_1"] == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_evidence_decrements_counter_before_commit(tmp_path):
+    # Arrange
+    stored = tmp_path / "evidence.pdf"
+    stored.write_bytes(b"%PDF-1.7")
+    evidence = Evidence(id=uuid4(), response_id=uuid4(), file_url=str(stored))
+    session, calls = _recording_session()
+    session.get = AsyncMock(return_value=evidence)
+
+    # Act
+    deleted = await EvidenceService(session).delete_evidence(evidence.id)
+
+    # Assert
+    assert deleted is True
+    assert calls[0] == ("delete", evidence)
+    assert calls[1].table.name == AssessmentElementResponse.__tablename__
+    assert calls[1].compile().params["evidence_count_1"] == -1
+    assert calls[2] == "commit"
+    assert not stored.exists()
+
+
+def test_child_collections_are_never_loaded_implicitly():
+    # Arrange
+    relationships = AssessmentElementResponse.__mapper__.relationships
+
+    # Act / Assert: deletes cascade in the database, not by loading rows
+    for name in ("evidence", "comments"):
+        assert relationships[name].lazy == "noload"
+        assert relationships[name].passive_deletes is True
+    assert Evidence.__table__.c.response_id.foreign_keys.pop().ondelete == "CASCADE"
+
+
+def test_assessment_list_returns_counters_without_evidence():
+    # Arrange
+    route = next(r for r in router.routes if r.path == "/assessments/" and "GET" in r.methods)
+
+    # Act
+    element_fields = AssessmentElementSummary.model_fields
+
+    # Assert
+    assert route.response_model.__args__ == (AssessmentSummary,)
+    assert AssessmentDomainSummary.model_fields["elements"].annotation == List[AssessmentElementSummary]
+    assert "evidence" not in element_fields
+    assert {"comment_count", "evidence_count"} <= set(element_fields)
@@ -0,0 +1,61 @@
+from uuid import uuid4
+
+import pytest
+
+from src.backend.app.notifications.email_outbox import ClaimedEmail, EmailOutboxWorker
+from src.backend.app.notifications.email_service import EmailService
+from src.backend.app.notifications.email_transport import InMemoryTransport, PermanentDeliveryError
+
+
+def _worker(transport):
+    service = EmailService()
+    service.transport = transport
+    return EmailOutboxWorker(service=service, rate_per_second=1000, retry_base_seconds=60)
+
+
+def _claimed(to_address="user@example.sa", attempts=1):
+    return ClaimedEmail(
+        id=uuid4(),
+        to_address=to_address,
+        subject="Invitation",
+        template_name="invitation.html",
+        context={"registration_url": "https://nudj.sa/register?token=t", "role": "assessor", "expires_at": "2026-10-26"},
+        attempts=attempts,
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_batch_delivers_through_transport():
+    # Arrange
+    transport = InMemoryTransport()
+    worker = _worker(transport)
+    emails = [_claimed("a@example.sa"), _claimed("b@example.sa")]
+
+    # Act
+    sent, failures = await worker.send_batch(emails)
+
+    # Assert
+    assert sent == [e.id for e in emails]
+    assert failures == []
+    assert [m["To"] for m in transport.messages] == ["a@example.sa", "b@example.sa"]
+    assert "https://nudj.sa/register?token=t" in transport.messages[0].get_content()
+
+
+@pytest.mark.asyncio
+async def test_send_batch_classifies_failures():
+    transport = InMemoryTransport()
+    worker = _worker(transport)
+
+    transport.fail_with = ConnectionError("timeout")
+    _, transient = await worker.send_batch([_claimed()])
+    transport.fail_with = PermanentDeliveryError("550 mailbox unavailable")
+    _, permanent = await worker.send_batch([_claimed()])
+
+    assert transient[0][2] is False
+    assert permanent[0][2] is True
+
+
+def test_retry_delay_backs_off_exponentially():
+    worker = _worker(InMemoryTransport())
+
+    assert [worker.retry_delay(n).total_seconds() for n in (1, 2, 3)] == [60, 120, 240]
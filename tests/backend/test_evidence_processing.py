@@ -0,0 +1,106 @@
+import zipfile
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.assessments.evidence_processing import (
+    DOCX_MIME,
+    PILLOW_AVAILABLE,
+    EvidenceProcessor,
+    analyze_evidence_file,
+    extract_text,
+    sniff_mime_type,
+)
+from src.backend.app.assessments.models import Evidence
+from src.backend.config import settings
+
+DOCUMENT_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body><w:p><w:r><w:t>HR </w:t></w:r><w:r><w:t>Strategy</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>Approved policy</w:t></w:r></w:p></w:body></w:document>"
+)
+
+
+def test_sniff_ignores_extension(tmp_path):
+    # A PDF uploaded with a misleading name/content type
+    path = tmp_path / "report.png"
+    path.write_bytes(b"%PDF-1.7\n...")
+
+    assert sniff_mime_type(str(path)) == "application/pdf"
+
+
+def test_sniff_binary_and_text(tmp_path):
+    binary = tmp_path / "blob.bin"
+    binary.write_bytes(b"\x00\x01\x02\xff" * 10)
+    text = tmp_path / "notes.txt"
+    text.write_text("سياسة الموارد البشرية", encoding="utf-8")
+
+    assert sniff_mime_type(str(binary)) == "application/octet-stream"
+    assert sniff_mime_type(str(text)) == "text/plain"
+
+
+def test_docx_is_detected_and_extracted(tmp_path):
+    path = tmp_path / "policy.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCUMENT_XML)
+
+    assert sniff_mime_type(str(path)) == DOCX_MIME
+    assert extract_text(str(path), DOCX_MIME) == "HR Strategy\nApproved policy"
+
+
+def test_docx_decompression_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EVIDENCE_MAX_DECOMPRESSED_BYTES", 1024)
+    path = tmp_path / "bomb.docx"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCUMENT_XML + " " * 10_000)
+
+    with pytest.raises(ValueError, match="decompresses"):
+        extract_text(str(path), DOCX_MIME)
+
+
+@pytest.mark.asyncio
+async def test_row_claimed_elsewhere_is_not_processed(monkeypatch):
+    # Arrange: the conditional UPDATE matches nothing (live claim on another worker)
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(first=MagicMock(return_value=None)))
+    session.commit = AsyncMock()
+    factory = MagicMock(return_value=MagicMock(
+        __aenter__=AsyncMock(return_value=session), __aexit__=AsyncMock(return_value=False),
+    ))
+    monkeypatch.setattr(
+        "src.backend.app.assessments.evidence_processing.get_async_session_factory", lambda: factory,
+    )
+    analyze = MagicMock()
+    monkeypatch.setattr("src.backend.app.assessments.evidence_processing.analyze_evidence_file", analyze)
+
+    # Act
+    await EvidenceProcessor().process(uuid4())
+
+    # Assert
+    stmt = session.execute.await_args.args[0]
+    assert stmt.table.name == Evidence.__tablename__
+    assert "RETURNING" in str(stmt)
+    assert "processing_claimed_at <" in str(stmt)
+    analyze.assert_not_called()
+
+
+@pytest.mark.skipif(not PILLOW_AVAILABLE, reason="Pillow not installed")
+def test_image_thumbnail_is_idempotent(tmp_path, monkeypatch):
+    from PIL import Image
+
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "org-chart.jpg"
+    Image.new("RGB", (1200, 800), "white").save(path, format="JPEG")
+    evidence_id = uuid4()
+
+    first = analyze_evidence_file(str(path), evidence_id)
+    second = analyze_evidence_file(str(path), evidence_id)
+
+    assert first.mime_type == "image/jpeg"
+    assert first.thumbnail_path == second.thumbnail_path
+    with Image.open(first.thumbnail_path) as thumbnail:
+        assert max(thumbnail.size) <= 256
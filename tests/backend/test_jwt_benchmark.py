@@ -0,0 +1,117 @@
+"""
+Micro-benchmarks for token encode/decode/verify.
+
+Only the equivalence and rejection checks run by default; the benchmarks are
+marked and skipped unless selected with `pytest -m benchmark -s` (throughput
+is printed).
+"""
+import timeit
+from datetime import datetime
+
+import jwt
+import pytest
+
+from src.backend.app.auth.jwt_service import AccessPrincipal, JWTService, TokenPayload
+from src.backend.app.auth.models import Role
+from src.backend.app.auth.permissions import ROLE_MASKS, permissions_from_mask
+
+ITERATIONS = 2000
+REPEATS = 5
+
+PERMISSION_MASK = ROLE_MASKS[Role.SUPER_ADMIN]
+
+
+@pytest.fixture(scope="module")
+def service():
+    return JWTService()
+
+
+@pytest.fixture(scope="module")
+def token(service):
+    return service.create_access_token(
+        "0b7a6c1e-4f1e-4c1a-9d7e-1d2c3b4a5f6e",
+        "analyst@example.com",
+        "analyst",
+        organization_id="5c1d2e3f-0a9b-4c8d-8e7f-6a5b4c3d2e1f",
+        mfa_verified=True,
+        permission_mask=PERMISSION_MASK,
+    )
+
+
+def test_principal_matches_payload_model(service, token):
+    # Act
+    principal = service.verify_access_principal(token)
+    model = service.verify_access_token(token)
+
+    # Assert
+    assert (principal.sub, principal.org, principal.mfa, principal.jti) == (
+        model.sub, model.org, model.mfa, model.jti
+    )
+    assert permissions_from_mask(principal.permission_mask) == model.permissions
+    assert principal.expires_at.timestamp() == model.exp.timestamp()
+
+
+def test_principal_rejects_other_token_types(service):
+    # Arrange
+    refresh_token, _ = service.create_refresh_token("u-1")
+
+    # Act / Assert
+    with pytest.raises(jwt.InvalidTokenError):
+        service.verify_access_principal(refresh_token)
+
+
+def _per_call_us(func) -> float:
+    best = min(timeit.repeat(func, number=ITERATIONS, repeat=REPEATS))
+    return best / ITERATIONS * 1e6
+
+
+def _report(name: str, micros: float) -> None:
+    print(f"\n{name:<28} {micros:8.2f} us/op {1e6 / micros:12,.0f} ops/s")
+
+
+@pytest.mark.benchmark
+def test_benchmark_encode(service):
+    micros = _per_call_us(
+        lambda: service.create_access_token("u-1", "a@example.com", "analyst", permission_mask=PERMISSION_MASK)
+    )
+    _report("create_access_token", micros)
+
+
+@pytest.mark.benchmark
+def test_benchmark_decode(service, token):
+    micros = _per_call_us(lambda: service.decode_token(token, expected_type="access"))
+    _report("decode_token", micros)
+
+
+@pytest.mark.benchmark
+def test_benchmark_verify(service, token):
+    model = _per_call_us(lambda: service.verify_access_token(token))
+    lean = _per_call_us(lambda: service.verify_access_principal(token))
+    _report("verify_access_token", model)
+    _report("verify_access_principal", lean)
+    assert service.verify_access_principal(token).sub == service.verify_access_token(token).sub
+
+
+@pytest.mark.benchmark
+def test_principal_is_cheaper_than_payload_model(service, token):
+    # Decode once: compare only what each path does with the claims
+    payload = service.decode_token(token, expected_type="access")
+
+    def build_model():
+        return TokenPayload(
+            sub=payload["sub"],
+            email=payload["email"],
+            role=payload["role"],
+            org=payload.get("org"),
+            mfa=payload.get("mfa", False),
+            permissions=permissions_from_mask(payload.get("perm", 0)),
+            exp=datetime.fromtimestamp(payload["exp"]),
+            iat=datetime.fromtimestamp(payload["iat"]),
+            jti=payload["jti"],
+        )
+
+    model = _per_call_us(build_model)
+    lean = _per_call_us(lambda: AccessPrincipal(payload))
+    _report("TokenPayload(...)", model)
+    _report("AccessPrincipal(...)", lean)
+    assert lean < model
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
+import pytest
+
+from src.backend.app.auth.jwt_service import JWTService
+from src.backend.app.auth.signing_keys import (
+    KeyRing,
+    KeyRotationService,
+    generate_key,
+    max_token_lifetime,
+)
+from src.backend.config import settings
+
+
+def _service(ring, algorithm="EdDSA"):
+    service = JWTService(key_ring=ring)
+    service.algorithm = algorithm
+    return service
+
+
+def test_tokens_carry_kid_and_verify_after_rotation():
+    # Arrange
+    now = datetime.now(timezone.utc)
+    old = generate_key("EdDSA", now - timedelta(days=1))
+    ring = KeyRing()
+    ring.load([old])
+    service = _service(ring)
+    token = service.create_access_token("u-1", "a@example.com", "analyst")
+
+    # Act: a newer key takes over signing
+    new = generate_key("RS256", now - timedelta(minutes=1))
+    ring.load([old, new])
+    new_token = service.create_access_token("u-1", "a@example.com", "analyst")
+
+    # Assert
+    assert jwt.get_unverified_header(token)["kid"] == old.kid
+    assert jwt.get_unverified_header(new_token)["kid"] == new.kid
+    assert service.verify_access_token(token).sub == "u-1"
+    assert service.verify_access_token(new_token).sub == "u-1"
+
+
+def test_reload_reuses_parsed_keys():
+    # Arrange
+    row = generate_key("EdDSA", datetime.now(timezone.utc))
+    ring = KeyRing()
+    ring.load([row])
+    parsed = ring.verification_key(row.kid)
+
+    # Act
+    ring.load([row])
+
+    # Assert
+    assert ring.verification_key(row.kid) is parsed
+
+
+def test_unknown_kid_is_rejected():
+    # Arrange
+    ring = KeyRing()
+    ring.load([generate_key("EdDSA", datetime.now(timezone.utc))])
+    other = KeyRing()
+    other.load([generate_key("EdDSA", datetime.now(timezone.utc))])
+    token = _service(other).create_access_token("u-1", "a@example.com", "analyst")
+
+    # Act / Assert
+    with pytest.raises(jwt.InvalidTokenError):
+        _service(ring).verify_access_token(token)
+
+
+def test_jwks_publishes_keys_before_they_sign():
+    # Arrange
+    now = datetime.now(timezone.utc)
+    current = generate_key("RS256", now - timedelta(days=1))
+    upcoming = generate_key("EdDSA", now + timedelta(minutes=30))
+    ring = KeyRing()
+
+    # Act
+    ring.load([current, upcoming])
+
+    # Assert
+    assert ring.signing_key(now).kid == current.kid
+    jwks = ring.jwks()["keys"]
+    assert [key["kid"] for key in jwks] == [current.kid, upcoming.kid]
+    assert jwks[0]["kty"] == "RSA" and jwks[1]["kty"] == "OKP"
+    assert all("d" not in key for key in jwks)  # no private material
+
+
+def _session_with_keys(rows):
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(),  # advisory lock
+        MagicMock(scalars=MagicMock(return_value=iter(rows))),
+        MagicMock(),  # prune
+    ])
+    session.commit = AsyncMock()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_rotation_publishes_next_key_ahead_and_prunes_expired(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "EdDSA")
+    now = datetime.now(timezone.utc)
+    rotation = timedelta(days=settings.JWT_KEY_ROTATION_DAYS)
+    ahead = timedelta(minutes=settings.JWT_KEY_PUBLISH_AHEAD_MINUTES)
+    ancient = generate_key("EdDSA", now - 2 * rotation - max_token_lifetime())
+    current = generate_key("EdDSA", now - rotation + ahead)  # due right now
+    session = _session_with_keys([ancient, current])
+
+    # Act
+    created = await KeyRotationService(session).rotate(now)
+
+    # Assert
+    assert created is not None
+    assert created.activates_at == now + ahead
+    session.add.assert_called_once_with(created)
+    prune = session.execute.await_args_list[2].args[0]
+    assert list(prune.compile().params.values()) == [[ancient.kid]]
+
+
+@pytest.mark.asyncio
+async def test_rotation_is_idle_when_not_due(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "EdDSA")
+    now = datetime.now(timezone.utc)
+    session = _session_with_keys([generate_key("EdDSA", now - timedelta(days=1))])
+
+    # Act
+    created = await KeyRotationService(session).rotate(now)
+
+    # Assert
+    assert created is None
+    session.add.assert_not_called()
+    assert session.execute.await_count == 2
@@ -0,0 +1,221 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pyotp
+import pytest
+
+from src.backend.app.auth.exceptions import (
+    MFAInvalidCodeException,
+    MFATooManyAttemptsException,
+    TokenInvalidException,
+)
+from src.backend.app.auth.jwt_service import jwt_service
+from src.backend.app.auth.mfa_service import (
+    CacheMFAStateStore,
+    DatabaseMFAStateStore,
+    MFAService,
+    MFAVerifier,
+)
+from src.backend.app.auth.models import Role, User
+from src.backend.app.auth.service import AuthService
+from src.backend.app.common.cache import InMemoryCache
+from src.backend.config import settings
+
+SECRET = pyotp.random_base32()
+
+
+def _user(user_id="u-1"):
+    return User(
+        id=user_id, email="a@example.com", role=Role.ANALYST, is_active=True,
+        mfa_enabled=True, mfa_secret=SECRET,
+    )
+
+
+def _verifier():
+    return MFAVerifier(store=CacheMFAStateStore(InMemoryCache()))
+
+
+def _service(session=None):
+    return MFAService(session or MagicMock(), verifier=_verifier())
+
+
+def _session_factory(monkeypatch, session):
+    factory = MagicMock(return_value=MagicMock(
+        __aenter__=AsyncMock(return_value=session), __aexit__=AsyncMock(return_value=False),
+    ))
+    monkeypatch.setattr("src.backend.app.auth.mfa_service.get_async_session_factory", lambda: factory)
+
+
+@pytest.mark.asyncio
+async def test_totp_code_is_accepted_once():
+    # Arrange
+    verifier = _verifier()
+    code = pyotp.TOTP(SECRET).now()
+
+    # Act
+    first = await verifier.verify_totp("u-1", SECRET, code)
+    replay = await verifier.verify_totp("u-1", SECRET, code)
+    other_user = await verifier.verify_totp("u-2", SECRET, code)
+
+    # Assert
+    assert (first, replay, other_user) == (True, False, True)
+
+
+@pytest.mark.asyncio
+async def test_older_step_is_rejected_after_a_newer_one():
+    # Arrange
+    verifier = _verifier()
+    totp = pyotp.TOTP(SECRET)
+    now = datetime.now()
+    previous = totp.at(now - timedelta(seconds=totp.interval))
+
+    # Act
+    current = await verifier.verify_totp("u-1", SECRET, totp.at(now), now=now)
+    older = await verifier.verify_totp("u-1", SECRET, previous, now=now)
+
+    # Assert
+    assert current is True
+    assert older is False
+
+
+@pytest.mark.asyncio
+async def test_failed_codes_are_throttled_per_user():
+    # Arrange
+    service = _service()
+    user = _user()
+    wrong = f"{(int(pyotp.TOTP(SECRET).now()) + 500_000) % 1_000_000:06d}"
+    for _ in range(settings.MFA_MAX_ATTEMPTS):
+        with pytest.raises(MFAInvalidCodeException):
+            await service.verify_code(user, wrong)
+
+    # Act / Assert: even a valid code is refused until the window passes
+    with pytest.raises(MFATooManyAttemptsException):
+        await service.verify_code(user, pyotp.TOTP(SECRET).now())
+    assert await service.verify_code(_user("u-2"), pyotp.TOTP(SECRET).now()) is True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_attempts_are_counted_before_they_are_checked():
+    # Arrange
+    service = _service()
+    user = _user()
+    wrong = f"{(int(pyotp.TOTP(SECRET).now()) + 500_000) % 1_000_000:06d}"
+    extra = 3
+
+    # Act
+    results = await asyncio.gather(
+        *(service.verify_code(user, wrong) for _ in range(settings.MFA_MAX_ATTEMPTS + extra)),
+        return_exceptions=True,
+    )
+
+    # Assert: no more than MFA_MAX_ATTEMPTS codes are ever checked
+    throttled = [r for r in results if isinstance(r, MFATooManyAttemptsException)]
+    assert len(throttled) == extra
+
+
+def test_state_is_kept_in_the_database_without_redis(monkeypatch):
+    # Arrange
+    monkeypatch.setattr("src.backend.app.auth.mfa_service.get_redis", lambda: None)
+
+    # Act / Assert: never the per-process cache
+    assert isinstance(MFAVerifier().store, DatabaseMFAStateStore)
+
+
+@pytest.mark.asyncio
+async def test_database_store_claims_steps_with_a_conditional_update(monkeypatch):
+    # Arrange: the second claim matches no row (step already used)
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(scalar_one_or_none=MagicMock(return_value="u-1")),
+        MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+    ])
+    session.commit = AsyncMock()
+    _session_factory(monkeypatch, session)
+    store = DatabaseMFAStateStore()
+
+    # Act
+    first = await store.claim_step("u-1", 100, 99, 90)
+    replay = await store.claim_step("u-1", 100, 99, 90)
+
+    # Assert
+    assert (first, replay) == (True, False)
+    stmt = session.execute.await_args.args[0]
+    assert stmt.table.name == User.__tablename__
+    assert "mfa_last_used_step <" in str(stmt)
+    assert "RETURNING" in str(stmt)
+
+
+@pytest.mark.asyncio
+async def test_database_store_increments_attempts_in_one_update(monkeypatch):
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=6)))
+    session.commit = AsyncMock()
+    _session_factory(monkeypatch, session)
+    verifier = MFAVerifier(store=DatabaseMFAStateStore())
+
+    # Act / Assert
+    with pytest.raises(MFATooManyAttemptsException):
+        await verifier.count_attempt("u-1")
+    stmt = session.execute.await_args.args[0]
+    assert "mfa_attempts + " in str(stmt)
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_backup_code_is_consumed_with_a_conditional_update():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value="u-1")))
+    service = _service(session)
+    user = _user()
+    codes = await service.enable_mfa(user, SECRET, pyotp.TOTP(SECRET).now())
+
+    # Act
+    verified = await service.verify_code(user, codes[0].lower())
+
+    # Assert
+    assert verified is True
+    assert len(user.mfa_backup_codes) == len(codes) - 1
+    assert codes[0] not in str(user.mfa_backup_codes)  # only digests are stored
+    stmt = session.execute.await_args.args[0]
+    assert stmt.table.name == User.__tablename__
+    with pytest.raises(MFAInvalidCodeException):
+        await service.verify_code(user, codes[0])
+    assert session.execute.await_count == 1  # used code never reaches the database
+
+
+@pytest.mark.asyncio
+async def test_backup_code_used_concurrently_is_rejected():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+    service = _service(session)
+    user = _user()
+    codes = await service.enable_mfa(user, SECRET, pyotp.TOTP(SECRET).now())
+
+    # Act / Assert
+    with pytest.raises(MFAInvalidCodeException):
+        await service.verify_code(user, codes[0])
+
+
+@pytest.mark.asyncio
+async def test_verify_mfa_issues_tokens_for_valid_code(monkeypatch):
+    # Arrange
+    verifier = _verifier()
+    monkeypatch.setattr("src.backend.app.auth.mfa_service.mfa_verifier", verifier)
+    user = _user()
+    session = MagicMock()
+    session.get = AsyncMock(return_value=user)
+    service = AuthService(session)
+    service._generate_auth_response = AsyncMock(return_value={"access_token": "token"})
+    mfa_token = jwt_service.create_mfa_pending_token(user.id, user.email)
+
+    # Act
+    result = await service.verify_mfa(mfa_token, pyotp.TOTP(SECRET).now(), "127.0.0.1")
+
+    # Assert
+    assert result == {"access_token": "token"}
+    with pytest.raises(TokenInvalidException):
+        await service.verify_mfa("not-a-token", "123456", "127.0.0.1")
@@ -0,0 +1,29 @@
+import pytest
+
+from src.backend.app.notifications.broker import NotificationBroker, SUBSCRIBER_QUEUE_SIZE
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_only_subscribed_user():
+    broker = NotificationBroker()
+
+    async with broker.subscribe("user-1") as mine, broker.subscribe("user-2") as theirs:
+        await broker.publish("user-1", "notification", {"title": "Hello"})
+
+        assert mine.get_nowait() == {"event": "notification", "data": {"title": "Hello"}}
+        assert theirs.empty()
+
+    assert broker.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_publish_many_and_slow_consumer_drops_oldest():
+    broker = NotificationBroker()
+
+    async with broker.subscribe("user-1") as first, broker.subscribe("user-2") as second:
+        for i in range(SUBSCRIBER_QUEUE_SIZE + 5):
+            await broker.publish_many(["user-1", "user-2"], "notification", {"n": i})
+
+        assert first.qsize() == SUBSCRIBER_QUEUE_SIZE
+        assert first.get_nowait()["data"] == {"n": 5}
+        assert second.qsize() == SUBSCRIBER_QUEUE_SIZE
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+
+from src.backend.app.notifications import digest as digest_module
+from src.backend.app.notifications import service as service_module
+from src.backend.app.notifications.digest import DigestService
+from src.backend.app.notifications.models import DigestFrequency
+from src.backend.app.notifications.schemas import NotificationCreate
+from src.backend.app.notifications.service import NotificationService
+
+
+def _result(scalar=None, rows=()):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = scalar
+    result.all.return_value = list(rows)
+    return result
+
+
+def _persisted(notification):
+    notification.id = uuid4()
+    notification.created_at = datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_create_notification_merges_into_recent_unread():
+    # Arrange
+    existing = MagicMock(coalesced_count=2)
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=_result(scalar=existing))
+    session.commit = AsyncMock()
+    service = NotificationService(session)
+    data = NotificationCreate(
+        user_id=uuid4(), title="New Assessment Task Delegated", message="...", link="/assessments/1"
+    )
+
+    # Act
+    with patch.object(service_module.notification_broker, "publish", new=AsyncMock()) as publish:
+        result = await service.create_notification(data)
+
+    # Assert
+    assert result is existing
+    session.add.assert_not_called()
+    publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_first_occurrence_time():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=_result(scalar=MagicMock()))
+    service = NotificationService(session)
+
+    # Act
+    await service._coalesce(NotificationCreate(user_id=uuid4(), title="t", message="m", link="/x"))
+
+    # Assert: the window is bounded by created_at, which the update leaves alone
+    params = session.execute.await_args.args[0].compile().params
+    assert "last_coalesced_at" in params
+    assert "created_at" not in params
+
+
+@pytest.mark.asyncio
+async def test_notifications_without_link_are_not_merged():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock(side_effect=_persisted)
+    service = NotificationService(session)
+    service.unread_counter = MagicMock(increment=AsyncMock(), invalidate=AsyncMock())
+    user_id = uuid4()
+
+    # Act
+    with patch.object(service_module.notification_broker, "publish", new=AsyncMock()) as publish:
+        for _ in range(2):
+            await service.create_notification(NotificationCreate(user_id=user_id, title="t", message="m"))
+
+    # Assert: two separate rows, each counting a single event
+    session.execute.assert_not_awaited()
+    added = [call.args[0] for call in session.add.call_args_list]
+    assert len(added) == 2
+    assert [notification.coalesced_count for notification in added] == [1, 1]
+    assert publish.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_digest_batch_queues_one_email_per_user_with_pending_items():
+    # Arrange
+    busy, idle = uuid4(), uuid4()
+    due = [
+        SimpleNamespace(user_id=busy, last_digest_at=None, email="busy@example.sa"),
+        SimpleNamespace(user_id=idle, last_digest_at=None, email="idle@example.sa"),
+    ]
+    ranked = [
+        SimpleNamespace(user_id=busy, title=f"T{i}", message="m", link="/x", coalesced_count=1, rank=i, total=25)
+        for i in range(1, 3)
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[_result(rows=ranked), _result()])
+    session.commit = AsyncMock()
+
+    # Act
+    with patch.object(digest_module, "enqueue_email") as enqueue:
+        queued = await DigestService(session)._send_batch(
+            due, DigestFrequency.DAILY, timedelta(days=1), datetime.utcnow()
+        )
+
+    # Assert
+    assert queued == 1
+    context = enqueue.call_args.kwargs["context"]
+    assert enqueue.call_args.kwargs["recipients"] == ["busy@example.sa"]
+    assert context["total"] == 25 and context["more"] == 23
+    session.commit.assert_awaited_once()
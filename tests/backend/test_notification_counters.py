@@ -0,0 +1,118 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.common.cache import InMemoryCache
+from src.backend.app.notifications import counters, service as service_module
+from src.backend.app.notifications.counters import UnreadCounter
+from src.backend.app.notifications.models import NotificationUnreadCount
+from src.backend.app.notifications.service import NotificationService
+
+
+def _session_counting(count):
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar.return_value = count
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_counter_falls_back_to_database_once():
+    # Arrange
+    session = _session_counting(3)
+    counter = UnreadCounter(session, cache=InMemoryCache())
+    user_id = uuid4()
+
+    # Act
+    first = await counter.get(user_id)
+    second = await counter.get(user_id)
+
+    # Assert: a primary-key read of the maintained row, never COUNT(*)
+    assert first == second == 3
+    session.execute.assert_awaited_once()
+    stmt = session.execute.await_args.args[0]
+    assert stmt.get_final_froms()[0].name == NotificationUnreadCount.__tablename__
+    assert "count(" not in str(stmt)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_recomputes_from_database():
+    # Arrange
+    session = _session_counting(3)
+    counter = UnreadCounter(session, cache=InMemoryCache())
+    user_id = uuid4()
+    await counter.get(user_id)
+
+    # Act
+    session.execute.return_value.scalar.return_value = 4
+    await counter.invalidate_many([user_id, user_id])
+
+    # Assert
+    assert await counter.get(user_id) == 4
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_without_shared_cache_every_read_hits_the_database():
+    # Arrange: REDIS_ENABLED is off in tests, so get_cache() is in-process
+    session = _session_counting(2)
+    counter = UnreadCounter(session)
+    user_id = uuid4()
+
+    # Act
+    await counter.get(user_id)
+    await counter.invalidate(user_id)
+    count = await counter.get(user_id)
+
+    # Assert
+    assert counter.cache is None
+    assert count == 2
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_increment_upserts_rows_in_user_order(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(counters, "COUNTER_CHUNK_SIZE", 2)
+    session = _session_counting(0)
+    counter = UnreadCounter(session, cache=InMemoryCache())
+    users = [uuid4() for _ in range(3)]
+
+    # Act
+    await counter.increment(users + users[:1])
+
+    # Assert
+    statements = [call.args[0] for call in session.execute.await_args_list]
+    assert len(statements) == 2
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (user_id) DO UPDATE" in sql
+    assert "notification_unread_counts.unread_count + excluded.unread_count" in sql
+    params = [p for stmt in statements for k, p in stmt.compile().params.items() if k.startswith("user_id")]
+    assert params == sorted(str(u) for u in users)
+
+
+@pytest.mark.asyncio
+async def test_read_paths_decrement_in_the_same_transaction():
+    # Arrange
+    calls = []
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=lambda *args: calls.append(args) or MagicMock(rowcount=3))
+    session.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+    service = NotificationService(session)
+    service.unread_counter = UnreadCounter(session, cache=InMemoryCache())
+    user_id = uuid4()
+
+    # Act
+    with patch.object(service_module.notification_broker, "publish", new=AsyncMock()):
+        await service.mark_all_as_read(user_id)
+
+    # Assert: notifications update, counter decrement, then one commit
+    assert calls[-1] == "commit"
+    stmt, params = calls[1]
+    assert stmt.table.name == NotificationUnreadCount.__tablename__
+    assert params == [{"counted_user_id": user_id, "read_count": 3}]
+    assert "greatest(" in str(stmt)
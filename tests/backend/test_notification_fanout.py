@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.backend.app.common.cache import InMemoryCache
+from src.backend.app.notifications import service as service_module
+from src.backend.app.notifications.counters import UnreadCounter
+from src.backend.app.notifications.schemas import NotificationBase
+from src.backend.app.notifications.service import NotificationService
+
+
+def _service():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    service = NotificationService(session)
+    service.unread_counter = UnreadCounter(session, cache=InMemoryCache())
+    return service, session
+
+
+@pytest.mark.asyncio
+async def test_create_many_uses_chunked_inserts_and_one_commit(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(service_module, "BULK_INSERT_CHUNK_SIZE", 2)
+    service, session = _service()
+    users = [uuid4() for _ in range(5)]
+    data = NotificationBase(title="Deadline", message="Due Friday")
+
+    # Act
+    with patch.object(service_module.notification_broker, "publish_many", new=AsyncMock()) as publish:
+        created = await service.create_many(users + users[:2], data)
+
+    # Assert
+    assert created == 5  # Duplicates collapsed
+    assert session.execute.await_count == 4  # 3 insert chunks + 1 counter upsert
+    counter_stmt = session.execute.await_args_list[3].args[0]
+    assert counter_stmt.table.name == "notification_unread_counts"
+    session.commit.assert_awaited_once()
+    publish.assert_awaited_once()
+    assert publish.await_args.args[0] == [str(u) for u in users]
+
+
+@pytest.mark.asyncio
+async def test_create_many_with_no_recipients_is_a_noop():
+    service, session = _service()
+
+    created = await service.create_many([], NotificationBase(title="t", message="m"))
+
+    assert created == 0
+    session.execute.assert_not_awaited()
+    session.commit.assert_not_awaited()
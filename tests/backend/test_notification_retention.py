@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.backend.app.common import partitions
+from src.backend.app.common.cache import InMemoryCache
+from src.backend.app.notifications.counters import UnreadCounter
+from src.backend.app.notifications.models import Notification
+from src.backend.app.notifications.retention import NotificationRetentionService
+
+
+def test_month_arithmetic_and_names():
+    assert partitions.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partitions.month_start(datetime(2026, 10, 19, 8, 30)) == date(2026, 10, 1)
+    assert partitions.partition_name("audit_logs", date(2026, 3, 1)) == "audit_logs_p202603"
+
+
+@pytest.mark.asyncio
+async def test_partitions_before_only_returns_fully_expired_months():
+    listed = [("notifications_p202607", date(2026, 7, 1)), ("notifications_p202608", date(2026, 8, 1))]
+    with patch.object(partitions, "list_monthly_partitions", new=AsyncMock(return_value=listed)):
+        names = await partitions.partitions_before(MagicMock(), "notifications", datetime(2026, 8, 15))
+
+    assert names == ["notifications_p202607"]
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_in_chunks_and_adjusts_unread_counters():
+    # Arrange
+    unread_user = uuid4()
+    chunks = [
+        [(uuid4(), True), (unread_user, False)],
+        [(uuid4(), True)],
+    ]
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(all=MagicMock(return_value=chunks[0])),
+        MagicMock(),  # counter decrement
+        MagicMock(all=MagicMock(return_value=chunks[1])),
+    ])
+    session.commit = AsyncMock()
+    service = NotificationRetentionService(session, batch_size=2)
+    cache = InMemoryCache()
+    service.unread_counter = UnreadCounter(session, cache=cache)
+    await cache.set(service.unread_counter._key(unread_user), "4")
+
+    # Act
+    removed = await service._purge_chunks(Notification.created_at < datetime(2025, 1, 1))
+
+    # Assert: the counter moves in the deleting transaction
+    assert removed == 3
+    assert session.commit.await_count == 2
+    stmt, params = session.execute.await_args_list[1].args
+    assert stmt.table.name == "notification_unread_counts"
+    assert params == [{"counted_user_id": unread_user, "read_count": 1}]
+    assert await cache.get(service.unread_counter._key(unread_user)) is None
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.backend.app.auth.dependencies import require_permission
+from src.backend.app.auth.exceptions import InsufficientPermissionsException
+from src.backend.app.auth.jwt_service import JWTService
+from src.backend.app.auth.models import Role
+from src.backend.app.auth.permissions import (
+    PERMISSIONS,
+    ROLE_MASKS,
+    ROLE_PERMISSIONS,
+    PermissionService,
+    permissions_from_mask,
+)
+
+
+def test_role_masks_match_permission_sets():
+    for role, permissions in ROLE_PERMISSIONS.items():
+        assert set(permissions_from_mask(ROLE_MASKS[role])) == permissions
+
+
+def test_every_role_permission_is_registered():
+    registered = set(PERMISSIONS)
+    assert len(registered) == len(PERMISSIONS)
+    for permissions in ROLE_PERMISSIONS.values():
+        assert permissions <= registered
+
+
+def test_permission_checks():
+    assert PermissionService.has_permission(Role.CLIENT_ADMIN, "users:invite")
+    assert not PermissionService.has_permission(Role.ASSESSOR, "users:read")
+    assert not PermissionService.has_permission(Role.SUPER_ADMIN, "no:such")
+    assert PermissionService.has_any_permission(Role.ANALYST, ["users:write", "reports:export"])
+    assert PermissionService.has_all_permissions(Role.ANALYST, ["users:read", "orgs:read"])
+    assert not PermissionService.has_all_permissions(Role.ANALYST, ["users:read", "users:write"])
+
+
+def test_require_permission_rejects_unknown_names_up_front():
+    with pytest.raises(KeyError):
+        require_permission("users:raed")
+
+
+@pytest.mark.asyncio
+async def test_require_permission_checks_role_mask():
+    # Arrange
+    checker = require_permission("audit:read")
+
+    # Act / Assert
+    admin = MagicMock(role=Role.SUPER_ADMIN)
+    assert await checker(user=admin) is admin
+    with pytest.raises(InsufficientPermissionsException):
+        await checker(user=MagicMock(role=Role.ANALYST))
+
+
+def test_access_token_carries_compact_mask():
+    # Arrange
+    service = JWTService()
+
+    # Act
+    token = service.create_access_token(
+        "u-1", "a@example.com", "client_admin",
+        permission_mask=PermissionService.get_role_mask(Role.CLIENT_ADMIN),
+    )
+    principal = service.verify_access_principal(token)
+
+    # Assert
+    assert "permissions" not in service.decode_token(token)
+    assert principal.has_permission("users:invite")
+    assert not principal.has_permission("audit:read")
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.backend.app.auth.cleanup import AuthCleanupService
+from src.backend.app.auth.models import RefreshToken
+from src.backend.app.common.scheduler import Scheduler
+
+
+def _scheduler(leader: bool) -> Scheduler:
+    scheduler = Scheduler(record_runs=False)
+    scheduler._try_acquire = AsyncMock(return_value=MagicMock() if leader else None)
+    return scheduler
+
+
+async def _tick(scheduler: Scheduler) -> None:
+    await scheduler._check_leadership()
+    for job in scheduler.jobs.values():
+        job.next_run_at = 0
+    scheduler._launch_due_jobs()
+    await asyncio.gather(*(job.task for job in scheduler.jobs.values() if job.task))
+
+
+@pytest.mark.asyncio
+async def test_followers_only_run_per_process_jobs():
+    # Arrange
+    scheduler = _scheduler(leader=False)
+    cleanup = scheduler.add_job("cleanup", 60, AsyncMock(return_value=3))
+    flush = scheduler.add_job("flush", 60, AsyncMock(return_value=None), leader_only=False)
+
+    # Act
+    await _tick(scheduler)
+
+    # Assert
+    assert not scheduler.is_leader
+    cleanup.func.assert_not_awaited()
+    flush.func.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_leader_runs_leader_only_jobs():
+    # Arrange
+    scheduler = _scheduler(leader=True)
+    cleanup = scheduler.add_job("cleanup", 60, AsyncMock(return_value=3))
+
+    # Act
+    await _tick(scheduler)
+
+    # Assert
+    assert scheduler.is_leader
+    cleanup.func.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_running_job_is_not_started_twice():
+    # Arrange
+    scheduler = _scheduler(leader=True)
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_job():
+        calls.append(1)
+        await release.wait()
+
+    job = scheduler.add_job("slow", 60, slow_job)
+    await scheduler._check_leadership()
+
+    # Act
+    job.next_run_at = 0
+    scheduler._launch_due_jobs()
+    await asyncio.sleep(0)
+    job.next_run_at = 0
+    scheduler._launch_due_jobs()
+    release.set()
+    await job.task
+
+    # Assert
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_run_job_records_rows_and_failures():
+    # Arrange
+    scheduler = Scheduler()
+    scheduler._record = AsyncMock()
+    ok = scheduler.add_job("ok", 60, AsyncMock(return_value=12))
+    failing = scheduler.add_job("failing", 60, AsyncMock(side_effect=RuntimeError("boom")))
+
+    # Act
+    await scheduler.run_job(ok)
+    await scheduler.run_job(failing)
+
+    # Assert
+    ok_call, failing_call = scheduler._record.await_args_list
+    assert ok_call.args[3] == 12 and ok_call.args[4] is None
+    assert failing_call.args[4] == "RuntimeError: boom"
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_in_chunks_until_drained():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[MagicMock(rowcount=2), MagicMock(rowcount=2), MagicMock(rowcount=1)])
+    session.commit = AsyncMock()
+    service = AuthCleanupService(session, batch_size=2)
+
+    # Act
+    removed = await service.purge_refresh_tokens(datetime(2026, 10, 19, tzinfo=timezone.utc))
+
+    # Assert
+    assert removed == 5
+    assert session.commit.await_count == 3
+    stmt = session.execute.await_args_list[0].args[0]
+    assert stmt.table.name == RefreshToken.__tablename__
@@ -0,0 +1,112 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.auth.models import Role
+from src.backend.app.search.schemas import SearchSource
+from src.backend.app.search.service import SearchService
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def _user(role, organization_id=None):
+    return SimpleNamespace(id=str(uuid4()), role=role, organization_id=organization_id)
+
+
+def test_query_uses_indexed_vectors_for_both_languages():
+    # Act
+    sql = _sql(SearchService(None).build_query("access control", _user(Role.SUPER_ADMIN)))
+
+    # Assert
+    for table in ("comments", "assessment_element_responses", "evidence"):
+        assert f"{table}.search_vector @@" in sql
+    assert sql.count("websearch_to_tsquery") >= 2
+    assert "ts_headline" in sql
+    assert "analyst_org_assignments" not in sql
+    assert "organization_id =" not in sql
+
+
+def test_snippets_escape_text_and_use_matching_config():
+    # Act
+    sql = _sql(SearchService(None).build_query("سياسة", _user(Role.SUPER_ADMIN)))
+
+    # Assert: the body is escaped before ts_headline adds <mark>
+    headline = sql[sql.index("ts_headline("):]
+    assert headline.index("replace(") < headline.index("page.body")
+    assert "CAST(page.config AS REGCONFIG)" in headline
+    assert "CASE WHEN" in sql
+
+
+def test_client_users_are_scoped_to_their_organization():
+    # Arrange
+    org_id = str(uuid4())
+
+    # Act
+    stmt = SearchService(None).build_query("policy", _user(Role.ASSESSOR, org_id))
+
+    # Assert
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert org_id in params.values()
+
+
+def test_assessors_only_see_created_or_delegated_assessments():
+    # Arrange
+    assessor = _user(Role.ASSESSOR, str(uuid4()))
+
+    # Act
+    sql = _sql(SearchService(None).build_query("policy", assessor))
+    admin_sql = _sql(SearchService(None).build_query("policy", _user(Role.CLIENT_ADMIN, str(uuid4()))))
+
+    # Assert: delegations are matched per row against its assessment and domain
+    assert "assessments.created_by =" in sql
+    assert "EXISTS (SELECT" in sql
+    assert "assessment_delegations.domain_id = assessment_domains.id" in sql
+    assert "assessment_delegations.domain_id IS NULL" in sql
+    assert "assessment_delegations" not in admin_sql
+
+
+def test_analysts_are_scoped_to_assigned_organizations():
+    # Act
+    sql = _sql(SearchService(None).build_query("policy", _user(Role.ANALYST)))
+
+    # Assert
+    assert "analyst_org_assignments" in sql
+
+
+def test_source_filter_limits_union():
+    # Act
+    sql = _sql(SearchService(None).build_query(
+        "policy", _user(Role.SUPER_ADMIN), sources=[SearchSource.EVIDENCE]
+    ))
+
+    # Assert
+    assert "UNION ALL" not in sql
+    assert "comments.search_vector" not in sql
+
+
+@pytest.mark.asyncio
+async def test_search_maps_rows_and_total():
+    # Arrange
+    row = SimpleNamespace(
+        source="comment", id=uuid4(), response_id=uuid4(), assessment_id=uuid4(),
+        organization_id=uuid4(), domain_id=3, element_id=12, rank=0.4,
+        created_at=datetime(2026, 10, 1), total=7, snippet="the <mark>policy</mark> text",
+    )
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[row])))
+
+    # Act
+    results, total = await SearchService(session).search("policy", _user(Role.SUPER_ADMIN))
+
+    # Assert
+    assert total == 7
+    assert results[0].source == SearchSource.COMMENT
+    assert results[0].snippet == "the <mark>policy</mark> text"
+    session.execute.assert_awaited_once()
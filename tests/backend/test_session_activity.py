@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import inspect
+
+from src.backend.app.auth import session_service
+from src.backend.app.auth.models import UserSession
+from src.backend.app.auth.session_service import (
+    InMemorySessionTracker,
+    SessionService,
+    flush_session_activity,
+    write_session_activity,
+)
+
+
+def _session_returning(user_session):
+    session = MagicMock()
+    session.execute = AsyncMock(
+        return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=user_session))
+    )
+    session.commit = AsyncMock()
+    return session
+
+
+def _user_session(minutes_idle):
+    now = datetime.now(timezone.utc)
+    return UserSession(
+        id="s-1",
+        user_id="u-1",
+        session_token_hash="x",
+        last_activity_at=now - timedelta(minutes=minutes_idle),
+        expires_at=now + timedelta(minutes=10),
+    )
+
+
+@pytest.mark.asyncio
+async def test_validate_records_activity_without_dirtying_row():
+    # Arrange
+    user_session = _user_session(minutes_idle=5)
+    tracker = InMemorySessionTracker()
+    db = _session_returning(user_session)
+
+    # Act
+    result = await SessionService(db, tracker=tracker).validate_session("token")
+
+    # Assert
+    assert result is user_session
+    assert await tracker.get_activity("s-1") is not None
+    assert not inspect(user_session).attrs.last_activity_at.history.has_changes()
+    db.execute.assert_awaited_once()  # the lookup only, no UPDATE
+
+
+@pytest.mark.asyncio
+async def test_validate_skips_recording_within_resolution():
+    # Arrange
+    user_session = _user_session(minutes_idle=60)  # stale row...
+    tracker = InMemorySessionTracker()
+    recent = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await tracker.record_activity("s-1", recent)  # ...but active per tracker
+    user_session.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    # Act
+    result = await SessionService(_session_returning(user_session), tracker=tracker).validate_session("token")
+
+    # Assert
+    assert result is user_session
+    assert await tracker.get_activity("s-1") == recent
+    assert result.last_activity_at == recent
+
+
+@pytest.mark.asyncio
+async def test_validate_rejects_inactive_session():
+    # Arrange
+    user_session = _user_session(minutes_idle=600)
+
+    # Act
+    result = await SessionService(
+        _session_returning(user_session), tracker=InMemorySessionTracker()
+    ).validate_session("token")
+
+    # Assert
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_write_session_activity_is_one_batched_statement():
+    # Arrange
+    at = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    db = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+
+    # Act
+    written = await write_session_activity(db, {"s-1": at, "s-2": at})
+
+    # Assert
+    assert written == 2
+    stmt, params = db.execute.await_args.args
+    assert len(params) == 2
+    assert params[0]["b_expires"] > at
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_restores_pending_activity():
+    # Arrange
+    tracker = InMemorySessionTracker()
+    at = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    await tracker.record_activity("s-1", at)
+    factory = MagicMock(side_effect=ConnectionError("db down"))
+
+    # Act
+    with patch.object(session_service, "get_async_session_factory", return_value=factory):
+        with pytest.raises(ConnectionError):
+            await flush_session_activity(tracker)
+
+    # Assert
+    assert await tracker.get_activity("s-1") == at
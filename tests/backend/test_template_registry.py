@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from src.backend.app.common.templates import TemplateRegistry
+from src.backend.app.notifications.digest import digest_link
+from src.backend.config import settings
+
+NOTIFICATION_TEMPLATES = Path(__file__).parents[2] / "src" / "backend" / "app" / "notifications" / "templates"
+
+
+def _registry(tmp_path, auto_reload=False):
+    (tmp_path / "base.html").write_text(
+        '<html lang="{{ locale }}"><body>{% block content %}{% endblock %}</body></html>'
+    )
+    (tmp_path / "welcome.html").write_text(
+        '{% extends "base.html" %}{% block content %}Hello {{ name }}{% endblock %}'
+    )
+    (tmp_path / "plain.html").write_text("Plain {{ name }}")
+    registry = TemplateRegistry(auto_reload=auto_reload)
+    registry.register("emails", tmp_path)
+    return registry
+
+
+def test_layout_render_matches_full_render(tmp_path):
+    registry = _registry(tmp_path)
+
+    html = registry.render("emails", "welcome.html", {"name": "Sara"}, locale="ar")
+
+    assert html == registry.get_template("emails", "welcome.html").render(name="Sara", locale="ar")
+    assert html == '<html lang="ar"><body>Hello Sara</body></html>'
+
+
+def test_layout_shell_is_cached_per_locale(tmp_path):
+    registry = _registry(tmp_path)
+    registry.render("emails", "welcome.html", {"name": "A"}, locale="ar")
+    registry.render("emails", "welcome.html", {"name": "B"}, locale="en")
+    registry.render("emails", "welcome.html", {"name": "C"}, locale="ar")
+
+    assert set(registry._layouts) == {
+        ("emails", "base.html", "ar"),
+        ("emails", "base.html", "en"),
+    }
+
+
+def test_standalone_templates_and_precompile(tmp_path):
+    registry = _registry(tmp_path)
+
+    assert registry.precompile() == 3
+    assert registry.render("emails", "plain.html", {"name": "Omar"}) == "Plain Omar"
+
+
+def test_auto_reload_skips_shell_cache(tmp_path):
+    registry = _registry(tmp_path, auto_reload=True)
+
+    registry.render("emails", "welcome.html", {"name": "A"})
+
+    assert registry._layouts == {}
+
+
+def test_digest_escapes_user_supplied_text():
+    registry = TemplateRegistry(auto_reload=False)
+    registry.register("notifications", NOTIFICATION_TEMPLATES)
+    item = {
+        "title": "<script>alert(1)</script>",
+        "message": "<img src=x onerror=alert(1)>",
+        "link": '/x" onmouseover="alert(1)',
+        "count": 1,
+    }
+
+    html = registry.render("notifications", "digest.html", {
+        "items": [item], "total": 1, "more": 0, "notifications_url": "/notifications",
+    })
+
+    assert "<script>" not in html and "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "<img" not in html
+    assert 'href="/x&#34; onmouseover=&#34;alert(1)"' in html
+
+
+def test_digest_links_stay_on_the_frontend():
+    assert digest_link("/assessments/1") == f"{settings.FRONTEND_URL}/assessments/1"
+    for link in ("javascript:alert(1)", "//evil.example", "@evil.example/x", None):
+        assert digest_link(link) is None
@@ -0,0 +1,41 @@
+from sqlalchemy.dialects import postgresql
+
+from src.backend.app.auth.models import User
+from src.backend.app.common.text_search import contains_pattern, normalize_arabic, normalized_arabic
+from src.backend.database import Base
+
+
+def test_normalize_arabic_folds_letter_variants_and_strips_diacritics():
+    # Act / Assert
+    assert normalize_arabic("أَحْمَد") == "احمد"
+    assert normalize_arabic("إيمان") == "ايمان"
+    assert normalize_arabic("مصطفى") == "مصطفي"
+    assert normalize_arabic("فاطمة") == "فاطمه"
+    assert normalize_arabic("محـــمد") == "محمد"
+
+
+def test_normalize_arabic_leaves_latin_text_alone():
+    assert normalize_arabic("Ahmed.Ali@example.com") == "Ahmed.Ali@example.com"
+
+
+def test_contains_pattern_escapes_like_wildcards():
+    assert contains_pattern("50%_off") == "%50\\%\\_off%"
+
+
+def test_normalized_arabic_matches_index_expression():
+    # The expression index is only used for this exact function call
+    sql = str(normalized_arabic(User.name_ar).compile(dialect=postgresql.dialect()))
+
+    assert sql == "nudj_normalize_arabic(users.name_ar)"
+
+
+
+def test_create_all_registers_function_and_trigram_indexes():
+    # Act
+    statements = [ddl.statement for ddl in Base.metadata.dispatch.after_create]
+
+    # Assert: the function is created before the index that uses it
+    function = next(i for i, sql in enumerate(statements) if "FUNCTION nudj_normalize_arabic" in sql)
+    index = next(i for i, sql in enumerate(statements) if "ix_users_name_ar_trgm" in sql)
+    assert function < index
+    assert any("ix_users_email_trgm" in sql for sql in statements)
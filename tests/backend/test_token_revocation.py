@@ -0,0 +1,218 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.backend.app.auth import dependencies
+from src.backend.app.auth import service as auth_service_module
+from src.backend.app.auth.exceptions import (
+    InvalidCredentialsException,
+    TokenExpiredException,
+    TokenRevokedException,
+)
+from src.backend.app.auth.jwt_service import JWTService
+from src.backend.app.auth.revocation import (
+    BloomFilter,
+    DatabaseRevocationStore,
+    InMemoryRevocationStore,
+    RevocationList,
+    RevocationStore,
+)
+from src.backend.app.auth.service import AuthService
+from src.backend.config import settings
+
+
+def test_bloom_filter_has_no_false_negatives():
+    # Arrange
+    items = [f"jti-{i}" for i in range(1000)]
+
+    # Act
+    bloom = BloomFilter.from_items(items, capacity=1000, error_rate=0.001)
+
+    # Assert
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+@pytest.mark.asyncio
+async def test_synced_filter_skips_store_for_unknown_jti():
+    # Arrange
+    store = InMemoryRevocationStore()
+    await store.revoke("revoked", time.time() + 60)
+    store.is_revoked = AsyncMock(wraps=store.is_revoked)
+    revocations = RevocationList(store=store)
+    await revocations.sync()
+
+    # Act
+    unknown = await revocations.is_revoked("fresh")
+    revoked = await revocations.is_revoked("revoked")
+
+    # Assert
+    assert unknown is False
+    assert revoked is True
+    store.is_revoked.assert_awaited_once_with("revoked")
+
+
+@pytest.mark.asyncio
+async def test_unsynced_list_asks_the_store():
+    # Arrange
+    store = InMemoryRevocationStore()
+    await store.revoke("revoked", time.time() + 60)
+
+    # Act / Assert
+    assert await RevocationList(store=store).is_revoked("revoked") is True
+
+
+@pytest.mark.asyncio
+async def test_revoke_updates_local_filter_and_expires():
+    # Arrange
+    store = InMemoryRevocationStore()
+    revocations = RevocationList(store=store)
+    await revocations.sync()
+
+    # Act
+    await revocations.revoke("live", time.time() + 60)
+    await revocations.revoke("already-expired", time.time() - 1)
+    await store.revoke("lapsed", time.time() - 1)
+
+    # Assert
+    assert await revocations.is_revoked("live") is True
+    assert await revocations.is_revoked("already-expired") is False
+    assert await store.active() == ["live"]
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_revoked_token(monkeypatch):
+    # Arrange
+    jwt = JWTService()
+    token = jwt.create_access_token("u-1", "a@example.com", "analyst")
+    revocations = RevocationList(store=InMemoryRevocationStore())
+    monkeypatch.setattr(dependencies, "revocation_list", revocations)
+    payload = jwt.decode_token(token)
+    await revocations.revoke(payload["jti"], payload["exp"])
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    # Act / Assert
+    with pytest.raises(TokenRevokedException):
+        await dependencies.get_current_user(
+            HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), session, jwt
+        )
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_token(monkeypatch):
+    # Arrange
+    jwt = JWTService()
+    token = jwt.create_access_token("u-1", "a@example.com", "analyst")
+    revocations = RevocationList(store=InMemoryRevocationStore())
+    monkeypatch.setattr(auth_service_module, "revocation_list", revocations)
+
+    # Act
+    await AuthService(MagicMock()).logout("u-1", access_token=token)
+
+    # Assert
+    assert await revocations.is_revoked(jwt.decode_token(token)["jti"]) is True
+
+
+@pytest.mark.asyncio
+async def test_revoke_during_sync_survives_filter_rebuild():
+    # Arrange: the store read completes before the concurrent revoke is written
+    store = InMemoryRevocationStore()
+    revocations = RevocationList(store=store)
+    await revocations.sync()
+    stale_read = await store.active()
+
+    async def slow_active():
+        await revocations.revoke("just-revoked", time.time() + 60)
+        return stale_read
+
+    store.active = slow_active
+    store.is_revoked = AsyncMock(return_value=True)
+
+    # Act
+    await revocations.sync()
+
+    # Assert: the new filter still sends the jti to the store
+    assert await revocations.is_revoked("just-revoked") is True
+    store.is_revoked.assert_awaited_once_with("just-revoked")
+
+
+def test_default_store_is_shared_without_redis(monkeypatch):
+    # Arrange
+    monkeypatch.setattr("src.backend.app.auth.revocation.get_redis", lambda: None)
+
+    # Act / Assert
+    assert isinstance(RevocationList().store, DatabaseRevocationStore)
+
+
+def test_incomplete_store_fails_at_construction():
+    class PartialStore(RevocationStore):
+        async def revoke(self, jti, exp):
+            pass
+
+    with pytest.raises(TypeError, match="is_revoked"):
+        PartialStore()
+
+
+@pytest.mark.asyncio
+async def test_stream_ticket_resolves_active_user(monkeypatch):
+    # Arrange
+    jwt = JWTService()
+    monkeypatch.setattr(dependencies, "revocation_list", RevocationList(store=InMemoryRevocationStore()))
+    ticket = jwt.create_stream_ticket("u-1", "access-jti")
+    user = MagicMock(is_active=True)
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=user)))
+
+    # Act
+    resolved = await dependencies.get_user_from_stream_ticket(ticket, session, jwt)
+
+    # Assert
+    assert resolved is user
+    assert jwt.decode_token(ticket)["type"] == "sse"
+
+
+@pytest.mark.asyncio
+async def test_stream_ticket_rejects_access_token():
+    # Arrange
+    jwt = JWTService()
+    token = jwt.create_access_token("u-1", "a@example.com", "analyst")
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    # Act / Assert
+    with pytest.raises(InvalidCredentialsException):
+        await dependencies.get_user_from_stream_ticket(token, session, jwt)
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_ticket_expires(monkeypatch):
+    # Arrange
+    jwt = JWTService()
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_TICKET_SECONDS", -1)
+    ticket = jwt.create_stream_ticket("u-1", "access-jti")
+
+    # Act / Assert
+    with pytest.raises(TokenExpiredException):
+        await dependencies.get_user_from_stream_ticket(ticket, MagicMock(), jwt)
+
+
+@pytest.mark.asyncio
+async def test_stream_ticket_dies_with_its_access_token(monkeypatch):
+    # Arrange
+    jwt = JWTService()
+    token = jwt.create_access_token("u-1", "a@example.com", "analyst")
+    revocations = RevocationList(store=InMemoryRevocationStore())
+    monkeypatch.setattr(dependencies, "revocation_list", revocations)
+    payload = jwt.decode_token(token)
+    ticket = jwt.create_stream_ticket("u-1", payload["jti"])
+    await revocations.revoke(payload["jti"], payload["exp"])
+
+    # Act / Assert
+    with pytest.raises(TokenRevokedException):
+        await dependencies.get_user_from_stream_ticket(ticket, MagicMock(), jwt)
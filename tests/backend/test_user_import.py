@@ -0,0 +1,259 @@
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+
+import src.backend.main  # noqa: F401  (registers all mappers)
+from src.backend.app.admin.user_import import (
+    ChunkResult,
+    ImportFileError,
+    ImportFileTooLarge,
+    UserImporter,
+    UserImportService,
+    _load_upload,
+    _record_chunk,
+    count_import_rows,
+    import_file_type,
+    iter_import_rows,
+)
+from src.backend.app.auth.models import (
+    Invitation,
+    Role,
+    User,
+    UserDomainAssignment,
+    UserImportError,
+    UserImportJob,
+)
+from src.backend.config import settings
+
+ORG = "5c1d2e3f-0a9b-4c8d-8e7f-6a5b4c3d2e1f"
+OTHER_ORG = "0b7a6c1e-4f1e-4c1a-9d7e-1d2c3b4a5f6e"
+
+
+def test_csv_rows_are_streamed_with_normalized_headers(tmp_path):
+    # Arrange
+    path = tmp_path / "export.csv"
+    path.write_text(
+        "\ufeffE-Mail, Role ,Name,Domains\n"
+        "a@example.com,assessor,Ali,\"1,2\"\n"
+        "b@example.com,client admin,Badr,\n",
+        encoding="utf-8",
+    )
+
+    # Act
+    rows = list(iter_import_rows(str(path), "csv"))
+
+    # Assert
+    assert rows[0] == {"email": "a@example.com", "role": "assessor", "name_en": "Ali", "domain_ids": "1,2"}
+    assert rows[1]["role"] == "client admin"
+    assert count_import_rows(str(path), "csv") == 2
+
+
+def test_missing_required_columns_are_rejected(tmp_path):
+    # Arrange
+    path = tmp_path / "export.csv"
+    path.write_text("email,name_en\na@example.com,Ali\n")
+
+    # Act / Assert
+    with pytest.raises(ImportFileError, match="role"):
+        list(iter_import_rows(str(path), "csv"))
+    with pytest.raises(ImportFileError):
+        import_file_type("export.xls")
+
+
+def _session(existing=(), assignments=()):
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(all=MagicMock(return_value=list(existing))),  # existing users
+        MagicMock(),  # bulk user update
+        MagicMock(all=MagicMock(return_value=list(assignments))),  # existing assignments
+        MagicMock(),  # assignment update
+        MagicMock(),  # assignment insert
+        MagicMock(scalars=MagicMock(return_value=iter([ORG]))),  # known organizations
+        MagicMock(scalars=MagicMock(return_value=iter(()))),  # registered users
+        MagicMock(),  # expire pending invitations
+        MagicMock(),  # insert invitations
+        MagicMock(),  # queue emails
+    ])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_chunk_updates_members_upserts_domains_and_invites_the_rest():
+    # Arrange
+    existing = [
+        ("u-1", "Member@example.com", ORG, Role.ASSESSOR),
+        ("u-2", "second@example.com", ORG, Role.ASSESSOR),
+        ("u-3", "outsider@example.com", OTHER_ORG, Role.ASSESSOR),
+    ]
+    session = _session(existing=existing, assignments=[("a-1", "u-1")])
+    importer = UserImporter(session, ORG, "admin-1", Role.CLIENT_ADMIN)
+    rows = [
+        (2, {"email": "member@example.com", "role": "client_admin", "name_en": "Mona", "domain_ids": "1;2"}),
+        (3, {"email": "second@example.com", "role": "assessor", "name_en": "", "domain_ids": "3"}),
+        (4, {"email": "outsider@example.com", "role": "assessor"}),
+        (5, {"email": "new@example.com", "role": "Assessor", "domain_ids": "4|5"}),
+        (6, {"email": "NEW@example.com", "role": "assessor"}),
+        (7, {"email": "boss@example.com", "role": "super_admin"}),
+        (8, {"email": "broken", "role": "assessor"}),
+        (9, {"email": "", "role": ""}),
+    ]
+
+    # Act
+    result = await importer.import_chunk(rows)
+
+    # Assert
+    assert (result.invited, result.updated) == (1, 2)
+    assert result.errors == [
+        (4, "outsider@example.com", "belongs_to_another_organization"),
+        (6, "new@example.com", "duplicate"),
+        (7, "boss@example.com", "role_not_allowed"),
+        (8, "broken", "invalid_email"),
+    ]
+    calls = [call.args for call in session.execute.await_args_list]
+    update_stmt, updates = calls[1]
+    assert update_stmt.table.name == User.__tablename__
+    assert updates == [
+        {"id": "u-1", "role": Role.CLIENT_ADMIN, "name_en": "Mona"},
+        {"id": "u-2", "role": Role.ASSESSOR},
+    ]
+    assert calls[3][1] == [
+        {"id": "a-1", "domain_ids": {"ids": ["1", "2"]}, "assigned_by": "admin-1", "assigned_at": ANY},
+    ]
+    insert_stmt, inserted = calls[4]
+    assert insert_stmt.table.name == UserDomainAssignment.__tablename__
+    assert [(row["user_id"], row["domain_ids"]) for row in inserted] == [("u-2", {"ids": ["3"]})]
+    invitation_stmt, invitations = calls[8]
+    assert invitation_stmt.table.name == Invitation.__tablename__
+    assert [(row["email"], row["organization_id"], row["domain_ids"]) for row in invitations] == [
+        ("new@example.com", ORG, {"ids": ["4", "5"]}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unknown_domains_are_rejected_for_existing_members():
+    # Arrange
+    existing = [
+        ("u-1", "member@example.com", ORG, Role.ASSESSOR),
+        ("u-2", "second@example.com", ORG, Role.ASSESSOR),
+    ]
+    session = _session(existing=existing)
+    importer = UserImporter(session, ORG, "admin-1", Role.CLIENT_ADMIN)
+    rows = [
+        (2, {"email": "member@example.com", "role": "assessor", "domain_ids": "99;abc"}),
+        (3, {"email": "second@example.com", "role": "assessor", "domain_ids": "2"}),
+    ]
+
+    # Act
+    result = await importer.import_chunk(rows)
+
+    # Assert: the bad row never reaches the users or assignment writes
+    assert result.errors == [(2, "member@example.com", "unknown_domain")]
+    assert result.updated == 1
+    calls = [call.args for call in session.execute.await_args_list]
+    assert calls[1][1] == [{"id": "u-2", "role": Role.ASSESSOR}]
+    insert_stmt, inserted = calls[3]
+    assert insert_stmt.table.name == UserDomainAssignment.__tablename__
+    assert [(row["user_id"], row["domain_ids"]) for row in inserted] == [("u-2", {"ids": ["2"]})]
+
+
+@pytest.mark.asyncio
+async def test_chunk_with_only_invalid_rows_runs_no_queries():
+    # Arrange
+    session = _session()
+    importer = UserImporter(session, ORG, "admin-1", Role.CLIENT_ADMIN)
+
+    # Act
+    result = await importer.import_chunk([(2, {"email": "a@example.com", "role": "janitor"})])
+
+    # Assert
+    assert result.errors == [(2, "a@example.com", "invalid_role")]
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_chunk_errors_are_inserted_as_rows():
+    # Arrange
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    result = ChunkResult(invited=1)
+    result.error(3, "a,b@example.com", "invalid_email")
+    result.error(4, "c@example.com", "duplicate")
+
+    # Act
+    await _record_chunk(session, "job-1", 3, result)
+
+    # Assert: one executemany for the errors, no rewrite of earlier ones
+    insert_stmt, rows = session.execute.await_args_list[0].args
+    assert insert_stmt.table.name == UserImportError.__tablename__
+    assert [(row["job_id"], row["row_number"], row["email"], row["error"]) for row in rows] == [
+        ("job-1", 3, "a,b@example.com", "invalid_email"),
+        ("job-1", 4, "c@example.com", "duplicate"),
+    ]
+    update_stmt = session.execute.await_args_list[1].args[0]
+    assert update_stmt.table.name == UserImportJob.__tablename__
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_error_report_is_streamed_as_quoted_csv():
+    # Arrange
+    async def partitions():
+        yield [(3, "a,b@example.com", "invalid_email")]
+        yield [(4, "c@example.com", "duplicate")]
+
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=MagicMock(partitions=partitions))
+
+    # Act
+    chunks = [chunk async for chunk in UserImportService(session).iter_error_csv("job-1")]
+
+    # Assert
+    assert "".join(chunks) == (
+        "row,email,error\r\n"
+        '3,"a,b@example.com",invalid_email\r\n'
+        "4,c@example.com,duplicate\r\n"
+    )
+
+
+def _upload(data: bytes):
+    chunks = [data[i:i + 4] for i in range(0, len(data), 4)] + [b""]
+    return MagicMock(filename="export.csv", read=AsyncMock(side_effect=chunks))
+
+
+@pytest.mark.asyncio
+async def test_upload_is_stored_with_the_job(monkeypatch, tmp_path):
+    # Arrange
+    monkeypatch.setattr(settings, "USER_IMPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "USER_IMPORT_MAX_BYTES", 16)
+    session = MagicMock()
+    session.commit = AsyncMock()
+    service = UserImportService(session)
+
+    # Act
+    job = await service.create_job(_upload(b"email,role\n"), ORG, created_by="admin-1")
+
+    # Assert: nothing is left on this worker's disk
+    assert job.file_content == b"email,role\n"
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ImportFileTooLarge):
+        await service.create_job(_upload(b"x" * 17), ORG, created_by="admin-1")
+
+
+@pytest.mark.asyncio
+async def test_any_worker_reads_the_stored_upload(monkeypatch, tmp_path):
+    # Arrange
+    monkeypatch.setattr(settings, "USER_IMPORT_DIR", str(tmp_path / "scratch"))
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=[
+        MagicMock(scalar_one_or_none=MagicMock(return_value=b"email,role\na@example.com,assessor\n")),
+        MagicMock(scalar_one_or_none=MagicMock(return_value=None)),
+    ])
+
+    # Act
+    path = await _load_upload(session, "job-1", "csv")
+
+    # Assert
+    assert list(iter_import_rows(path, "csv")) == [{"email": "a@example.com", "role": "assessor"}]
+    with pytest.raises(ImportFileError):
+        await _load_upload(session, "job-2", "csv")